@@ -0,0 +1,125 @@
+"""
+Script para conferir (dry-run) a distribuição das câmeras entre os nós.
+Mostra quais câmeras cada nó processaria com a configuração atual (node_count),
+sem iniciar o processamento. Com --node-count, simula outro número de nós e
+informa quantas câmeras mudariam de nó.
+"""
+
+import argparse
+import logging
+from src.infrastructure.clients import FindfaceMulti
+from src.infrastructure.repositories import CameraRepositoryFindface, CameraRepositoryCached
+from src.infrastructure.config.config_loader import ConfigLoader
+from src.application.use_cases import LoadCamerasUseCase
+from src.domain.services import CameraSharding
+
+
+def main():
+    """Exibe a atribuição câmera -> nó calculada por rendezvous hashing."""
+
+    parser = argparse.ArgumentParser(description="Dry-run da distribuição de câmeras entre nós")
+    parser.add_argument(
+        "--node-count",
+        type=int,
+        default=None,
+        help="Número de nós a simular (padrão: node_count do config.yaml)"
+    )
+    parser.add_argument(
+        "--cached",
+        action="store_true",
+        help="Usa o cache local de câmeras em vez de consultar o FindFace"
+    )
+    args = parser.parse_args()
+
+    # Configura logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    logger = logging.getLogger(__name__)
+
+    findface_client = None
+    try:
+        # Carrega configurações
+        logger.info("Carregando configurações...")
+        settings = ConfigLoader.load()
+        configured_count = settings.processing.node_count
+        node_count = args.node_count if args.node_count is not None else configured_count
+
+        # Cria repositório de câmeras (FindFace ou apenas o cache local)
+        findface_client = FindfaceMulti(
+            url_base=settings.findface.url_base,
+            user=settings.findface.user,
+            password=settings.findface.password,
+            uuid=settings.findface.uuid
+        )
+        camera_repository = CameraRepositoryFindface(
+            findface_client=findface_client,
+            camera_prefix=settings.findface.camera_prefix
+        )
+        if args.cached:
+            if not settings.findface.camera_cache_path:
+                logger.error("--cached requer findface.camera_cache_path configurado.")
+                return 1
+            camera_repository = CameraRepositoryCached(camera_repository, settings.findface.camera_cache_path)
+        else:
+            logger.info("Conectando ao FindFace...")
+            findface_client.login()
+
+        # Todas as câmeras ativas (sem os filtros de nó e de grupo)
+        cameras = LoadCamerasUseCase(camera_repository, settings).load_all(cached=args.cached)
+        cameras.sort(key=lambda camera: camera.camera_id.value())
+
+        sharding = CameraSharding(node_count)
+        assignment = sharding.assign(camera.camera_id.value() for camera in cameras)
+        owner = {
+            camera_id: node
+            for node, camera_ids in assignment.items()
+            for camera_id in camera_ids
+        }
+
+        # Exibe resultado
+        print(f"\n{'='*80}")
+        print(f"Distribuição de {len(cameras)} câmera(s) entre {node_count} nó(s)")
+        print(f"{'='*80}")
+        for node, camera_ids in assignment.items():
+            marker = " (este nó)" if node == settings.processing.node_id and node_count == configured_count else ""
+            print(f"\n--- Nó {node}{marker}: {len(camera_ids)} câmera(s) ---")
+            for camera in cameras:
+                if owner[camera.camera_id.value()] == node:
+                    print(f"  {camera.camera_id.value():>8}  {camera.camera_name.value()}")
+
+        # Simulação de outro número de nós: câmeras que mudariam de nó
+        if node_count != configured_count:
+            current = CameraSharding(configured_count)
+            moved = [
+                camera for camera in cameras
+                if current.owner(camera.camera_id.value()) != owner[camera.camera_id.value()]
+            ]
+            print(f"\n{'='*80}")
+            print(
+                f"De {configured_count} para {node_count} nó(s): {len(moved)} de {len(cameras)} "
+                f"câmera(s) mudariam de nó"
+            )
+            for camera in moved:
+                camera_id = camera.camera_id.value()
+                print(
+                    f"  {camera_id:>8}  {camera.camera_name.value()}: "
+                    f"nó {current.owner(camera_id)} -> nó {owner[camera_id]}"
+                )
+
+    except Exception as e:
+        logger.error(f"Erro ao calcular a distribuição de câmeras: {e}", exc_info=True)
+        return 1
+    finally:
+        if findface_client is not None and not args.cached:
+            try:
+                findface_client.logout()
+            except Exception:
+                pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
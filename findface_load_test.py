@@ -0,0 +1,303 @@
+"""
+Teste de carga do envio de eventos ao FindFace.
+
+Gera eventos sintéticos (frame aleatório com uma face simulada) e os envia pelo
+mesmo caminho usado em produção: FindfaceMulti -> FindfaceAdapter -> fila de envio
+-> dispatcher (threads ou async), com concorrência adaptativa e outbox opcionais.
+
+Sem ``--url``, sobe um FindFace simulado local (FindfaceMockServer) com latência,
+erros e limite de vazão configuráveis. Ao final, informa a vazão alcançada
+(eventos/s) e a latência de cauda (p50/p95/p99).
+
+Exemplos::
+
+    python findface_load_test.py --events 2000 --rate 200 --latency-ms 40
+    python findface_load_test.py --dispatcher async --max-in-flight 128 --error-rate 0.05
+    python findface_load_test.py --adaptive --mock-max-concurrency 16 --latency-distribution pareto
+"""
+
+import argparse
+import logging
+import random
+import time
+from queue import Full
+
+import numpy as np
+
+from src.domain.adapters import FindfaceAdapter
+from src.domain.entities import Event, EventPayload, Frame
+from src.domain.services import (
+    AdaptiveConcurrencyLimiter,
+    FindfaceAsyncDispatcher,
+    FindfaceFairQueue,
+    FindfacePriorityQueue,
+    FindfaceThreadDispatcher,
+)
+from src.domain.value_objects import (
+    BboxVO,
+    CameraTokenVO,
+    ConfidenceVO,
+    FullFrameVO,
+    IdVO,
+    LandmarksVO,
+    NameVO,
+    TimestampVO,
+)
+from src.infrastructure.config.settings import FindFaceConfig
+from src.infrastructure.external.findface_client import create_findface_client, findface_send_workers
+from src.infrastructure.external.findface_mock_server import FindfaceMockConfig, FindfaceMockServer
+
+
+def parse_args() -> argparse.Namespace:
+    """Lê os argumentos de linha de comando."""
+    parser = argparse.ArgumentParser(description="Teste de carga do envio de eventos ao FindFace")
+
+    target = parser.add_argument_group("destino")
+    target.add_argument("--url", help="URL de um FindFace (real ou simulado); sem ela, sobe um simulado local")
+    target.add_argument("--user", default="admin")
+    target.add_argument("--password", default="admin")
+    target.add_argument("--uuid", default="load-test")
+
+    load = parser.add_argument_group("carga")
+    load.add_argument("--events", type=int, default=1000, help="Total de eventos gerados")
+    load.add_argument("--rate", type=float, default=0.0, help="Eventos/s gerados (0 = o mais rápido possível)")
+    load.add_argument("--cameras", type=int, default=8, help="Câmeras sintéticas")
+    load.add_argument("--groups", type=int, default=1, help="Grupos de câmeras do FindFace simulado")
+    load.add_argument("--width", type=int, default=1920)
+    load.add_argument("--height", type=int, default=1080)
+    load.add_argument("--drain-timeout", type=float, default=60.0, help="Espera máxima (s) pelo esvaziamento da fila")
+
+    dispatch = parser.add_argument_group("envio")
+    dispatch.add_argument("--dispatcher", choices=("threads", "async"), default="threads")
+    dispatch.add_argument("--workers", type=int, default=0, help="Workers do modo threads (0 = automático)")
+    dispatch.add_argument("--max-in-flight", type=int, default=64)
+    dispatch.add_argument("--queue-size", type=int, default=500)
+    dispatch.add_argument("--queue-policy", choices=("fifo", "priority", "fair"), default="fifo")
+    dispatch.add_argument("--upload-mode", choices=("fullframe", "crop"), default="fullframe")
+    dispatch.add_argument("--jpeg-quality", type=int, default=95)
+    dispatch.add_argument("--adaptive", action="store_true", help="Concorrência adaptativa (AIMD)")
+    dispatch.add_argument("--max-concurrency", type=int, default=64)
+    dispatch.add_argument("--max-retries", type=int, default=2)
+    dispatch.add_argument("--breaker-failure-threshold", type=int, default=5)
+
+    mock = parser.add_argument_group("FindFace simulado")
+    defaults = FindfaceMockConfig()
+    mock.add_argument("--latency-distribution", choices=FindfaceMockServer.DISTRIBUTIONS,
+                      default=defaults.latency_distribution)
+    mock.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    mock.add_argument("--latency-jitter", type=float, default=defaults.latency_jitter)
+    mock.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    mock.add_argument("--reject-rate", type=float, default=defaults.reject_rate)
+    mock.add_argument("--drop-rate", type=float, default=defaults.drop_rate)
+    mock.add_argument("--token-ttl", type=float, default=defaults.token_ttl)
+    mock.add_argument("--max-rps", type=float, default=defaults.max_rps)
+    mock.add_argument("--mock-max-concurrency", type=int, default=defaults.max_concurrency)
+
+    return parser.parse_args()
+
+
+def build_frames(args: argparse.Namespace) -> list:
+    """Gera um conjunto pequeno de imagens reaproveitadas entre os eventos."""
+    rng = np.random.default_rng(0)
+    frames = []
+    for _ in range(4):
+        # Ruído suave (blocos ampliados) comprime como uma cena real, ao contrário de ruído puro
+        small = rng.integers(0, 256, size=(args.height // 16, args.width // 16, 3), dtype=np.uint8)
+        frames.append(np.ascontiguousarray(np.kron(small, np.ones((16, 16, 1), dtype=np.uint8))))
+    return frames
+
+
+def make_event(event_id: int, camera_id: int, image: np.ndarray) -> Event:
+    """Cria um evento sintético com uma face em posição e qualidade aleatórias."""
+    height, width = image.shape[:2]
+    size = random.randint(80, 240)
+    x1 = random.randint(0, width - size)
+    y1 = random.randint(0, height - size)
+    frame = Frame(
+        id=IdVO(event_id),
+        full_frame=FullFrameVO(image, copy=False),
+        camera_id=IdVO(camera_id),
+        camera_name=NameVO(f"CAM-{camera_id:03d}"),
+        camera_token=CameraTokenVO(f"load-test-{camera_id}"),
+        timestamp=TimestampVO.now()
+    )
+    return Event(
+        id=IdVO(event_id),
+        frame=frame,
+        bbox=BboxVO((x1, y1, x1 + size, y1 + size)),
+        confidence=ConfidenceVO(random.uniform(0.5, 1.0)),
+        landmarks=LandmarksVO(None),
+        face_quality_score=ConfidenceVO(random.random())
+    )
+
+
+def main() -> int:
+    """Executa o teste de carga e imprime o relatório."""
+    args = parse_args()
+    logging.basicConfig(
+        level=logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    logger = logging.getLogger("findface_load_test")
+    logger.setLevel(logging.INFO)
+
+    mock_server = None
+    url = args.url
+    if url is None:
+        mock_server = FindfaceMockServer(FindfaceMockConfig(
+            latency_distribution=args.latency_distribution,
+            latency_ms=args.latency_ms,
+            latency_jitter=args.latency_jitter,
+            error_rate=args.error_rate,
+            reject_rate=args.reject_rate,
+            drop_rate=args.drop_rate,
+            token_ttl=args.token_ttl,
+            max_rps=args.max_rps,
+            max_concurrency=args.mock_max_concurrency,
+            num_groups=max(1, args.groups),
+            cameras_per_group=max(1, args.cameras // max(1, args.groups))
+        ))
+        mock_server.start()
+        url = mock_server.url
+
+    config = FindFaceConfig(
+        url_base=url,
+        user=args.user,
+        password=args.password,
+        uuid=args.uuid,
+        dispatcher=args.dispatcher,
+        workers=args.workers,
+        max_in_flight=args.max_in_flight,
+        upload_mode=args.upload_mode,
+        jpeg_quality=args.jpeg_quality,
+        adaptive_concurrency=args.adaptive,
+        max_concurrency=args.max_concurrency,
+        max_retries=args.max_retries,
+        breaker_failure_threshold=args.breaker_failure_threshold
+    )
+    client = create_findface_client(config)
+
+    # Descoberta de câmeras: fria (todas as páginas) e revalidada por ETag
+    start = time.perf_counter()
+    discovered = client.discover_cameras(config.camera_prefix, active=True)
+    cold_discovery = time.perf_counter() - start
+    client.camera_discovery.invalidate()
+    start = time.perf_counter()
+    client.discover_cameras(config.camera_prefix, active=True)
+    revalidated_discovery = time.perf_counter() - start
+    adapter = FindfaceAdapter(
+        client,
+        upload_mode=config.upload_mode,
+        jpeg_quality=config.jpeg_quality
+    )
+
+    dispatch_queue = None
+    if args.queue_policy == "fair":
+        dispatch_queue = FindfaceFairQueue(maxsize=args.queue_size)
+    elif args.queue_policy == "priority":
+        dispatch_queue = FindfacePriorityQueue(maxsize=args.queue_size)
+
+    limiter = None
+    num_workers = findface_send_workers(config)
+    max_in_flight = args.max_in_flight
+    if args.adaptive:
+        max_in_flight = num_workers
+        limiter = AdaptiveConcurrencyLimiter(max_limit=args.max_concurrency)
+
+    if args.dispatcher == "async":
+        dispatcher = FindfaceAsyncDispatcher(
+            adapter,
+            max_in_flight=max_in_flight,
+            encoder_workers=args.workers or 2,
+            queue_size=args.queue_size,
+            dispatch_queue=dispatch_queue,
+            limiter=limiter
+        )
+    else:
+        dispatcher = FindfaceThreadDispatcher(
+            adapter,
+            num_workers=num_workers,
+            queue_size=args.queue_size,
+            dispatch_queue=dispatch_queue,
+            limiter=limiter
+        )
+    dispatcher.start()
+
+    frames = build_frames(args)
+    logger.info(
+        f"Enviando {args.events} eventos para {url} "
+        f"(dispatcher: {args.dispatcher}, fila: {args.queue_policy}, "
+        f"taxa: {args.rate or 'máxima'} eventos/s)"
+    )
+
+    dropped = 0
+    interval = 1.0 / args.rate if args.rate > 0 else 0.0
+    start = time.monotonic()
+    for i in range(args.events):
+        if interval:
+            # Agenda absoluta: atrasos pontuais não reduzem a taxa média gerada
+            delay = start + i * interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        camera_id = i % args.cameras + 1
+        event = make_event(i + 1, camera_id, frames[i % len(frames)])
+        try:
+            dispatcher.put_nowait((camera_id, f"CAM-{camera_id:03d}", i + 1, EventPayload(event), 1))
+        except Full:
+            dropped += 1
+    generation_time = time.monotonic() - start
+
+    # Aguarda a fila esvaziar e os envios em andamento terminarem
+    accepted = args.events - dropped
+    deadline = time.monotonic() + args.drain_timeout
+    while time.monotonic() < deadline:
+        stats = dispatcher.get_stats()
+        if stats['sent'] + stats['failed'] >= accepted:
+            break
+        time.sleep(0.05)
+    elapsed = time.monotonic() - start
+
+    stats = dispatcher.get_stats()
+    dispatcher.stop()
+    http_stats = client.get_http_stats()
+
+    print(f"\n{'=' * 70}")
+    print("RESULTADO DO TESTE DE CARGA")
+    print(f"{'=' * 70}")
+    print(f"Descoberta de câmeras: {len(discovered)} em {cold_discovery * 1000:.0f}ms "
+          f"(revalidação por ETag: {revalidated_discovery * 1000:.0f}ms)")
+    print(f"Eventos gerados:       {args.events} em {generation_time:.2f}s "
+          f"({args.events / generation_time if generation_time else 0:.1f}/s)")
+    print(f"Descartados (fila):    {dropped}")
+    print(f"Enviados com sucesso:  {stats['sent']}")
+    print(f"Falhas de envio:       {stats['failed']}")
+    print(f"Vazão alcançada:       {stats['sent'] / elapsed if elapsed else 0:.1f} eventos/s ({elapsed:.2f}s)")
+    if 'concurrency' in stats:
+        print(f"Concorrência final:    {stats['concurrency']['limit']}")
+    if args.dispatcher == "threads":
+        print(f"Latência HTTP:         p50 {http_stats['p50_latency_ms']:.1f}ms | "
+              f"p95 {http_stats['p95_latency_ms']:.1f}ms | p99 {http_stats['p99_latency_ms']:.1f}ms")
+    print(f"Retentativas HTTP:     {http_stats['retries']} | "
+          f"renovações de token: {http_stats['token_refreshes']} | "
+          f"circuito: {http_stats['breaker_state']} ({http_stats['short_circuited']} recusadas)")
+
+    if mock_server is not None:
+        server_stats = mock_server.get_stats()
+        print(f"Latência fim a fim:    p50 {server_stats['end_to_end_p50_ms']:.1f}ms | "
+              f"p95 {server_stats['end_to_end_p95_ms']:.1f}ms | p99 {server_stats['end_to_end_p99_ms']:.1f}ms "
+              f"(captura -> aceite)")
+        print(f"Servidor simulado:     aceitos {server_stats.get('accepted', 0)} | "
+              f"erros {server_stats.get('errors', 0)} | "
+              f"limitados (429) {server_stats.get('throttled', 0)} | "
+              f"rejeitados {server_stats.get('rejected', 0)} | "
+              f"conexões derrubadas {server_stats.get('dropped', 0)} | "
+              f"401 {server_stats.get('unauthorized', 0)}")
+        mock_server.stop()
+    print(f"{'=' * 70}\n")
+
+    client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
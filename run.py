@@ -9,12 +9,27 @@ from queue import Queue
 
 # local
 from src.infrastructure import ConfigLoader, AppSettings
-from src.infrastructure.external.findface_client import create_findface_client
-from src.infrastructure.repositories import CameraRepositoryFindface
+from src.infrastructure.external.findface_client import create_findface_client, findface_send_workers
+from src.infrastructure.repositories import CameraRepositoryFindface, CameraRepositoryCached, FindfaceOutboxSQLite
 from src.application.use_cases import LoadCamerasUseCase
+from src.application.services import CameraReconciler, WorkerProcessSupervisor
 from src.domain.adapters import FindfaceAdapter
-from src.domain.services import ByteTrackDetectorService, ImageSaveService
-from src.infrastructure.model import ModelFactory
+from src.domain.services import (
+    ByteTrackDetectorService,
+    DetectionModelPool,
+    TrackDeduplicator,
+    TrackMetadataLog,
+    ImageSaveService,
+    ImageRetentionService,
+    ImageArchive,
+    LandmarksInferenceService,
+    FindfaceAsyncDispatcher,
+    FindfaceThreadDispatcher,
+    FindfacePriorityQueue,
+    FindfaceFairQueue,
+    AdaptiveConcurrencyLimiter,
+)
+from src.infrastructure.model import ModelFactory, SharedDetectionModel, CameraTrackingModel, configure_capture_timeout
 from src.infrastructure.model.landmarks_model_factory import LandmarksModelFactory
 
 # Suprimir avisos do OpenCV e Ultralytics
@@ -79,47 +94,59 @@ except Exception:
     # Se ocorrer qualquer problema, não quebra a inicialização
     pass
 
+# Processos de trabalho (multiprocessing "spawn") reexecutam este módulo como __mp_main__:
+# só o processo principal abre o arquivo de log e inicia o listener (no Windows, o arquivo
+# aberto por outro processo impede a rotação); os processos de trabalho enviam os logs
+# ao supervisor (run_camera_worker)
+is_worker_process = __name__ == "__mp_main__"
+
 # Configura logging com rotação
 log_file = os.path.join(os.path.dirname(__file__), "detectorrbt.log")
 
-# Handler com rotação: 2MB por arquivo, máximo 3 backups (compactados)
-file_handler = RotatingFileHandler(
-    log_file,
-    maxBytes=2 * 1024 * 1024,  # 2MB
-    backupCount=3,
-    encoding='utf-8'
-)
-file_handler.setLevel(logging.INFO)
-file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-
 # Handler para console
 console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.INFO)
 console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
 
-# OTIMIZAÇÃO: Sistema de logging assíncrono com fila para evitar I/O bloqueante
-# Cria fila com capacidade de 10000 mensagens
-log_queue = Queue(maxsize=10000)
-
-# QueueListener processa logs em thread separada (não bloqueia thread principal)
-queue_listener = QueueListener(
-    log_queue,
-    file_handler,
-    console_handler,
-    respect_handler_level=True
-)
-queue_listener.start()
-
-# QueueHandler envia logs para a fila (operação instantânea, não bloqueante)
-queue_handler = QueueHandler(log_queue)
-queue_handler.setLevel(logging.INFO)
-
-# Configura root logger para usar apenas o QueueHandler
-# Remove formatters duplicados do root logger
 root_logger = logging.getLogger()
 root_logger.setLevel(logging.INFO)
 root_logger.handlers.clear()  # Remove handlers existentes
-root_logger.addHandler(queue_handler)
+
+file_handler = None
+queue_listener = None
+if is_worker_process:
+    # Até o run_camera_worker conectar a fila do supervisor, apenas console
+    root_logger.addHandler(console_handler)
+else:
+    # Handler com rotação: 2MB por arquivo, máximo 3 backups (compactados)
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=2 * 1024 * 1024,  # 2MB
+        backupCount=3,
+        encoding='utf-8'
+    )
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    
+    # OTIMIZAÇÃO: Sistema de logging assíncrono com fila para evitar I/O bloqueante
+    # Cria fila com capacidade de 10000 mensagens
+    log_queue = Queue(maxsize=10000)
+    
+    # QueueListener processa logs em thread separada (não bloqueia thread principal)
+    queue_listener = QueueListener(
+        log_queue,
+        file_handler,
+        console_handler,
+        respect_handler_level=True
+    )
+    queue_listener.start()
+    
+    # QueueHandler envia logs para a fila (operação instantânea, não bloqueante)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setLevel(logging.INFO)
+    
+    # Configura root logger para usar apenas o QueueHandler
+    root_logger.addHandler(queue_handler)
 
 
 # run.py - topo (logo após imports básicos, ANTES de criar modelos/threads)
@@ -158,266 +185,599 @@ except Exception as e:
     logger.warning(f"Não foi possível aplicar monkeypatch em callbacks do ultralytics: {e}")
 
 
-def main(settings: AppSettings, findface_adapter: FindfaceAdapter):
+def main(settings: AppSettings, findface_adapter: FindfaceAdapter, camera_group=None, stop_event=None):
+    """
+    Executa o processamento das câmeras neste processo.
+    
+    :param settings: Configurações da aplicação.
+    :param findface_adapter: Adapter FindFace.
+    :param camera_group: Tupla (índice, total de grupos) no modo multiprocesso; None = todas as câmeras.
+    :param stop_event: Evento (multiprocessing) sinalizado pelo supervisor para encerrar.
+    """
     logger = logging.getLogger(__name__)
     
+    # Modo multiprocesso: arquivos exclusivos por processo (sem escrita concorrente entre
+    # processos) e recursos globais (concorrência FindFace) divididos entre os grupos
+    worker_name = f"worker-{camera_group[0]}" if camera_group is not None else None
+    group_count = camera_group[1] if camera_group is not None else 1
+    
+    def per_worker(value: int) -> int:
+        return max(1, -(-value // group_count))
+    
+    def worker_path(path: str) -> str:
+        if worker_name is None:
+            return path
+        base, ext = os.path.splitext(path)
+        return f"{base}-{worker_name}{ext}"
+    
+    # Capturas RTSP com timeout: uma reabertura que trava não deixa a câmera sem reconexão
+    configure_capture_timeout(settings.stream.open_timeout)
+    
+    # Repositório e caso de uso de câmeras (DDD); define também as câmeras deste nó/processo
+    camera_repository = CameraRepositoryFindface(findface_adapter.findface, camera_prefix=settings.findface.camera_prefix)
+    if settings.findface.camera_cache_path:
+        # Última lista obtida com sucesso fica em disco: usada se o FindFace estiver fora do ar
+        camera_repository = CameraRepositoryCached(camera_repository, settings.findface.camera_cache_path)
+    load_cameras_use_case = LoadCamerasUseCase(camera_repository, settings, camera_group=camera_group)
+    
     # OTIMIZAÇÃO: Cria serviço assíncrono para salvamento de imagens
     # Compartilhado entre todas as câmeras para centralizar I/O
-    image_save_service = ImageSaveService()
-    logger.info("ImageSaveService iniciado (fila: 200)")
+    results_path = os.path.join(settings.storage.project_dir, settings.storage.results_dir)
+    image_archive = None
+    if settings.storage.save_images and settings.storage.archive_enabled:
+        # Imagens acrescentadas a segmentos grandes (gravação sequencial) com índice compacto
+        image_archive = ImageArchive(
+            worker_path(os.path.join(results_path, "archive")),
+            segment_bytes=settings.storage.archive_segment_mb * 1024 * 1024,
+            max_segments=settings.storage.archive_max_segments
+        )
+        logger.info(f"Arquivo de imagens em segmentos habilitado em '{image_archive.root}'")
+    
+    image_retention_service = None
+    if (
+        settings.storage.save_images
+        and image_archive is None
+        and (settings.storage.max_mb_per_camera or settings.storage.max_age_hours)
+    ):
+        image_retention_service = ImageRetentionService(
+            results_path,
+            max_bytes_per_camera=settings.storage.max_mb_per_camera * 1024 * 1024,
+            max_age=settings.storage.max_age_hours * 3600,
+            interval=settings.storage.retention_interval,
+            # Cada nó/processo cuida apenas das imagens das câmeras que processa
+            camera_filter=(
+                (lambda camera_id: load_cameras_use_case.owns(camera_id or 0))
+                if load_cameras_use_case.is_partitioned() else None
+            )
+        )
+        image_retention_service.start()
+    
+    if settings.storage.save_images and image_retention_service is None and (
+        image_archive is None or not settings.storage.archive_max_segments
+    ):
+        # O diretório não é mais apagado na inicialização: sem retenção, as imagens acumulam
+        logger.warning(
+            f"Salvamento de imagens habilitado sem retenção (cota_mb_por_camera, "
+            f"idade_maxima_horas e arquivo_segmentos.max_segmentos em 0): o uso de disco "
+            f"em '{results_path}' crescerá sem limite"
+        )
+    
+    image_save_service = ImageSaveService(
+        queue_size=settings.performance.image_save_queue_size,
+        camera_name="Global",
+        encoder_workers=settings.performance.image_save_encoders,
+        writer_workers=settings.performance.image_save_writers,
+        on_saved=image_retention_service.add if image_retention_service is not None else None,
+        archive=image_archive
+    )
     
     # OTIMIZAÇÃO: Fila FindFace global compartilhada por todas as câmeras
-    # Pool de N/2 workers (onde N = número de CPUs)
+    # Modo "threads": pool de N/2 workers (onde N = número de CPUs)
+    # Modo "async": event loop único com até max_in_flight envios simultâneos
     import multiprocessing
-    from queue import Queue
     
     num_cpus = multiprocessing.cpu_count()
-    num_findface_workers = max(4, num_cpus // 2)  # Mínimo de 4 workers
-    findface_queue = Queue(maxsize=500)  # Fila global
-    findface_workers = []
-    findface_workers_running = True
+    num_findface_workers = findface_send_workers(settings.findface, group_count)  # Mínimo de 4 workers
+    findface_queue_size = settings.performance.findface_queue_size
+    findface_queue = None
     
-    logger.info(f"Criando fila FindFace global com {num_findface_workers} workers (CPUs: {num_cpus})")
+    # Registro colunar dos tracks finalizados e dos envios (gravação em lote fora das threads de captura)
+    track_metadata_log = None
+    if settings.track_log.enabled:
+        track_metadata_log = TrackMetadataLog(
+            worker_path(settings.track_log.path),
+            flush_interval=settings.track_log.flush_interval,
+            batch_size=settings.track_log.batch_size,
+            max_buffer=settings.track_log.max_buffer,
+            compress=settings.track_log.compress
+        )
+        track_metadata_log.start()
     
-    def findface_worker_func(worker_id, queue, adapter, running_flag_container):
-        """Worker FindFace que processa eventos de todas as câmeras."""
-        worker_logger = logging.getLogger(f"FindFaceWorker-{worker_id}")
-        worker_logger.info(f"Worker {worker_id} iniciado")
-        
-        while running_flag_container[0]:
-            try:
-                event_data = queue.get(timeout=0.5)
-                
-                if event_data is None:  # Sinal de parada
-                    worker_logger.info(f"Worker {worker_id} recebeu sinal de parada")
-                    break
-                
-                camera_id, camera_name, track_id, event, total_events = event_data
-                
-                try:
-                    resposta = adapter.send_event(event)
-                    
-                    if resposta:
-                        worker_logger.info(
-                            f"✓ FindFace - Melhor face do Track {track_id} enviada com sucesso! "
-                            f"Camera: {camera_name} (ID: {camera_id}) | Total de eventos: {total_events}"
-                        )
-                    # else:
-                    #     worker_logger.warning(
-                    #         f"✗ FindFace - Resposta vazia - Camera {camera_name} (ID: {camera_id}) Track {track_id}"
-                    #     )
-                except Exception as e:
-                    worker_logger.error(
-                        f"✗ FindFace - FALHA - Camera {camera_name} (ID: {camera_id}) Track {track_id}: {e}"
-                    )
-                finally:
-                    queue.task_done()
-                    
-            except Exception:
-                if not running_flag_container[0]:
-                    break
-                continue
-        
-        worker_logger.info(f"Worker {worker_id} finalizado")
-    
-    # Container mutável para flag de running (compartilhado entre workers)
-    findface_running_flag = [True]
-    
-    # Cria pool de workers FindFace
-    for i in range(num_findface_workers):
-        worker_thread = threading.Thread(
-            target=findface_worker_func,
-            args=(i + 1, findface_queue, findface_adapter, findface_running_flag),
-            name=f"FindFaceWorker-{i + 1}",
-            daemon=True
+    # Outbox durável: eventos não entregues sobrevivem a quedas do FindFace
+    findface_outbox = None
+    if settings.outbox.enabled:
+        findface_outbox = FindfaceOutboxSQLite(
+            worker_path(settings.outbox.path),
+            max_bytes=settings.outbox.max_size_mb * 1024 * 1024,
+            eviction=settings.outbox.eviction,
+            batch_size=settings.outbox.batch_size,
+            flush_interval=settings.outbox.flush_interval,
+            close_timeout=settings.outbox.close_timeout
         )
-        worker_thread.start()
-        findface_workers.append(worker_thread)
     
-    logger.info(f"Pool de {num_findface_workers} workers FindFace iniciado")
+    # Fila de envio: FIFO (padrão), priorizada por qualidade/idade da face ou justa por câmera
+    dispatch_queue = None
+    if settings.findface.queue_policy == "fair":
+        dispatch_queue = FindfaceFairQueue(
+            maxsize=findface_queue_size,
+            age_weight=settings.findface.priority_age_weight,
+            weights=settings.findface.camera_weights,
+            caps=settings.findface.camera_caps,
+            default_cap=settings.findface.default_camera_cap
+        )
+        logger.info(f"Fila FindFace justa por câmera (capacidade: {findface_queue_size})")
+    elif settings.findface.queue_policy == "priority":
+        dispatch_queue = FindfacePriorityQueue(
+            maxsize=findface_queue_size,
+            age_weight=settings.findface.priority_age_weight
+        )
+        logger.info(f"Fila FindFace priorizada por qualidade (capacidade: {findface_queue_size})")
     
-    # Limpa o diretório de imagens antes de iniciar
-    imagens_dir = os.path.join(os.path.dirname(__file__), settings.storage.project_dir)
-    if os.path.exists(imagens_dir):
-        import shutil
-        shutil.rmtree(imagens_dir)
-        logger.info(f"Diretório '{imagens_dir}' limpo.")
+    # Concorrência adaptativa: o limite de envios simultâneos acompanha a capacidade do
+    # FindFace (cresce com latência estável, recua com 5xx/timeouts/aumento de latência)
+    findface_limiter = None
+    max_in_flight = per_worker(settings.findface.max_in_flight)
+    if settings.findface.adaptive_concurrency:
+        max_in_flight = num_findface_workers  # Teto max_concurrency dividido entre os processos
+        findface_limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=per_worker(settings.findface.initial_concurrency),
+            min_limit=per_worker(settings.findface.min_concurrency),
+            max_limit=max_in_flight,
+            latency_tolerance=settings.findface.latency_tolerance
+        )
+        logger.info(
+            f"Concorrência FindFace adaptativa (inicial: {settings.findface.initial_concurrency}, "
+            f"mín.: {settings.findface.min_concurrency}, máx.: {settings.findface.max_concurrency})"
+        )
     
-    os.makedirs(imagens_dir, exist_ok=True)
-    logger.info(f"Diretório '{imagens_dir}' criado.")
+    if settings.findface.dispatcher == "async":
+        try:
+            findface_queue = FindfaceAsyncDispatcher(
+                findface_adapter,
+                max_in_flight=max_in_flight,
+                encoder_workers=settings.findface.workers or 2,
+                queue_size=findface_queue_size,
+                outbox=findface_outbox,
+                replay_rate=settings.outbox.replay_rate,
+                dispatch_queue=dispatch_queue,
+                limiter=findface_limiter,
+                metadata_log=track_metadata_log
+            )
+        except RuntimeError as e:
+            logger.warning(f"Dispatcher FindFace assíncrono indisponível ({e}). Usando pool de threads.")
     
-    processors = []
+    if findface_queue is None:
+        logger.info(f"Criando fila FindFace global com {num_findface_workers} workers (CPUs: {num_cpus})")
+        findface_queue = FindfaceThreadDispatcher(
+            findface_adapter,
+            num_workers=num_findface_workers,
+            queue_size=findface_queue_size,
+            outbox=findface_outbox,
+            replay_rate=settings.outbox.replay_rate,
+            dispatch_queue=dispatch_queue,
+            limiter=findface_limiter,
+            metadata_log=track_metadata_log
+        )
+    
+    findface_queue.start()
     
-    # Obtém câmeras ativas usando DDD (Repository + Use Case)
-    camera_repository = CameraRepositoryFindface(ff, camera_prefix=settings.findface.camera_prefix)
-    load_cameras_use_case = LoadCamerasUseCase(camera_repository, settings)
-    cameras_ff = load_cameras_use_case.execute()
+    # Diretório de imagens é mantido entre reinicializações (sem limpeza bloqueante no boot);
+    # imagens antigas são removidas em segundo plano pela retenção (cota/idade por câmera)
+    imagens_dir = os.path.join(os.path.dirname(__file__), settings.storage.project_dir)
+    os.makedirs(imagens_dir, exist_ok=True)
+    
+    # Warm start: inicia imediatamente com as câmeras do cache e confirma a lista no
+    # FindFace em segundo plano (reconciliação), sem esperar pela API na inicialização
+    warm_start = bool(
+        settings.findface.camera_warm_start
+        and settings.findface.camera_cache_path
+        and settings.findface.camera_reconcile_interval > 0
+    )
+    cameras_ff = load_cameras_use_case.execute(cached=True) if warm_start else []
+    if cameras_ff:
+        logger.info("Câmeras iniciadas a partir do cache local; lista será confirmada no FindFace.")
+    else:
+        warm_start = False
+        cameras_ff = load_cameras_use_case.execute()
     
     logger.info(f"Total de {len(cameras_ff)} câmera(s) ativas para processar.")
     
-    # Obtém lista de GPUs a usar (distribuição round-robin)
+    # Obtém lista de GPUs a usar (cada câmera vai para a GPU com menos câmeras)
     gpu_devices = settings.processing.gpu_devices
+    if camera_group is not None:
+        # Rotaciona a ordem das GPUs por processo: em empate, cada grupo começa por uma GPU diferente
+        offset = camera_group[0] % len(gpu_devices)
+        gpu_devices = gpu_devices[offset:] + gpu_devices[:offset]
     num_gpus = len(gpu_devices)
     logger.info(f"Distribuindo {len(cameras_ff)} câmera(s) entre {num_gpus} GPU(s): {gpu_devices}")
     
-    # Cria serviços de detecção - CADA CÂMERA COM SEU PRÓPRIO MODELO
-    for i, camera in enumerate(cameras_ff, 1):
+    # OTIMIZAÇÃO: Modelo de landmarks ÚNICO compartilhado por todas as câmeras
+    # Um serviço com fila por câmera (round-robin) monta lotes com crops de todas as câmeras
+    landmarks_service = None
+    if settings.yolo.landmarks_model_path:
         try:
-            # Determina GPU para esta câmera (round-robin)
-            gpu_id = gpu_devices[(i - 1) % num_gpus]
-            logger.info(f"[{i}/{len(cameras_ff)}] Câmera {camera.camera_name.value()} → GPU {gpu_id}")
-            
-            # IMPORTANTE: Cria uma instância SEPARADA do modelo para cada câmera
-            # Isso evita conflitos de thread-safety
-            logger.info(f"[{i}/{len(cameras_ff)}] Carregando modelo para câmera {camera.camera_name.value()}...")
-            
-            # Configura GPU antes de criar o modelo
             import torch
-            if torch.cuda.is_available():
-                torch.cuda.set_device(gpu_id)
-                logger.info(f"[{i}/{len(cameras_ff)}] GPU {gpu_id} selecionada para câmera {camera.camera_name.value()}")
+            device_name = f"cuda:{gpu_devices[0]}" if torch.cuda.is_available() else "cpu"
+            logger.info(f"Carregando modelo de landmarks compartilhado ({device_name})...")
             
-            detection_model = ModelFactory.create_model(
-                model_path=settings.yolo.model_path,
-                use_tensorrt=settings.tensorrt.enabled,
-                tensorrt_precision=settings.tensorrt.precision,
-                tensorrt_workspace=settings.tensorrt.workspace,
-                use_openvino=settings.openvino.enabled,
-                openvino_device=settings.openvino.device,
-                openvino_precision=settings.openvino.precision
+            landmarks_model = LandmarksModelFactory.create(
+                model_path=settings.yolo.landmarks_model_path,
+                device=device_name
             )
             
-            model_info = detection_model.get_model_info()
+            landmarks_info = landmarks_model.get_model_info()
             logger.info(
-                f"[{i}/{len(cameras_ff)}] Modelo de detecção carregado: "
-                f"backend={model_info['backend']}, "
-                f"device={model_info['device']}, "
-                f"precision={model_info['precision']}"
+                f"Modelo de landmarks carregado: "
+                f"backend={landmarks_info['backend']}, "
+                f"device={landmarks_info['device']}, "
+                f"keypoints={landmarks_info['num_keypoints']}"
             )
             
-            # Carrega modelo de landmarks (se configurado)
-            landmarks_model = None
-            if settings.yolo.landmarks_model_path:
-                try:
-                    logger.info(f"[{i}/{len(cameras_ff)}] Carregando modelo de landmarks para câmera {camera.camera_name.value()}...")
-                    
-                    device_name = f"cuda:{gpu_id}" if torch.cuda.is_available() else "cpu"
-                    landmarks_model = LandmarksModelFactory.create(
-                        model_path=settings.yolo.landmarks_model_path,
-                        device=device_name
-                    )
-                    
-                    landmarks_info = landmarks_model.get_model_info()
-                    logger.info(
-                        f"[{i}/{len(cameras_ff)}] Modelo de landmarks carregado: "
-                        f"backend={landmarks_info['backend']}, "
-                        f"device={landmarks_info['device']}, "
-                        f"keypoints={landmarks_info['num_keypoints']}"
-                    )
-                except Exception as e:
-                    logger.warning(
-                        f"[{i}/{len(cameras_ff)}] Erro ao carregar modelo de landmarks: {e}. "
-                        f"Prosseguindo sem landmarks dedicado."
-                    )
-            
-            processor = ByteTrackDetectorService(
-                camera=camera,
-                detection_model=detection_model,
+            landmarks_service = LandmarksInferenceService(
                 landmarks_model=landmarks_model,
-                findface_adapter=findface_adapter,
-                findface_queue=findface_queue,  # Fila global compartilhada
-                image_save_service=image_save_service,
-                tracker=settings.bytetrack.tracker_config,
-                batch=settings.batch_size,
-                show=settings.processing.show_video,
-                conf=settings.yolo.conf_threshold,
-                iou=settings.yolo.iou_threshold,
-                max_frames_lost=settings.bytetrack.max_frames_lost,
-                verbose_log=settings.processing.verbose_log,
-                save_images=settings.storage.save_images,
-                project_dir=settings.storage.project_dir,
-                results_dir=settings.storage.results_dir,
-                min_movement_threshold=settings.movement.min_movement_threshold_pixels,
-                min_movement_percentage=settings.movement.min_movement_frame_percentage,
-                min_confidence_threshold=settings.detection_filter.min_confidence,
-                min_bbox_width=settings.detection_filter.min_bbox_width,
-                max_frames_per_track=settings.bytetrack.max_frames_per_track,
-                inference_size=settings.performance.inference_size,
-                detection_skip_frames=settings.performance.detection_skip_frames
+                batch_size=settings.batch_size,
+                conf=settings.yolo.conf_threshold
             )
-            processors.append(processor)
-            
         except Exception as e:
-            logger.error(f"Erro ao carregar modelo para câmera {camera.camera_name.value()}: {e}")
-            logger.warning(f"Câmera {camera.camera_name.value()} será ignorada.")
-            continue
+            logger.warning(
+                f"Erro ao carregar modelo de landmarks: {e}. "
+                f"Prosseguindo sem landmarks dedicado."
+            )
+    
+    # Cria serviços de detecção - modelo próprio por câmera ou modelo compartilhado por GPU
+    def load_detection_model(gpu_id: int):
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.set_device(gpu_id)
+        logger.info(f"Carregando modelo de detecção na GPU {gpu_id}...")
+        
+        detection_model = ModelFactory.create_model(
+            model_path=settings.yolo.model_path,
+            use_tensorrt=settings.tensorrt.enabled,
+            tensorrt_precision=settings.tensorrt.precision,
+            tensorrt_workspace=settings.tensorrt.workspace,
+            use_openvino=settings.openvino.enabled,
+            openvino_device=settings.openvino.device,
+            openvino_precision=settings.openvino.precision,
+            imgsz=settings.performance.inference_size,
+            export_cache_dir=settings.yolo.export_cache_dir or None
+        )
+        
+        model_info = detection_model.get_model_info()
+        logger.info(
+            f"Modelo de detecção carregado: "
+            f"backend={model_info['backend']}, "
+            f"device={model_info['device']}, "
+            f"precision={model_info['precision']}"
+        )
+        return detection_model
     
-    if not processors:
-        logger.error("Nenhuma câmera foi carregada com sucesso. Encerrando.")
-        return
+    # OTIMIZAÇÃO: Pesos compartilhados - o estado por câmera é apenas o tracker ByteTrack
+    # (CameraTrackingModel); as inferências usam as réplicas do modelo da GPU com exclusividade
+    shared_models = {}
+    shared_models_lock = threading.Lock()
     
-    logger.info(f"Iniciando {len(processors)} processador(es) de câmera em paralelo...")
+    def create_detection_model(gpu_id: int):
+        if not settings.performance.shared_detection_model:
+            # Instância SEPARADA do modelo (e do tracker) para cada câmera
+            return load_detection_model(gpu_id)
+        with shared_models_lock:
+            shared_model = shared_models.get(gpu_id)
+            if shared_model is None:
+                replicas = max(1, settings.performance.detection_model_replicas)
+                shared_model = SharedDetectionModel([load_detection_model(gpu_id) for _ in range(replicas)])
+                shared_models[gpu_id] = shared_model
+                logger.info(f"Modelo de detecção compartilhado na GPU {gpu_id} ({replicas} réplica(s))")
+        return CameraTrackingModel(shared_model)
+    
+    def create_track_deduplicator():
+        # Deduplicador exclusivo por câmera (agrupa tracks fragmentados antes do envio)
+        if not settings.dedup.enabled:
+            return None
+        return TrackDeduplicator(
+            horizon=settings.dedup.horizon,
+            max_gap=settings.dedup.max_gap,
+            max_distance=settings.dedup.max_distance,
+            max_hash_distance=settings.dedup.max_hash_distance,
+            max_hold=settings.dedup.max_hold
+        )
+    
+    def create_processor(camera, detection_model):
+        return ByteTrackDetectorService(
+            camera=camera,
+            detection_model=detection_model,
+            landmarks_service=landmarks_service,
+            findface_adapter=findface_adapter,
+            findface_queue=findface_queue,  # Fila global compartilhada
+            image_save_service=image_save_service,
+            track_deduplicator=create_track_deduplicator(),
+            track_metadata_log=track_metadata_log,
+            tracker=settings.bytetrack.tracker_config,
+            batch=settings.batch_size,
+            show=settings.processing.show_video,
+            conf=settings.yolo.conf_threshold,
+            iou=settings.yolo.iou_threshold,
+            max_frames_lost=settings.bytetrack.max_frames_lost,
+            verbose_log=settings.processing.verbose_log,
+            save_images=settings.storage.save_images,
+            save_mode=settings.storage.save_mode,
+            save_jpeg_quality=settings.storage.jpeg_quality,
+            save_crop_context=settings.storage.crop_context,
+            save_thumbnail_size=settings.storage.thumbnail_size,
+            save_annotate=settings.storage.annotate,
+            save_layout=settings.storage.layout,
+            project_dir=settings.storage.project_dir,
+            results_dir=settings.storage.results_dir,
+            min_movement_threshold=settings.movement.min_movement_threshold_pixels,
+            min_movement_percentage=settings.movement.min_movement_frame_percentage,
+            min_confidence_threshold=settings.detection_filter.min_confidence,
+            min_bbox_width=settings.detection_filter.min_bbox_width,
+            max_frames_per_track=settings.bytetrack.max_frames_per_track,
+            inference_size=settings.performance.inference_size,
+            detection_skip_frames=settings.performance.detection_skip_frames,
+            stall_timeout=settings.stream.stall_timeout,
+            reconnect_backoff=settings.stream.reconnect_backoff,
+            reconnect_backoff_max=settings.stream.reconnect_backoff_max
+        )
+    
+    # Reconciliação de câmeras: câmeras adicionadas/removidas no FindFace são iniciadas/paradas
+    # sem reiniciar o processo; modelos de câmeras removidas são reaproveitados (DetectionModelPool)
+    model_pool = DetectionModelPool(
+        create_detection_model,
+        max_idle_per_device=settings.findface.max_idle_models
+    )
+    reconciler = CameraReconciler(
+        load_cameras_use_case,
+        create_processor,
+        model_pool,
+        devices=gpu_devices,
+        interval=settings.findface.camera_reconcile_interval
+    )
+    
+    logger.info(f"Iniciando {len(cameras_ff)} processador(es) de câmera em paralelo...")
     
-    # Inicia cada processador em uma thread separada
-    threads = []
     try:
-        for i, proc in enumerate(processors):
-            thread = threading.Thread(
-                target=proc.start,
-                name=f"Camera-{proc.camera.camera_id.value()}-{proc.camera.camera_name.value()}",
-                daemon=True
-            )
-            thread.start()
-            threads.append(thread)
-            logger.info(
-                f"Thread {i+1}/{len(processors)} iniciada: "
-                f"Camera {proc.camera.camera_name.value()} (ID: {proc.camera.camera_id.value()})"
-            )
+        started = reconciler.start(cameras_ff, reconcile_now=warm_start)
+        if not started and settings.findface.camera_reconcile_interval <= 0:
+            logger.error("Nenhuma câmera foi carregada com sucesso. Encerrando.")
+            return
         
-        logger.info(f"Todas as {len(threads)} threads de câmera foram iniciadas com sucesso.")
+        logger.info(f"{started} câmera(s) iniciada(s) com sucesso.")
         logger.info("Pressione Ctrl+C para parar o processamento.")
         
         # Mantém o programa principal rodando com timeout para responder ao Ctrl+C
         import time
-        while any(thread.is_alive() for thread in threads):
+        last_stats_log = time.monotonic()
+        while reconciler.is_running():
             time.sleep(0.5)  # Verifica a cada 500ms se threads ainda estão vivas
             
+            # Parada solicitada pelo supervisor: mesmo encerramento gracioso do Ctrl+C
+            if stop_event is not None and stop_event.is_set():
+                raise KeyboardInterrupt
+            
+            # Loga métricas HTTP do FindFace a cada 60s (latência e reuso de conexões)
+            if time.monotonic() - last_stats_log >= 60:
+                last_stats_log = time.monotonic()
+                http_stats = findface_adapter.findface.get_http_stats()
+                logger.info(
+                    f"FindFace HTTP - requisições: {http_stats['requests']} | "
+                    f"erros: {http_stats['errors']} | "
+                    f"latência média: {http_stats['avg_latency_ms']:.1f}ms | "
+                    f"p95: {http_stats['p95_latency_ms']:.1f}ms | "
+                    f"conexões abertas: {http_stats['connections_opened']} | "
+                    f"reuso: {http_stats['connection_reuse_rate']:.1%} | "
+                    f"retentativas: {http_stats['retries']} | "
+                    f"renovações de token: {http_stats['token_refreshes']} | "
+                    f"circuito: {http_stats['breaker_state']} "
+                    f"({http_stats['short_circuited']} recusadas)"
+                )
+                dispatch_stats = findface_queue.get_stats()
+                logger.info(
+                    f"FindFace envio - enviados: {dispatch_stats['sent']} | "
+                    f"falhas: {dispatch_stats['failed']} | "
+                    f"fila: {dispatch_stats['queue_size']}/{findface_queue.maxsize} | "
+                    f"outbox: {dispatch_stats['outbox_pending']} "
+                    f"(guardados: {dispatch_stats['spilled']}, reenviados: {dispatch_stats['replayed']})"
+                )
+                if 'concurrency' in dispatch_stats:
+                    concurrency = dispatch_stats['concurrency']
+                    logger.info(
+                        f"FindFace concorrência - limite: {concurrency['limit']} | "
+                        f"em voo: {concurrency['in_flight']} | "
+                        f"latência média: {concurrency['avg_latency_ms']:.1f}ms "
+                        f"(base: {concurrency['baseline_latency_ms']:.1f}ms) | "
+                        f"vazão: {concurrency['throughput']:.1f} req/s | "
+                        f"sobrecargas: {concurrency['overloads']}"
+                    )
+                for camera_id, camera_stats in dispatch_stats.get('queue', {}).get('per_camera', {}).items():
+                    logger.info(
+                        f"FindFace fila câmera {camera_id} - pendentes: {camera_stats['depth']} | "
+                        f"enviados: {camera_stats['served']} | descartados: {camera_stats['evicted']} | "
+                        f"espera média: {camera_stats['avg_wait_ms']:.0f}ms | "
+                        f"espera máx.: {camera_stats['max_wait_ms']:.0f}ms"
+                    )
+                save_stats = image_save_service.get_stats()
+                logger.info(
+                    f"Imagens - salvas: {save_stats['saved']} | "
+                    f"descartadas: {save_stats['dropped']} | "
+                    f"erros: {save_stats['errors']} | "
+                    f"vazão: {save_stats['throughput']:.1f} img/s | "
+                    f"fila: {save_stats['queue_size']}/{image_save_service.queue_size}"
+                )
+                for camera_id, camera_stats in save_stats['per_camera'].items():
+                    if camera_stats['dropped']:
+                        logger.warning(
+                            f"Imagens câmera {camera_id} - salvas: {camera_stats['saved']} | "
+                            f"descartadas: {camera_stats['dropped']}"
+                        )
+                reconciler_stats = reconciler.get_stats()
+                logger.info(
+                    f"Câmeras - em processamento: {reconciler_stats['cameras']} | "
+                    f"iniciadas: {reconciler_stats['started']} | "
+                    f"paradas: {reconciler_stats['stopped']} | "
+                    f"reiniciadas: {reconciler_stats['restarted']} | "
+                    f"modelos reutilizados: {reconciler_stats['model_pool']['reused']}"
+                )
+                for gpu_id, shared_model in list(shared_models.items()):
+                    model_stats = shared_model.get_stats()
+                    logger.info(
+                        f"Modelo compartilhado GPU {gpu_id} - inferências: {model_stats['calls']} | "
+                        f"réplicas ociosas: {model_stats['idle']}/{model_stats['replicas']} | "
+                        f"aguardando: {model_stats['waiting']} | "
+                        f"espera média: {model_stats['avg_wait_ms']:.1f}ms | "
+                        f"espera máx.: {model_stats['max_wait_ms']:.0f}ms"
+                    )
+                for camera_id, stream_stats in reconciler_stats['streams'].items():
+                    if not stream_stats['connected']:
+                        logger.warning(
+                            f"Câmera {camera_id} sem stream - último frame há "
+                            f"{stream_stats['last_frame_age']:.0f}s | "
+                            f"reconexões: {stream_stats['reconnects']} | "
+                            f"travamentos: {stream_stats['stalls']}"
+                        )
+            
     except KeyboardInterrupt:
         logger.info("\n⚠️  Interrupção detectada (Ctrl+C). Finalizando todas as câmeras...")
-        for proc in processors:
-            proc.stop()
-        
-        # Finaliza workers FindFace globais
-        logger.info("Finalizando pool de workers FindFace...")
-        findface_running_flag[0] = False
-        
-        # Envia sinais de parada para todos os workers
-        for i in range(num_findface_workers):
-            try:
-                findface_queue.put(None, timeout=0.5)
-            except:
-                pass
+    finally:
+        # Encerramento em qualquer saída (Ctrl+C, parada pelo supervisor, fim do loop ou erro):
+        # eventos, metadados e imagens pendentes são drenados antes de o processo terminar.
+        # Para a reconciliação e as câmeras ANTES do dispatcher: os tracks finalizados
+        # no encerramento ainda são enfileirados para envio
+        logger.info("Aguardando threads de câmeras finalizarem...")
+        reconciler.stop()
+        logger.info("✓ Todas as câmeras foram finalizadas.")
         
-        # Aguarda workers FindFace finalizarem
-        for i, worker in enumerate(findface_workers, 1):
-            worker.join(timeout=2.0)
-            if worker.is_alive():
-                logger.warning(f"FindFace worker {i}/{num_findface_workers} não finalizou no tempo esperado")
-            else:
-                logger.info(f"FindFace worker {i}/{num_findface_workers} finalizado")
+        # Finaliza dispatcher FindFace global (eventos pendentes vão para o outbox, se habilitado)
+        findface_queue.stop()
+        if findface_outbox is not None:
+            findface_outbox.close()
         
-        logger.info("✓ Pool de workers FindFace finalizado")
+        # Grava os metadados pendentes (após câmeras e dispatcher pararem de registrar)
+        if track_metadata_log is not None:
+            track_metadata_log.stop()
         
-        # Aguarda threads de câmeras finalizarem (timeout de 5 segundos por thread)
-        logger.info("Aguardando threads de câmeras finalizarem...")
-        for i, thread in enumerate(threads, 1):
-            thread.join(timeout=5.0)
-            if thread.is_alive():
-                logger.warning(f"Thread {i}/{len(threads)} não finalizou no tempo esperado.")
-            else:
-                logger.info(f"Thread {i}/{len(threads)} finalizada com sucesso.")
+        # Finaliza serviço de landmarks compartilhado (após as câmeras pararem de enfileirar)
+        if landmarks_service is not None:
+            landmarks_service.stop()
         
-        logger.info("✓ Todas as câmeras foram finalizadas.")
+        # Finaliza serviço de salvamento compartilhado (imagens pendentes são gravadas)
+        image_save_service.stop()
+        if image_retention_service is not None:
+            image_retention_service.stop()
+        if image_archive is not None:
+            image_archive.close()
+
+
+def create_findface_adapter(settings: AppSettings, group_count: int = 1):
+    """Cria o cliente FindFace e o adapter usado pelas câmeras e pelos dispatchers."""
+    ff = create_findface_client(settings.findface, group_count=group_count)
+    findface_adapter = FindfaceAdapter(
+        ff,
+        camera_prefix=settings.findface.camera_prefix,
+        upload_mode=settings.findface.upload_mode,
+        crop_context=settings.findface.crop_context,
+        jpeg_quality=settings.findface.jpeg_quality,
+        max_upload_bytes=settings.findface.max_upload_bytes
+    )
+    return ff, findface_adapter
+
+
+class _WorkerLogFilter(logging.Filter):
+    """Prefixa o nome do logger com o processo de trabalho de origem."""
+    
+    def __init__(self, worker_name: str):
+        super().__init__()
+        self.worker_name = worker_name
+    
+    def filter(self, record):
+        record.name = f"{self.worker_name}.{record.name}"
+        return True
+
+
+def run_camera_worker(index: int, count: int, log_queue, stop_event):
+    """
+    Ponto de entrada de um processo de trabalho (modo multiprocesso).
+    Processa apenas as câmeras do grupo ``index`` com cliente FindFace, dispatcher e
+    salvamento próprios; os logs são enviados ao processo supervisor.
+    """
+    # Logs vão para o supervisor (arquivo e console únicos); nenhum handler local fica aberto
+    if queue_listener is not None:
+        queue_listener.stop()
+    for handler in (file_handler, console_handler):
+        if handler is not None:
+            handler.close()
+    worker_handler = QueueHandler(log_queue)
+    worker_handler.setLevel(logging.INFO)
+    worker_handler.addFilter(_WorkerLogFilter(f"worker-{index}"))
+    root_logger.handlers.clear()
+    root_logger.addHandler(worker_handler)
+    
+    ff = None
+    try:
+        settings = ConfigLoader.load()
+        ff, findface_adapter = create_findface_adapter(settings, group_count=count)
+        main(settings, findface_adapter, camera_group=(index, count), stop_event=stop_event)
+    except KeyboardInterrupt:
+        # Ctrl+C chega a todos os processos do grupo; o supervisor coordena o encerramento
+        pass
+    finally:
+        if ff is not None:
+            ff.logout()
+            ff.close()
+
+
+def run_supervisor(settings: AppSettings):
+    """
+    Modo multiprocesso: distribui as câmeras entre ``worker_processes`` processos e os
+    supervisiona (reinício com backoff, logs agregados e encerramento gracioso).
+    """
+    logger = logging.getLogger(__name__)
+    supervisor = WorkerProcessSupervisor(
+        run_camera_worker,
+        settings.processing.worker_processes,
+        backoff=settings.processing.worker_restart_backoff,
+        max_backoff=settings.processing.worker_restart_backoff_max
+    )
+    
+    # Logs dos processos de trabalho gravados pelos mesmos handlers deste processo
+    worker_log_listener = QueueListener(
+        supervisor.log_queue,
+        file_handler,
+        console_handler,
+        respect_handler_level=True
+    )
+    worker_log_listener.start()
+    
+    import time
+    try:
+        supervisor.start()
+        logger.info("Pressione Ctrl+C para parar o processamento.")
+        last_stats_log = time.monotonic()
+        while supervisor.is_running():
+            time.sleep(0.5)
+            if time.monotonic() - last_stats_log >= 60:
+                last_stats_log = time.monotonic()
+                stats = supervisor.get_stats()
+                logger.info(
+                    f"Processos de trabalho - ativos: {stats['alive']}/{supervisor.count} | "
+                    f"reinícios: {stats['restarts']}"
+                )
+    except KeyboardInterrupt:
+        logger.info("\n⚠️  Interrupção detectada (Ctrl+C). Finalizando processos de trabalho...")
+        supervisor.stop()
+        logger.info("✓ Todos os processos de trabalho foram finalizados.")
+    finally:
+        worker_log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -425,14 +785,15 @@ if __name__ == "__main__":
         # Carrega configurações type-safe
         settings = ConfigLoader.load()
         
-        # Cria cliente FindFace
-        ff = create_findface_client(settings.findface)
-        
-        # Cria adapter do FindFace
-        findface_adapter = FindfaceAdapter(ff, camera_prefix=settings.findface.camera_prefix)
-        
-        # Executa aplicação
-        main(settings, findface_adapter)
+        if settings.processing.worker_processes > 0:
+            # Cada processo de trabalho cria seu próprio cliente FindFace
+            run_supervisor(settings)
+        else:
+            # Cria cliente e adapter do FindFace
+            ff, findface_adapter = create_findface_adapter(settings)
+            
+            # Executa aplicação
+            main(settings, findface_adapter)
         
     except Exception as e:
         print(f"Erro ao iniciar aplicação: {e}")
@@ -440,19 +801,13 @@ if __name__ == "__main__":
     finally:
         # Para o queue listener antes de encerrar
         try:
-            if 'queue_listener' in globals():
+            if queue_listener is not None:
                 queue_listener.stop()
+                file_handler.close()
                 print("Sistema de logging assíncrono finalizado")
         except Exception as e:
             print(f"Erro ao finalizar queue listener: {e}")
         
-        # Para o ImageSaveService
-        try:
-            if 'image_save_service' in locals():
-                image_save_service.stop()
-                print("ImageSaveService finalizado")
-        except Exception as e:
-            print(f"Erro ao finalizar ImageSaveService: {e}")
-        
         if 'ff' in locals():
-            ff.logout()
\ No newline at end of file
+            ff.logout()
+            ff.close()
\ No newline at end of file
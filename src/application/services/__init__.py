@@ -0,0 +1,8 @@
+"""
+Serviços da aplicação.
+"""
+
+from .camera_reconciler import CameraReconciler
+from .process_supervisor import WorkerProcessSupervisor
+
+__all__ = ['CameraReconciler', 'WorkerProcessSupervisor']
@@ -0,0 +1,276 @@
+"""
+Reconciliação periódica das câmeras em processamento com as câmeras ativas.
+Application Layer - orquestra o ciclo de vida dos processadores de câmera.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.application.use_cases import LoadCamerasUseCase
+from src.domain.entities import Camera
+from src.domain.services import ByteTrackDetectorService, DetectionModelPool
+from src.domain.services.model_interface import IDetectionModel
+
+
+class CameraReconciler:
+    """
+    Mantém um ByteTrackDetectorService (em thread própria) para cada câmera ativa.
+
+    Uma thread de fundo recarrega periodicamente a lista de câmeras e aplica a diferença:
+    - câmeras novas são iniciadas com um modelo do DetectionModelPool (sem recarregar
+      do disco quando houver modelo ocioso no dispositivo);
+    - câmeras removidas/desativadas são paradas graciosamente (os tracks ativos são
+      finalizados e enviados) e o modelo volta ao pool;
+    - câmeras cujos dados mudaram (nome, token ou URL) são reiniciadas;
+    - câmeras inalteradas não são tocadas.
+
+    Se a consulta ao FindFace falhar, a rodada é ignorada (nenhuma câmera é parada).
+    """
+
+    def __init__(
+        self,
+        load_cameras_use_case: LoadCamerasUseCase,
+        processor_factory: Callable[[Camera, IDetectionModel], ByteTrackDetectorService],
+        model_pool: DetectionModelPool,
+        devices: List[int],
+        interval: float = 60.0,
+        stop_timeout: float = 10.0,
+        retry_interval: float = 5.0
+    ):
+        """
+        :param load_cameras_use_case: Caso de uso que lista as câmeras ativas.
+        :param processor_factory: Cria o processador de uma câmera com o modelo informado.
+        :param model_pool: Pool de modelos de detecção compartilhado.
+        :param devices: Dispositivos (GPUs) disponíveis para as câmeras.
+        :param interval: Intervalo (s) entre reconciliações (0 = desativa a reconciliação).
+        :param stop_timeout: Espera máxima (s) pela finalização de uma câmera removida.
+        :param retry_interval: Intervalo (s) até a próxima tentativa quando a consulta falha
+                               (limitado a ``interval``).
+        :raises ValueError: Se nenhum dispositivo for informado.
+        """
+        if not devices:
+            raise ValueError("devices deve conter ao menos um dispositivo")
+
+        self.load_cameras_use_case = load_cameras_use_case
+        self.processor_factory = processor_factory
+        self.model_pool = model_pool
+        self.devices = list(devices)
+        self.interval = interval
+        self.stop_timeout = stop_timeout
+        self.retry_interval = retry_interval
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # camera_id -> (câmera, processador, thread, dispositivo)
+        self._cameras: Dict[int, Tuple[Camera, ByteTrackDetectorService, threading.Thread, int]] = {}
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._reconcile_now = False
+        self._last_failed = False
+
+        # Estatísticas
+        self._reconciliations = 0
+        self._failed_reconciliations = 0
+        self._started = 0
+        self._stopped = 0
+        self._restarted = 0
+
+    def _pick_device(self) -> int:
+        """Escolhe o dispositivo com menos câmeras (em empate, o primeiro da lista)."""
+        load = {device: 0 for device in self.devices}
+        for _, _, _, device in self._cameras.values():
+            load[device] = load.get(device, 0) + 1
+        return min(self.devices, key=lambda device: load[device])
+
+    def start_camera(self, camera: Camera) -> bool:
+        """
+        Cria e inicia o processador de uma câmera.
+
+        :param camera: Câmera a iniciar.
+        :return: True se iniciada; False se já em processamento ou se a criação falhar.
+        """
+        camera_id = camera.camera_id.value()
+        with self._lock:
+            if camera_id in self._cameras:
+                return False
+            device = self._pick_device()
+
+        # Carregamento do modelo (segundos) fora do lock
+        model = None
+        try:
+            model = self.model_pool.acquire(device)
+            processor = self.processor_factory(camera, model)
+        except Exception as e:
+            self.logger.error(f"Erro ao iniciar câmera {camera.camera_name.value()}: {e}")
+            if model is not None:
+                self.model_pool.release(device, model)
+            return False
+
+        thread = threading.Thread(
+            target=processor.start,
+            name=f"Camera-{camera_id}-{camera.camera_name.value()}",
+            daemon=True
+        )
+        thread.start()
+        with self._lock:
+            self._cameras[camera_id] = (camera, processor, thread, device)
+            self._started += 1
+
+        self.logger.info(f"Câmera {camera.camera_name.value()} (ID: {camera_id}) iniciada no dispositivo {device}")
+        return True
+
+    def stop_camera(self, camera_id: int) -> None:
+        """
+        Para o processador de uma câmera e devolve seu modelo ao pool.
+
+        :param camera_id: ID da câmera.
+        """
+        with self._lock:
+            entry = self._cameras.pop(camera_id, None)
+        if entry is None:
+            return
+
+        camera, processor, thread, device = entry
+        processor.stop()
+        thread.join(timeout=self.stop_timeout)
+        with self._lock:
+            self._stopped += 1
+
+        if thread.is_alive():
+            # O modelo ainda pode estar em uso pela thread: não é devolvido ao pool
+            self.logger.warning(
+                f"Câmera {camera.camera_name.value()} não finalizou em {self.stop_timeout:.0f}s; "
+                f"modelo não será reutilizado"
+            )
+            return
+        self.model_pool.release(device, processor.model)
+        self.logger.info(f"Câmera {camera.camera_name.value()} (ID: {camera_id}) parada")
+
+    def reconcile(self) -> Tuple[int, int, int]:
+        """
+        Aplica a diferença entre as câmeras ativas e as câmeras em processamento.
+
+        :return: Tupla (iniciadas, paradas, reiniciadas).
+        """
+        try:
+            desired = {c.camera_id.value(): c for c in self.load_cameras_use_case.execute(strict=True)}
+        except Exception as e:
+            with self._lock:
+                self._failed_reconciliations += 1
+                self._last_failed = True
+            self.logger.warning(f"Reconciliação de câmeras ignorada (falha ao listar câmeras): {e}")
+            return 0, 0, 0
+        self._last_failed = False
+
+        with self._lock:
+            running = {camera_id: entry[0] for camera_id, entry in self._cameras.items()}
+
+        removed = [camera_id for camera_id in running if camera_id not in desired]
+        added = [camera for camera_id, camera in desired.items() if camera_id not in running]
+        changed = [
+            camera for camera_id, camera in desired.items()
+            if camera_id in running and camera.to_dict() != running[camera_id].to_dict()
+        ]
+
+        # Paradas primeiro: os modelos liberados são reaproveitados pelas câmeras novas
+        for camera_id in removed:
+            self.stop_camera(camera_id)
+        for camera in changed:
+            self.stop_camera(camera.camera_id.value())
+        started = sum(1 for camera in added if self.start_camera(camera))
+        restarted = sum(1 for camera in changed if self.start_camera(camera))
+
+        with self._lock:
+            self._reconciliations += 1
+            self._restarted += restarted
+
+        if removed or added or changed:
+            self.logger.info(
+                f"Reconciliação de câmeras: {len(added)} nova(s), {len(removed)} removida(s), "
+                f"{len(changed)} alterada(s) - {len(self._cameras)} em processamento"
+            )
+        return started, len(removed), restarted
+
+    def start(self, cameras: List[Camera], reconcile_now: bool = False) -> int:
+        """
+        Inicia as câmeras informadas e a thread de reconciliação.
+
+        :param cameras: Câmeras iniciais.
+        :param reconcile_now: Se True, a primeira reconciliação ocorre imediatamente (usado
+                              quando as câmeras iniciais vêm do cache local e precisam ser
+                              confirmadas no FindFace).
+        :return: Número de câmeras iniciadas.
+        """
+        started = sum(1 for camera in cameras if self.start_camera(camera))
+
+        if self.interval > 0 and self._thread is None:
+            self._reconcile_now = reconcile_now
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._worker, name="CameraReconciler", daemon=True)
+            self._thread.start()
+            self.logger.info(f"Reconciliação de câmeras a cada {self.interval:.0f}s")
+        return started
+
+    def _worker(self) -> None:
+        """Executa a reconciliação periodicamente até stop()."""
+        wait = 0.0 if self._reconcile_now else self.interval
+        while not self._stop_event.wait(wait):
+            try:
+                self.reconcile()
+            except Exception as e:
+                self.logger.error(f"Erro na reconciliação de câmeras: {e}", exc_info=True)
+            # Enquanto a fonte estiver indisponível, tenta novamente em intervalos curtos
+            wait = min(self.retry_interval, self.interval) if self._last_failed else self.interval
+
+    def stop(self) -> None:
+        """Para a reconciliação e todas as câmeras (em paralelo) aguardando sua finalização."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.stop_timeout)
+            self._thread = None
+
+        with self._lock:
+            entries = list(self._cameras.items())
+            self._cameras.clear()
+
+        for _, (_, processor, _, _) in entries:
+            processor.stop()
+        for i, (_, (camera, _, thread, _)) in enumerate(entries, 1):
+            thread.join(timeout=self.stop_timeout)
+            if thread.is_alive():
+                self.logger.warning(
+                    f"Thread {i}/{len(entries)} ({camera.camera_name.value()}) não finalizou no tempo esperado."
+                )
+            else:
+                self.logger.info(f"Thread {i}/{len(entries)} ({camera.camera_name.value()}) finalizada com sucesso.")
+
+    def is_running(self) -> bool:
+        """Indica se a reconciliação está ativa ou se alguma câmera ainda está em processamento."""
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        with self._lock:
+            return any(thread.is_alive() for _, _, thread, _ in self._cameras.values())
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas da reconciliação.
+
+        :return: Dicionário com câmeras em processamento, reconciliações (e falhas),
+                 câmeras iniciadas, paradas e reiniciadas, estatísticas do pool de modelos
+                 e o estado do stream de cada câmera em 'streams'.
+        """
+        with self._lock:
+            return {
+                'cameras': len(self._cameras),
+                'reconciliations': self._reconciliations,
+                'failed_reconciliations': self._failed_reconciliations,
+                'started': self._started,
+                'stopped': self._stopped,
+                'restarted': self._restarted,
+                'model_pool': self.model_pool.get_stats(),
+                'streams': {
+                    camera_id: processor.get_stream_stats()
+                    for camera_id, (_, processor, _, _) in self._cameras.items()
+                },
+            }
@@ -0,0 +1,182 @@
+"""
+Supervisão de processos de trabalho (um grupo de câmeras por processo).
+Application Layer - orquestra o ciclo de vida dos processos.
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+
+class _WorkerState:
+    """Estado de um processo de trabalho supervisionado."""
+
+    __slots__ = ('index', 'process', 'started_at', 'restart_at', 'backoff', 'restarts', 'last_exitcode')
+
+    def __init__(self, index: int, backoff: float):
+        self.index = index
+        self.process: Optional[multiprocessing.process.BaseProcess] = None
+        self.started_at = 0.0
+        self.restart_at = 0.0
+        self.backoff = backoff
+        self.restarts = 0
+        self.last_exitcode: Optional[int] = None
+
+
+class WorkerProcessSupervisor:
+    """
+    Executa ``target(index, count, log_queue, stop_event)`` em ``count`` processos
+    (contexto "spawn": sem herdar CUDA/threads do processo pai) e os mantém em execução.
+
+    - cada processo recebe seu índice e processa apenas o seu grupo de câmeras, com
+      seu próprio interpretador (sem disputa de GIL entre os grupos);
+    - os logs dos processos chegam pela ``log_queue`` (multiprocessing) e são gravados
+      pelo processo supervisor (um único arquivo/console);
+    - um processo que termina sem parada solicitada é reiniciado com backoff exponencial
+      (de ``backoff`` até ``max_backoff``), zerado após ``stable_after`` segundos em execução;
+    - ``stop()`` sinaliza ``stop_event`` (encerramento gracioso) e força o término dos
+      processos que não finalizarem em ``stop_timeout`` segundos.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[int, int, Any, Any], None],
+        count: int,
+        name: str = "CameraWorker",
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        stable_after: float = 60.0,
+        stop_timeout: float = 30.0
+    ):
+        """
+        :param target: Função executada em cada processo (deve ser importável no processo filho).
+        :param count: Número de processos.
+        :param name: Prefixo do nome dos processos.
+        :param backoff: Espera inicial (s) antes de reiniciar um processo que terminou.
+        :param max_backoff: Espera máxima (s) entre reinícios.
+        :param stable_after: Tempo (s) em execução após o qual o backoff é zerado.
+        :param stop_timeout: Espera máxima (s) pelo encerramento gracioso de cada processo.
+        :raises ValueError: Se count for menor que 1.
+        """
+        if count < 1:
+            raise ValueError("count deve ser maior ou igual a 1")
+
+        self.target = target
+        self.count = count
+        self.name = name
+        self.backoff = max(0.1, backoff)
+        self.max_backoff = max(self.backoff, max_backoff)
+        self.stable_after = stable_after
+        self.stop_timeout = stop_timeout
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._context = multiprocessing.get_context("spawn")
+        self.log_queue = self._context.Queue()
+        self._stop_event = self._context.Event()
+        self._workers: List[_WorkerState] = [_WorkerState(i, self.backoff) for i in range(count)]
+        self._lock = threading.Lock()
+        self._monitor_stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def start(self) -> None:
+        """Inicia os processos e a thread de monitoramento."""
+        with self._lock:
+            for worker in self._workers:
+                self._spawn(worker)
+        self._monitor_stop.clear()
+        self._monitor = threading.Thread(target=self._monitor_worker, name="ProcessSupervisor", daemon=True)
+        self._monitor.start()
+        self.logger.info(f"{self.count} processo(s) de trabalho iniciado(s)")
+
+    def _spawn(self, worker: _WorkerState) -> None:
+        """Cria e inicia o processo de um grupo."""
+        worker.process = self._context.Process(
+            target=self.target,
+            args=(worker.index, self.count, self.log_queue, self._stop_event),
+            name=f"{self.name}-{worker.index}"
+        )
+        worker.process.start()
+        worker.started_at = time.monotonic()
+        worker.restart_at = 0.0
+        self.logger.info(f"Processo {worker.process.name} iniciado (PID {worker.process.pid})")
+
+    def _monitor_worker(self) -> None:
+        """Detecta processos finalizados e os reinicia respeitando o backoff."""
+        while not self._monitor_stop.wait(1.0):
+            now = time.monotonic()
+            with self._lock:
+                if self._stopping:
+                    return
+                for worker in self._workers:
+                    if worker.process is None or worker.process.is_alive():
+                        continue
+                    if not worker.restart_at:
+                        # Processo terminou: agenda o reinício
+                        worker.process.join(timeout=0)
+                        worker.last_exitcode = worker.process.exitcode
+                        if now - worker.started_at >= self.stable_after:
+                            worker.backoff = self.backoff
+                        worker.restart_at = now + worker.backoff
+                        self.logger.error(
+                            f"Processo {worker.process.name} terminou (código {worker.last_exitcode}); "
+                            f"reiniciando em {worker.backoff:.1f}s"
+                        )
+                        worker.backoff = min(worker.backoff * 2, self.max_backoff)
+                    elif now >= worker.restart_at:
+                        worker.restarts += 1
+                        self._spawn(worker)
+
+    def stop(self) -> None:
+        """Solicita o encerramento gracioso dos processos e aguarda (forçando após o timeout)."""
+        with self._lock:
+            self._stopping = True
+        self._monitor_stop.set()
+        if self._monitor is not None:
+            self._monitor.join(timeout=5.0)
+            self._monitor = None
+
+        self._stop_event.set()
+        deadline = time.monotonic() + self.stop_timeout
+        for worker in self._workers:
+            process = worker.process
+            if process is None:
+                continue
+            process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                self.logger.warning(f"Processo {process.name} não finalizou no tempo esperado; forçando término")
+                process.terminate()
+                process.join(timeout=5.0)
+            else:
+                self.logger.info(f"Processo {process.name} finalizado (código {process.exitcode})")
+
+    def is_running(self) -> bool:
+        """Indica se a supervisão está ativa ou se algum processo ainda está em execução."""
+        if self._monitor is not None and self._monitor.is_alive():
+            return True
+        return any(w.process is not None and w.process.is_alive() for w in self._workers)
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas dos processos.
+
+        :return: Dicionário com processos em execução, reinícios e, por processo,
+                 PID, estado, reinícios e último código de saída.
+        """
+        with self._lock:
+            workers = {
+                worker.index: {
+                    'pid': worker.process.pid if worker.process is not None else None,
+                    'alive': worker.process is not None and worker.process.is_alive(),
+                    'restarts': worker.restarts,
+                    'last_exitcode': worker.last_exitcode,
+                }
+                for worker in self._workers
+            }
+        return {
+            'alive': sum(1 for worker in workers.values() if worker['alive']),
+            'restarts': sum(worker['restarts'] for worker in workers.values()),
+            'workers': workers,
+        }
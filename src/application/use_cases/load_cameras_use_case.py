@@ -3,44 +3,96 @@ Caso de uso para carregar câmeras ativas do sistema.
 Application Layer - orquestra a lógica de negócio.
 """
 
-from typing import List
+from typing import List, Optional, Tuple
 import logging
 from src.domain.entities import Camera
 from src.domain.repositories import CameraRepository
+from src.domain.services.camera_sharding import CameraSharding
 from src.infrastructure.config import AppSettings
 
 
 class LoadCamerasUseCase:
     """
     Caso de uso para carregar câmeras ativas.
-    Combina câmeras do repositório (FindFace) com câmeras extras do config.
+    Combina câmeras do repositório (FindFace) com câmeras extras do config e mantém
+    apenas as deste nó (``node_id``/``node_count``) e deste processo (``camera_group``).
     """
 
-    def __init__(self, camera_repository: CameraRepository, settings: AppSettings):
+    def __init__(
+        self,
+        camera_repository: CameraRepository,
+        settings: AppSettings,
+        camera_group: Optional[Tuple[int, int]] = None
+    ):
         """
         Inicializa o caso de uso.
 
         :param camera_repository: Implementação do repositório de câmeras.
         :param settings: Configurações da aplicação.
+        :param camera_group: Tupla (índice, total de grupos): retorna apenas as câmeras cujo
+                             ID pertence ao grupo (ID % total == índice). None = todas.
+        :raises ValueError: Se o índice do grupo ou a configuração de nós forem inválidos.
         """
+        if camera_group is not None and not 0 <= camera_group[0] < camera_group[1]:
+            raise ValueError(f"camera_group inválido: {camera_group}")
         self.camera_repository = camera_repository
         self.settings = settings
+        self.camera_group = camera_group
+        self.sharding: Optional[CameraSharding] = None
+        if settings.processing.node_count > 1:
+            self.sharding = CameraSharding(settings.processing.node_count, settings.processing.node_id)
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    def execute(self) -> List[Camera]:
+    def execute(self, strict: bool = False, cached: bool = False) -> List[Camera]:
         """
         Executa o caso de uso para carregar câmeras ativas.
         
+        :param strict: Se True, falhas ao consultar o FindFace são propagadas (usado na
+                       reconciliação, para não confundir indisponibilidade com remoção).
+        :param cached: Se True, usa apenas o cache local de câmeras do FindFace, sem
+                       consultar a API (inicialização rápida; ver CameraRepositoryCached).
+        :return: Lista das câmeras ativas (FindFace + Config) deste nó e deste processo.
+        """
+        cameras = self.load_all(strict=strict, cached=cached)
+
+        # Mantém apenas as câmeras deste nó (distribuição entre hosts)
+        if self.sharding is not None:
+            cameras = [camera for camera in cameras if self.sharding.owns(camera.camera_id.value())]
+            self.logger.info(
+                f"Nó {self.sharding.node_id + 1}/{self.sharding.node_count}: {len(cameras)} câmera(s)"
+            )
+
+        # Mantém apenas as câmeras do grupo deste processo (modo multiprocesso)
+        if self.camera_group is not None:
+            index, count = self.camera_group
+            cameras = [camera for camera in cameras if camera.camera_id.value() % count == index]
+            self.logger.info(f"Grupo {index + 1}/{count}: {len(cameras)} câmera(s)")
+
+        self.logger.info(f"Total de {len(cameras)} câmera(s) ativas carregadas")
+        return cameras
+
+    def load_all(self, strict: bool = False, cached: bool = False) -> List[Camera]:
+        """
+        Carrega todas as câmeras ativas, sem os filtros de nó e de grupo.
+
+        :param strict: Ver execute().
+        :param cached: Ver execute().
         :return: Lista de todas as câmeras ativas (FindFace + Config).
         """
         cameras = []
 
-        # 1. Obtém câmeras ativas do FindFace
+        # 1. Obtém câmeras ativas do FindFace (ou do cache local)
         try:
-            findface_cameras = self.camera_repository.get_active_cameras()
+            if cached:
+                findface_cameras = self.camera_repository.get_cached_cameras()
+            else:
+                findface_cameras = self.camera_repository.get_active_cameras(strict=strict)
             cameras.extend(findface_cameras)
-            self.logger.info(f"Carregadas {len(findface_cameras)} câmeras do FindFace")
+            origem = "do cache" if cached else "do FindFace"
+            self.logger.info(f"Carregadas {len(findface_cameras)} câmeras {origem}")
         except Exception as e:
+            if strict:
+                raise
             self.logger.error(f"Erro ao carregar câmeras do FindFace: {e}", exc_info=True)
 
         # 2. Adiciona câmeras extras do arquivo de configuração
@@ -57,5 +109,22 @@ class LoadCamerasUseCase:
             cameras.append(camera)
             self.logger.info(f"Câmera do config adicionada: {cam_config.name}")
 
-        self.logger.info(f"Total de {len(cameras)} câmera(s) ativas carregadas")
         return cameras
+
+    def owns(self, camera_id: int) -> bool:
+        """
+        Indica se a câmera é processada por este nó e por este processo.
+
+        :param camera_id: ID da câmera.
+        :return: True se a câmera passa pelos filtros de nó e de grupo.
+        """
+        if self.sharding is not None and not self.sharding.owns(camera_id):
+            return False
+        if self.camera_group is not None:
+            index, count = self.camera_group
+            return camera_id % count == index
+        return True
+
+    def is_partitioned(self) -> bool:
+        """Indica se apenas parte das câmeras é processada (vários nós ou processos)."""
+        return self.sharding is not None or self.camera_group is not None
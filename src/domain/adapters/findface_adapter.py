@@ -4,14 +4,18 @@ Implementa o padrão Adapter do DDD para isolar o domínio da infraestrutura ext
 """
 
 # built-in
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 import logging
 import json
 import re
 
+# 3rd party
+import cv2
+import numpy as np
+
 # local
 from src.infrastructure.clients import FindfaceMulti
-from src.domain.entities import Camera, Event
+from src.domain.entities import Camera, Event, EventPayload
 from src.domain.value_objects import CameraTokenVO, IdVO, NameVO, CameraSourceVO
 
 
@@ -22,19 +26,52 @@ class FindfaceAdapter:
     de mudanças na infraestrutura externa.
     """
 
-    def __init__(self, findface: FindfaceMulti, camera_prefix: str = 'EXTERNO'):
+    # Modos de envio suportados
+    UPLOAD_MODES = ("fullframe", "crop")
+    # Expansão fixa do ROI da face informado ao FindFace (20% em cada direção)
+    ROI_EXPANSION = 0.20
+    # Qualidade mínima JPEG antes de reduzir a resolução para caber no orçamento
+    MIN_JPEG_QUALITY = 50
+
+    def __init__(
+        self,
+        findface: FindfaceMulti,
+        camera_prefix: str = 'EXTERNO',
+        upload_mode: str = "fullframe",
+        crop_context: float = 0.20,
+        jpeg_quality: int = 95,
+        max_upload_bytes: int = 0
+    ):
         """
         Inicializa o adapter do FindFace.
 
         :param findface: Instância do cliente FindfaceMulti.
         :param camera_prefix: Prefixo para filtrar câmeras virtuais.
+        :param upload_mode: "fullframe" envia o frame inteiro; "crop" envia apenas a região da face.
+        :param crop_context: Expansão da região recortada em torno da face (fração do bbox, modo "crop").
+        :param jpeg_quality: Qualidade JPEG inicial (0-100).
+        :param max_upload_bytes: Orçamento máximo da imagem enviada em bytes (0 = sem limite).
         :raises TypeError: Se findface não for FindfaceMulti.
+        :raises ValueError: Se upload_mode, crop_context ou jpeg_quality forem inválidos.
         """
         if not isinstance(findface, FindfaceMulti):
             raise TypeError("O parâmetro 'findface' deve ser uma instância de FindfaceMulti.")
         
+        if upload_mode not in self.UPLOAD_MODES:
+            raise ValueError(f"upload_mode deve ser um de {self.UPLOAD_MODES}, recebido: {upload_mode}")
+        
+        if crop_context < 0:
+            raise ValueError(f"crop_context deve ser maior ou igual a 0, recebido: {crop_context}")
+        
+        if not 0 <= jpeg_quality <= 100:
+            raise ValueError(f"jpeg_quality deve estar entre 0 e 100, recebido: {jpeg_quality}")
+        
         self.findface = findface
         self.camera_prefix = camera_prefix
+        self.upload_mode = upload_mode
+        self.crop_context = crop_context
+        self.jpeg_quality = jpeg_quality
+        self.max_upload_bytes = max_upload_bytes
         self.logger = logging.getLogger(self.__class__.__name__)
 
     def get_cameras(self, active: bool = None) -> List[Camera]:
@@ -42,50 +79,34 @@ class FindfaceAdapter:
         Obtém a lista de câmeras virtuais disponíveis no FindFace.
         Retorna entidades Camera do domínio.
 
+        Usa a descoberta paginada, concorrente e em cache do cliente
+        (``FindfaceMulti.discover_cameras``).
+
         :param active: Filtra câmeras ativas (True) ou inativas (False). None retorna todas.
         :return: Lista de entidades Camera.
         """
         cameras = []
 
         try:
-            # Obtém grupos de câmeras
-            grupos = self.findface.get_camera_groups()["results"]
-            grupos_filtrados = [
-                g for g in grupos 
-                if g["name"].lower().startswith(self.camera_prefix.lower())
+            # Obtém câmeras de todos os grupos com o prefixo (todas as páginas)
+            cameras_response = self.findface.discover_cameras(self.camera_prefix, active=active)
+
+            # Filtra câmeras com RTSP no comment
+            cameras_filtradas = [
+                c for c in cameras_response 
+                if c["comment"].startswith("rtsp://")
             ]
 
-            # Para cada grupo, obtém câmeras
-            for grupo in grupos_filtrados:
-                # Prepara parâmetros da chamada
-                params = {
-                    'camera_groups': [grupo["id"]],
-                    'external_detector': True,
-                    'ordering': 'id'
-                }
-                
-                # Adiciona filtro 'active' se informado
-                if active is not None:
-                    params['active'] = active
-                
-                cameras_response = self.findface.get_cameras(**params)["results"]
-                
-                # Filtra câmeras com RTSP no comment
-                cameras_filtradas = [
-                    c for c in cameras_response 
-                    if c["comment"].startswith("rtsp://")
-                ]
-                
-                # Converte para entidades Camera
-                for camera_data in cameras_filtradas:
-                    camera = Camera(
-                        camera_id=IdVO(camera_data["id"]),
-                        camera_name=NameVO(camera_data["name"]),
-                        camera_token=CameraTokenVO(camera_data["external_detector_token"]),
-                        source=CameraSourceVO(camera_data["comment"].strip()),
-                        active=camera_data["active"]
-                    )
-                    cameras.append(camera)
+            # Converte para entidades Camera
+            for camera_data in cameras_filtradas:
+                camera = Camera(
+                    camera_id=IdVO(camera_data["id"]),
+                    camera_name=NameVO(camera_data["name"]),
+                    camera_token=CameraTokenVO(camera_data["external_detector_token"]),
+                    source=CameraSourceVO(camera_data["comment"].strip()),
+                    active=camera_data["active"]
+                )
+                cameras.append(camera)
 
             self.logger.info(f"Obtidas {len(cameras)} câmeras do FindFace")
             return cameras
@@ -94,12 +115,130 @@ class FindfaceAdapter:
             self.logger.error(f"Erro ao obter câmeras do FindFace: {e}", exc_info=True)
             return []
 
-    def send_event(self, event: Event) -> Optional[Dict]:
+    def build_face_event_request(self, event: Event, payload: Optional[EventPayload] = None) -> Dict[str, Any]:
+        """
+        Converte a entidade Event nos argumentos de ``FindfaceMulti.add_face_event``.
+        Inclui a codificação JPEG do frame (operação mais custosa do envio).
+
+        :param event: Entidade Event do domínio.
+        :param payload: Payload do evento com codificações memoizadas (opcional).
+                        Reaproveita a codificação de uma requisição anterior do mesmo evento
+                        (nova tentativa, outbox) ou do salvamento em disco da mesma variante.
+        :return: Dicionário com token, fullframe, camera, roi, mf_selector e timestamp.
+        :raises TypeError: Se event não for Event.
+        """
+        if not isinstance(event, Event):
+            raise TypeError(f"event deve ser Event, recebido: {type(event).__name__}")
+
+        if payload is None:
+            payload = EventPayload(event)
+
+        frame_height, frame_width = event.frame.height, event.frame.width
+        x1, y1, x2, y2 = event.bbox.value()
+        
+        # ROI da face expandido em 20% (coordenadas do frame) [left, top, right, bottom]
+        roi = self._expand_box(x1, y1, x2, y2, self.ROI_EXPANSION, frame_width, frame_height)
+        
+        if self.upload_mode == "crop":
+            # OTIMIZAÇÃO: Envia apenas a região da face com contexto configurável.
+            # Codificação, banda e ingestão no FindFace escalam com os bytes enviados.
+            left, top, right, bottom = self._expand_box(
+                x1, y1, x2, y2, max(self.crop_context, self.ROI_EXPANSION), frame_width, frame_height
+            )
+            region = (left, top, right, bottom)
+            image = event.frame.ndarray_readonly[top:bottom, left:right]
+            # Traduz o ROI para coordenadas do recorte
+            roi = [roi[0] - left, roi[1] - top, roi[2] - left, roi[3] - top]
+            imagem_bytes = payload.crop_jpeg(region, self.jpeg_quality)
+        else:
+            image = event.frame.ndarray_readonly
+            imagem_bytes = payload.raw_jpeg(self.jpeg_quality)
+        
+        if self.max_upload_bytes > 0 and len(imagem_bytes) > self.max_upload_bytes:
+            imagem_bytes, roi = self._encode_within_budget(image, roi)
+        
+        # Converte timestamp para formato ISO 8601 com timezone local
+        timestamp_iso = event.frame.timestamp.value().astimezone().isoformat()
+
+        return {
+            "token": event.camera_token.value(),
+            "fullframe": imagem_bytes,
+            "camera": event.camera_id.value(),
+            "roi": roi,
+            "mf_selector": "all",
+            "timestamp": timestamp_iso
+        }
+
+    @staticmethod
+    def _expand_box(
+        x1: float, y1: float, x2: float, y2: float,
+        expansion: float, frame_width: int, frame_height: int
+    ) -> List[int]:
+        """
+        Expande um bbox em uma fração de suas dimensões, limitado aos limites do frame.
+
+        :return: Bbox expandido [left, top, right, bottom] em inteiros.
+        """
+        expand_w = (x2 - x1) * expansion
+        expand_h = (y2 - y1) * expansion
+        return [
+            int(max(0, x1 - expand_w)),
+            int(max(0, y1 - expand_h)),
+            int(min(frame_width, x2 + expand_w)),
+            int(min(frame_height, y2 + expand_h))
+        ]
+
+    def _encode_within_budget(self, image: np.ndarray, roi: List[int]) -> Tuple[bytes, List[int]]:
+        """
+        Recodifica a imagem em JPEG respeitando o orçamento de bytes configurado.
+        Chamado quando a codificação na qualidade configurada excede o orçamento:
+        reduz primeiro a qualidade (até MIN_JPEG_QUALITY) e depois a resolução,
+        reescalando o ROI na mesma proporção.
+
+        :param image: Imagem BGR a ser codificada.
+        :param roi: ROI [left, top, right, bottom] em coordenadas da imagem.
+        :return: Tupla (bytes JPEG, ROI em coordenadas da imagem codificada).
+        :raises RuntimeError: Se a codificação falhar.
+        """
+        quality = max(min(self.jpeg_quality, self.MIN_JPEG_QUALITY), self.jpeg_quality - 10)
+        scale = 1.0
+        encoded = image
+        
+        while True:
+            success, buffer = cv2.imencode('.jpg', encoded, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if not success:
+                raise RuntimeError("Falha ao codificar o frame em JPEG")
+            
+            if self.max_upload_bytes <= 0 or buffer.size <= self.max_upload_bytes:
+                break
+            
+            if quality > self.MIN_JPEG_QUALITY:
+                quality = max(self.MIN_JPEG_QUALITY, quality - 10)
+                continue
+            
+            # Qualidade mínima atingida: reduz resolução em 25%
+            next_scale = scale * 0.75
+            new_w = int(image.shape[1] * next_scale)
+            new_h = int(image.shape[0] * next_scale)
+            if new_w < 32 or new_h < 32:
+                # Não reduz além de um tamanho útil; envia a menor versão obtida
+                # (scale continua sendo o da imagem codificada em buffer)
+                break
+            scale = next_scale
+            encoded = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
+        
+        if scale != 1.0:
+            roi = [int(v * scale) for v in roi]
+        
+        return buffer.tobytes(), roi
+
+    def send_event(self, event: Event, payload: Optional[EventPayload] = None) -> Optional[Dict]:
         """
         Envia um evento de face para o FindFace.
         Converte a entidade Event do domínio para o formato esperado pela API.
 
         :param event: Entidade Event do domínio.
+        :param payload: Payload do evento com codificações memoizadas (opcional).
         :return: Resposta do FindFace ou None em caso de erro.
         :raises TypeError: Se event não for Event.
         """
@@ -107,85 +246,85 @@ class FindfaceAdapter:
             raise TypeError(f"event deve ser Event, recebido: {type(event).__name__}")
 
         try:
-            # Converte frame para JPEG
-            imagem_bytes = event.frame.jpg(quality=95)
-            
-            # Expande bbox em 20% na diagonal
-            x1, y1, x2, y2 = event.bbox.value()
-            width = x2 - x1
-            height = y2 - y1
-            
-            # Calcula expansão de 20% em cada direção
-            expand_w = width * 0.20
-            expand_h = height * 0.20
-            
-            # Aplica expansão mantendo dentro dos limites do frame
-            # OTIMIZAÇÃO: Usa propriedades do FullFrameVO - evita acesso desnecessário
-            frame_height, frame_width = event.frame.height, event.frame.width
-            x1_expanded = max(0, x1 - expand_w)
-            y1_expanded = max(0, y1 - expand_h)
-            x2_expanded = min(frame_width, x2 + expand_w)
-            y2_expanded = min(frame_height, y2 + expand_h)
-            
-            # Converte bbox expandido para formato ROI [left, top, right, bottom]
-            roi = [int(x1_expanded), int(y1_expanded), int(x2_expanded), int(y2_expanded)]
-            
-            # Converte timestamp para formato ISO 8601 com timezone local
-            timestamp_iso = event.frame.timestamp.value().astimezone().isoformat()
+            request = self.build_face_event_request(event, payload)
             
             # Envia para FindFace
-            resposta = self.findface.add_face_event(
-                token=event.camera_token.value(),
-                fullframe=imagem_bytes,
-                camera=event.camera_id.value(),
-                roi=roi,
-                mf_selector="all",
-                timestamp=timestamp_iso
-            )
+            resposta = self.findface.add_face_event(**request)
             
             self.logger.debug(
                 f"Evento enviado para FindFace - Camera: {event.camera_id.value()}, "
                 f"Quality: {event.face_quality_score.value():.4f}, "
-                f"Timestamp: {timestamp_iso}"
+                f"Timestamp: {request['timestamp']}"
             )
             
             return resposta
 
         except Exception as e:
-            # Extrai a linha 'desc: ...' do texto da exceção usando regex.
-            # Exemplo alvo no texto:
-            # "\ndesc: Zero objects(type=\"face\") detected on the provided image, param: fullframe\n"
+            self.log_send_error(event, e)
+            return None
+
+    @staticmethod
+    def is_retryable_error(error: Exception) -> bool:
+        """
+        Indica se uma falha de envio é transitória (vale reenviar o evento).
+
+        Respostas 4xx do FindFace (ex.: nenhuma face detectada na imagem) são definitivas,
+        exceto 401 (token expirado), 408 (timeout) e 429 (limite de requisições).
+        Falhas de rede e respostas 5xx são transitórias.
+
+        :param error: Exceção levantada no envio.
+        :return: True se o envio pode ser repetido.
+        """
+        if not isinstance(error, ConnectionError):
+            return False
+        m = re.search(r"Erro ao criar evento de face: (?P<status>\d{3}) - ", str(error))
+        if m is None:
+            # Falha de comunicação (sem resposta HTTP)
+            return True
+        status = int(m.group('status'))
+        return status >= 500 or status in (401, 408, 429)
+
+    def log_send_error(self, event: Event, error: Exception) -> None:
+        """
+        Registra no log uma falha de envio de evento, extraindo o campo 'desc'
+        da resposta do FindFace quando disponível.
+
+        :param event: Evento cujo envio falhou.
+        :param error: Exceção levantada no envio.
+        """
+        # Extrai a linha 'desc: ...' do texto da exceção usando regex.
+        # Exemplo alvo no texto:
+        # "\ndesc: Zero objects(type=\"face\") detected on the provided image, param: fullframe\n"
+        desc = None
+        try:
+            # Obtém texto de resposta se disponível (requests.Response)
+            text = ""
+            resp = getattr(error, "response", None)
+            if resp is not None:
+                try:
+                    text = getattr(resp, 'text', '') or ''
+                except Exception:
+                    text = ''
+
+            # Se não houver .response text, usa representação da exceção
+            if not text:
+                text = str(error)
+
+            # Regex procura 'desc:' até ', param:' ou fim/newline
+            m = re.search(r"desc:\s*(?P<desc>.+?)(?:,\s*param:|\\n|$)", text, flags=re.IGNORECASE)
+            if m:
+                desc = m.group('desc').strip()
+        except Exception:
             desc = None
-            try:
-                # Obtém texto de resposta se disponível (requests.Response)
-                text = ""
-                resp = getattr(e, "response", None)
-                if resp is not None:
-                    try:
-                        text = getattr(resp, 'text', '') or ''
-                    except Exception:
-                        text = ''
-
-                # Se não houver .response text, usa representação da exceção
-                if not text:
-                    text = str(e)
-
-                # Regex procura 'desc:' até ', param:' ou fim/newline
-                m = re.search(r"desc:\s*(?P<desc>.+?)(?:,\s*param:|\\n|$)", text, flags=re.IGNORECASE)
-                if m:
-                    desc = m.group('desc').strip()
-            except Exception:
-                desc = None
-
-            if desc:
-                # Loga apenas o campo 'desc' conforme solicitado
-                self.logger.error(
-                    f"Erro ao enviar evento para FindFace - Camera: {event.camera_id.value()}: {desc}"
-                )
-            else:
-                # Fallback: log completo com stacktrace para investigação
-                self.logger.error(
-                    f"Erro ao enviar evento para FindFace - Camera: {event.camera_id.value()}: {e}",
-                    exc_info=True
-                )
-            return None
\ No newline at end of file
+
+        if desc:
+            # Loga apenas o campo 'desc' conforme solicitado
+            self.logger.error(
+                f"Erro ao enviar evento para FindFace - Camera: {event.camera_id.value()}: {desc}"
+            )
+        else:
+            # Fallback: log completo com stacktrace para investigação
+            self.logger.error(
+                f"Erro ao enviar evento para FindFace - Camera: {event.camera_id.value()}: {error}",
+                exc_info=error
+            )
@@ -6,10 +6,12 @@ from .camera_entity import Camera
 from .frame_entity import Frame
 from .event_entity import Event
 from .track_entity import Track
+from .event_payload_entity import EventPayload
 
 __all__ = [
     'Camera',
     'Frame',
     'Event',
     'Track',
+    'EventPayload',
 ]
@@ -0,0 +1,141 @@
+"""
+Entidade EventPayload: codificações JPEG de um evento, calculadas sob demanda e memoizadas.
+"""
+
+from concurrent.futures import Future
+from threading import Lock
+from typing import Callable, Dict, Hashable, Optional, Sequence, Tuple
+import numpy as np
+import cv2
+from src.domain.entities.event_entity import Event
+
+
+class EventPayload:
+    """
+    Agrupa as codificações JPEG de um evento (frame original, recortes, miniaturas e
+    versões anotadas) usadas pelo salvamento em disco e pelo envio ao FindFace.
+
+    Cada codificação é identificada pela variante (região, anotações, tamanho máximo e
+    qualidade), calculada uma única vez na primeira solicitação - na thread de quem a
+    solicita (worker de salvamento ou de envio), nunca na de captura - e memoizada;
+    solicitações concorrentes aguardam o mesmo resultado. A mesma codificação serve ao
+    disco, às tentativas de envio, ao outbox e ao grupo da deduplicação: quando o disco e
+    o FindFace pedem a mesma variante (ex.: frame inteiro sem anotação na mesma
+    qualidade), o frame é codificado uma única vez.
+    """
+
+    def __init__(self, event: Event):
+        """
+        Inicializa o payload do evento.
+
+        :param event: Evento cujo frame será codificado.
+        :raises TypeError: Se event não for Event.
+        """
+        if not isinstance(event, Event):
+            raise TypeError(f"event deve ser Event, recebido: {type(event).__name__}")
+
+        self._event = event
+        self._encodings: Dict[Hashable, Future] = {}
+        self._lock = Lock()
+
+    @property
+    def event(self) -> Event:
+        """Retorna o evento do payload."""
+        return self._event
+
+    def raw_jpeg(self, quality: int = 95) -> bytes:
+        """
+        Retorna o frame original codificado em JPEG.
+
+        :param quality: Qualidade JPEG (0-100).
+        :return: Bytes JPEG.
+        """
+        return self.jpeg(quality=quality)
+
+    def crop_jpeg(self, region: Tuple[int, int, int, int], quality: int = 95) -> bytes:
+        """
+        Retorna uma região do frame original codificada em JPEG.
+
+        :param region: Região [left, top, right, bottom] em coordenadas do frame.
+        :param quality: Qualidade JPEG (0-100).
+        :return: Bytes JPEG.
+        """
+        return self.jpeg(region, quality)
+
+    def jpeg(
+        self,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        quality: int = 95,
+        annotations: Sequence = (),
+        max_size: int = 0
+    ) -> bytes:
+        """
+        Retorna uma variante do frame codificada em JPEG: recorte opcional, reduzida para
+        max_size e com as anotações desenhadas (sobre uma cópia; o frame não é alterado).
+
+        :param region: Região [left, top, right, bottom] em coordenadas do frame (None = frame inteiro).
+        :param quality: Qualidade JPEG (0-100).
+        :param annotations: ImageAnnotation a desenhar, em coordenadas da região.
+        :param max_size: Maior lado da imagem em pixels (0 = tamanho original).
+        :return: Bytes JPEG.
+        """
+        region = tuple(region) if region is not None else None
+        annotations = tuple(annotations)
+        return self._get(
+            ("jpeg", region, annotations, max_size, quality),
+            lambda: self._encode(self._render(region, annotations, max_size), quality)
+        )
+
+    def _render(self, region: Optional[Tuple[int, int, int, int]], annotations: tuple, max_size: int) -> np.ndarray:
+        """Recorta, reduz e anota o frame conforme a variante."""
+        image = self._event.frame.ndarray_readonly
+        if region is not None:
+            left, top, right, bottom = region
+            image = image[top:bottom, left:right]
+        if annotations or max_size:
+            # Importação tardia: o desenho das anotações pertence ao serviço de salvamento
+            from src.domain.services.image_save_service import ImageSaveService
+            image = ImageSaveService.render(image, annotations, max_size)
+        return image
+
+    @staticmethod
+    def _encode(image: np.ndarray, quality: int) -> bytes:
+        """
+        Codifica uma imagem BGR em JPEG.
+
+        :raises ValueError: Se a qualidade for inválida.
+        :raises RuntimeError: Se a codificação falhar.
+        """
+        if not 0 <= quality <= 100:
+            raise ValueError(f"Qualidade deve estar entre 0 e 100, recebido: {quality}")
+
+        success, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not success:
+            raise RuntimeError("Falha ao codificar o frame em JPEG")
+        return buffer.tobytes()
+
+    def _get(self, key: Hashable, compute: Callable[[], bytes]) -> bytes:
+        """Retorna a codificação memoizada, calculando-a na thread atual se ainda não existir."""
+        with self._lock:
+            future = self._encodings.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._encodings[key] = future
+
+        if owner:
+            self._run(future, compute)
+        return future.result()
+
+    @staticmethod
+    def _run(future: Future, compute: Callable[[], bytes]) -> None:
+        """Executa a codificação e publica o resultado (ou exceção) no future."""
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(compute())
+        except Exception as e:
+            future.set_exception(e)
+
+    def __repr__(self) -> str:
+        return f"EventPayload(event={self._event.id.value()}, encodings={len(self._encodings)})"
@@ -3,5 +3,6 @@ Repositórios do domínio (interfaces/contratos).
 """
 
 from .camera_repository import CameraRepository
+from .findface_outbox_repository import FindfaceOutboxRepository
 
-__all__ = ['CameraRepository']
+__all__ = ['CameraRepository', 'FindfaceOutboxRepository']
@@ -15,10 +15,23 @@ class CameraRepository(ABC):
     """
 
     @abstractmethod
-    def get_active_cameras(self) -> List[Camera]:
+    def get_active_cameras(self, strict: bool = False) -> List[Camera]:
         """
         Obtém todas as câmeras ativas do sistema.
         
+        :param strict: Se True, falhas ao consultar a fonte são propagadas em vez de
+                       resultarem em lista vazia (necessário para distinguir "nenhuma
+                       câmera" de "fonte indisponível").
         :return: Lista de entidades Camera ativas.
         """
         pass
+
+    def get_cached_cameras(self) -> List[Camera]:
+        """
+        Obtém a última lista de câmeras conhecida sem consultar a fonte (warm start).
+        
+        Repositórios sem cache local retornam lista vazia.
+        
+        :return: Lista de entidades Camera do cache.
+        """
+        return []
@@ -0,0 +1,61 @@
+"""
+Interface do outbox de eventos FindFace (Domain Layer).
+Define o contrato de armazenamento durável dos eventos não entregues.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+
+class FindfaceOutboxRepository(ABC):
+    """
+    Interface abstrata para o outbox durável de eventos FindFace.
+
+    Cada registro contém os metadados do track (camera_id, camera_name, track_id,
+    total_events, quality) e a requisição pronta para ``FindfaceMulti.add_face_event``.
+    A entrega é at-least-once: o registro só é removido após ``ack``.
+    """
+
+    @abstractmethod
+    def append(
+        self,
+        metadata: Dict[str, Any],
+        request: Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+    ) -> bool:
+        """
+        Agenda a gravação de um evento no outbox sem bloquear o chamador.
+
+        :param metadata: Metadados do evento.
+        :param request: Requisição pronta ou função que a constrói (executada fora do chamador).
+        :return: True se aceito, False se o outbox estiver saturado.
+        """
+        pass
+
+    @abstractmethod
+    def fetch(self, limit: int) -> List[Tuple[int, Dict[str, Any], Dict[str, Any]]]:
+        """
+        Retorna os eventos mais antigos ainda não confirmados.
+
+        :param limit: Máximo de registros retornados.
+        :return: Lista de (id, metadata, request).
+        """
+        pass
+
+    @abstractmethod
+    def ack(self, record_ids: List[int]) -> None:
+        """
+        Remove do outbox os eventos entregues (ou descartados definitivamente).
+
+        :param record_ids: IDs dos registros.
+        """
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        """Retorna o número de eventos pendentes no outbox."""
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Grava os eventos pendentes e fecha o armazenamento."""
+        pass
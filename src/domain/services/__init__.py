@@ -4,10 +4,36 @@ Serviços de domínio.
 
 from .face_quality_service import FaceQualityService
 from .bytetrack_detector_service import ByteTrackDetectorService
-from .image_save_service import ImageSaveService
+from .image_save_service import ImageSaveService, ImageAnnotation
+from .image_retention_service import ImageRetentionService
+from .image_archive import ImageArchive, ArchiveRecord
+from .landmarks_inference_service import LandmarksInferenceService
+from .detection_model_pool import DetectionModelPool
+from .camera_sharding import CameraSharding
+from .track_deduplicator import TrackDeduplicator
+from .track_metadata_log import TrackMetadataLog
+from .adaptive_concurrency_limiter import AdaptiveConcurrencyLimiter
+from .findface_priority_queue import FindfacePriorityQueue
+from .findface_fair_queue import FindfaceFairQueue
+from .findface_dispatcher import FindfaceDispatcher, FindfaceThreadDispatcher, FindfaceAsyncDispatcher
 
 __all__ = [
     'FaceQualityService',
     'ByteTrackDetectorService',
     'ImageSaveService',
+    'ImageAnnotation',
+    'ImageRetentionService',
+    'ImageArchive',
+    'ArchiveRecord',
+    'LandmarksInferenceService',
+    'DetectionModelPool',
+    'CameraSharding',
+    'TrackDeduplicator',
+    'TrackMetadataLog',
+    'AdaptiveConcurrencyLimiter',
+    'FindfacePriorityQueue',
+    'FindfaceFairQueue',
+    'FindfaceDispatcher',
+    'FindfaceThreadDispatcher',
+    'FindfaceAsyncDispatcher',
 ]
@@ -0,0 +1,175 @@
+"""
+Limitador adaptativo de concorrência (AIMD guiado por latência) para envios ao FindFace.
+"""
+
+import time
+from collections import deque
+from threading import Condition
+from typing import Deque, Optional
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Ajusta o número de requisições simultâneas conforme a resposta do servidor.
+
+    - Aumento aditivo: enquanto a latência se mantém próxima da linha de base e o limite
+      está sendo efetivamente usado, o limite cresce ~1 a cada ``limit`` sucessos.
+    - Redução multiplicativa: em sobrecarga (5xx, timeout, falha de conexão, 429) ou quando
+      a latência média sobe acima de ``latency_tolerance`` vezes a linha de base, o limite é
+      multiplicado por ``backoff`` (no máximo uma vez por janela de latência).
+
+    A linha de base é a menor latência observada, renovada periodicamente para
+    acompanhar mudanças reais na capacidade do servidor.
+    """
+
+    OUTCOME_SUCCESS = "success"
+    OUTCOME_OVERLOAD = "overload"
+    OUTCOME_ERROR = "error"
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.7,
+        smoothing: float = 0.1,
+        baseline_reset_samples: int = 500
+    ):
+        """
+        :param initial_limit: Limite inicial de requisições simultâneas.
+        :param min_limit: Limite mínimo.
+        :param max_limit: Limite máximo.
+        :param latency_tolerance: Razão latência média / linha de base que dispara a redução.
+        :param backoff: Fator multiplicativo aplicado na redução (0 < backoff < 1).
+        :param smoothing: Peso da amostra mais recente na média móvel exponencial da latência.
+        :param baseline_reset_samples: Amostras após as quais a linha de base é renovada.
+        :raises ValueError: Se os limites ou o fator de redução forem inválidos.
+        """
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError(f"Limites inválidos: min_limit={min_limit}, max_limit={max_limit}")
+        if not 0 < backoff < 1:
+            raise ValueError(f"backoff deve estar entre 0 e 1, recebido: {backoff}")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.baseline_reset_samples = baseline_reset_samples
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._avg_latency: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._next_baseline: Optional[float] = None
+        self._samples_since_reset = 0
+        self._last_decrease = 0.0
+        self._completions: Deque[float] = deque()
+        self._overloads = 0
+        self._condition = Condition()
+
+    @property
+    def limit(self) -> int:
+        """Limite atual de requisições simultâneas."""
+        return max(self.min_limit, int(self._limit))
+
+    def try_acquire(self) -> bool:
+        """
+        Reserva uma vaga sem bloquear.
+
+        :return: True se a vaga foi reservada.
+        """
+        with self._condition:
+            if self._in_flight >= self.limit:
+                return False
+            self._in_flight += 1
+            return True
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Reserva uma vaga, aguardando até ``timeout`` segundos.
+
+        :return: True se a vaga foi reservada.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._in_flight < self.limit, timeout=timeout):
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self, latency: Optional[float] = None, outcome: str = OUTCOME_SUCCESS) -> None:
+        """
+        Libera uma vaga e ajusta o limite com a amostra da requisição.
+
+        :param latency: Duração da requisição em segundos (None = vaga não utilizada).
+        :param outcome: OUTCOME_SUCCESS, OUTCOME_OVERLOAD ou OUTCOME_ERROR
+                        (resposta definitiva do servidor, ex.: 4xx; só registra a latência).
+        """
+        with self._condition:
+            in_flight = self._in_flight
+            self._in_flight = max(0, self._in_flight - 1)
+            if latency is not None:
+                self._on_sample(latency, outcome, in_flight)
+            self._condition.notify_all()
+
+    def _on_sample(self, latency: float, outcome: str, in_flight: int) -> None:
+        """Atualiza latências e o limite (chamado com o lock adquirido)."""
+        now = time.monotonic()
+
+        if outcome == self.OUTCOME_OVERLOAD:
+            self._overloads += 1
+            self._decrease(now)
+            return
+
+        self._completions.append(now)
+        while self._completions and now - self._completions[0] > 60.0:
+            self._completions.popleft()
+
+        self._avg_latency = latency if self._avg_latency is None else (
+            self.smoothing * latency + (1 - self.smoothing) * self._avg_latency
+        )
+
+        # Linha de base: menor latência, renovada a cada baseline_reset_samples amostras
+        self._samples_since_reset += 1
+        self._next_baseline = latency if self._next_baseline is None else min(self._next_baseline, latency)
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        if self._samples_since_reset >= self.baseline_reset_samples:
+            self._baseline = self._next_baseline
+            self._next_baseline = None
+            self._samples_since_reset = 0
+
+        if self._avg_latency > self._baseline * self.latency_tolerance:
+            self._decrease(now)
+        elif outcome == self.OUTCOME_SUCCESS and in_flight >= self.limit * 0.8:
+            # Só cresce quando o limite atual está sendo de fato utilizado
+            self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+
+    def _decrease(self, now: float) -> None:
+        """Reduz o limite no máximo uma vez por janela de latência."""
+        window = self._avg_latency if self._avg_latency is not None else 1.0
+        if now - self._last_decrease < window:
+            return
+        self._limit = max(float(self.min_limit), self._limit * self.backoff)
+        self._last_decrease = now
+
+    def get_stats(self) -> dict:
+        """
+        Retorna o estado do limitador.
+
+        :return: Dicionário com limite, requisições em voo, latências (ms),
+                 vazão (requisições/s no último minuto) e sobrecargas.
+        """
+        with self._condition:
+            now = time.monotonic()
+            recent = [t for t in self._completions if now - t <= 60.0]
+            span = (now - recent[0]) if len(recent) > 1 else 0.0
+            return {
+                'limit': self.limit,
+                'in_flight': self._in_flight,
+                'avg_latency_ms': (self._avg_latency or 0.0) * 1000,
+                'baseline_latency_ms': (self._baseline or 0.0) * 1000,
+                'throughput': (len(recent) / span) if span > 0 else 0.0,
+                'overloads': self._overloads,
+            }
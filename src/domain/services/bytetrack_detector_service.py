@@ -3,13 +3,13 @@ Serviço de detecção e rastreamento de faces usando ByteTrack no domínio.
 """
 
 # built-in
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 from collections import defaultdict
 from datetime import datetime
 import logging
+import threading
 import time
 from queue import Queue
-from threading import Thread
 
 # 3rd party
 import numpy as np
@@ -17,11 +17,15 @@ import cv2
 
 # local
 from src.domain.adapters.findface_adapter import FindfaceAdapter
-from src.domain.entities import Camera, Frame, Event, Track
+from src.domain.entities import Camera, Frame, Event, Track, EventPayload
 from src.domain.value_objects import IdVO, BboxVO, ConfidenceVO, LandmarksVO, TimestampVO, FullFrameVO
 from src.domain.services.model_interface import IDetectionModel
 from src.domain.services.landmarks_model_interface import ILandmarksModel
-from src.domain.services.image_save_service import ImageSaveService
+from src.domain.services.landmarks_inference_service import LandmarksInferenceService
+from src.domain.services.image_save_service import ImageSaveService, ImageAnnotation
+from src.domain.services.findface_dispatcher import FindfaceDispatcher
+from src.domain.services.track_deduplicator import TrackDeduplicator
+from src.domain.services.track_metadata_log import TrackMetadataLog
 
 
 class ByteTrackDetectorService:
@@ -29,15 +33,24 @@ class ByteTrackDetectorService:
     Serviço de domínio responsável por detectar e rastrear faces em streams de vídeo.
     Utiliza entidades de domínio (Camera, Frame, Event, Track) seguindo princípios DDD.
     """
+    
+    SAVE_MODES = ("full", "crop", "thumbnail")
+    SAVE_LAYOUTS = ("flat", "sharded")
+    
+    # Sessão de stream com frames por pelo menos este tempo (s) zera o backoff de reconexão
+    STABLE_STREAM_SECONDS = 60.0
 
     def __init__(
         self,
         camera: Camera,
         detection_model: IDetectionModel,  # ALTERADO de yolo_model
         landmarks_model: Optional[ILandmarksModel] = None,  # NOVO: Modelo para landmarks faciais
+        landmarks_service: Optional[LandmarksInferenceService] = None,  # NOVO: Serviço de landmarks compartilhado
         findface_adapter: Optional[FindfaceAdapter] = None,
-        findface_queue: Optional[Queue] = None,  # NOVO: Fila FindFace global compartilhada
+        findface_queue: Optional[Union[Queue, FindfaceDispatcher]] = None,  # NOVO: Fila FindFace global compartilhada
         image_save_service: Optional[ImageSaveService] = None,  # NOVO: Serviço assíncrono de salvamento
+        track_deduplicator: Optional[TrackDeduplicator] = None,  # NOVO: Deduplicação de tracks fragmentados
+        track_metadata_log: Optional[TrackMetadataLog] = None,  # NOVO: Registro colunar dos tracks finalizados
         tracker: str = "bytetrack.yaml",
         batch: int = 4,
         show: bool = True,
@@ -47,6 +60,12 @@ class ByteTrackDetectorService:
         max_frames_lost: int = 30,
         verbose_log: bool = False,
         save_images: bool = True,
+        save_mode: str = "full",
+        save_jpeg_quality: int = 95,
+        save_crop_context: float = 0.5,
+        save_thumbnail_size: int = 320,
+        save_layout: str = "sharded",
+        save_annotate: bool = True,
         project_dir: str = "./imagens/",
         results_dir: str = "rtsp_byte_track_results",
         min_movement_threshold: float = 50.0,
@@ -55,7 +74,10 @@ class ByteTrackDetectorService:
         min_bbox_width: int = 60,
         max_frames_per_track: int = 900,  # RENOMEADO
         inference_size: int = 640,  # NOVO: Tamanho da imagem para inferência
-        detection_skip_frames: int = 1  # NOVO: Detectar a cada N frames (tracking continua em todos)
+        detection_skip_frames: int = 1,  # NOVO: Detectar a cada N frames (tracking continua em todos)
+        stall_timeout: float = 10.0,  # NOVO: Watchdog - tempo máximo sem frames antes de reabrir o stream
+        reconnect_backoff: float = 1.0,  # NOVO: Espera inicial antes de reconectar
+        reconnect_backoff_max: float = 30.0  # NOVO: Espera máxima entre reconexões
     ):
         """
         Inicializa o serviço de detecção de faces.
@@ -63,9 +85,15 @@ class ByteTrackDetectorService:
         :param camera: Entidade Camera com informações da câmera.
         :param detection_model: Modelo YOLO para detecção de faces.
         :param landmarks_model: Modelo para detecção de landmarks faciais (opcional).
+                                Ignorado se landmarks_service for fornecido; caso contrário,
+                                cria um serviço de landmarks exclusivo desta câmera.
+        :param landmarks_service: Serviço de landmarks compartilhado entre câmeras (opcional).
         :param findface_adapter: Adapter para comunicação com FindFace (opcional).
-        :param findface_queue: Fila FindFace global compartilhada entre câmeras (opcional).
+        :param findface_queue: Fila (ou dispatcher) FindFace global compartilhada entre câmeras (opcional).
         :param image_save_service: Serviço assíncrono de salvamento de imagens (opcional).
+        :param track_deduplicator: Deduplicador exclusivo desta câmera; agrupa tracks fragmentados
+                                   e envia ao FindFace apenas o melhor evento do grupo (opcional).
+        :param track_metadata_log: Registro colunar compartilhado dos tracks finalizados (opcional).
         :param tracker: Arquivo de configuração do tracker ByteTrack.
         :param batch: Tamanho do batch para processamento.
         :param show: Se deve exibir o vídeo processado.
@@ -74,6 +102,16 @@ class ByteTrackDetectorService:
         :param iou: Threshold de IOU para o tracker.
         :param max_frames_lost: Máximo de frames perdidos antes de finalizar um track.
         :param verbose_log: Se deve exibir logs detalhados.
+        :param save_mode: Imagem salva em disco: "full" (frame inteiro), "crop" (recorte
+                          expandido da face) ou "thumbnail" (frame inteiro reduzido).
+        :param save_jpeg_quality: Qualidade JPEG das imagens salvas em disco.
+        :param save_crop_context: Expansão do recorte em torno da face no modo "crop" (fração do bbox).
+        :param save_thumbnail_size: Maior lado (pixels) da imagem no modo "thumbnail".
+        :param save_layout: Organização dos arquivos: "flat" (todos em results_dir) ou
+                            "sharded" (results_dir/camera-{id}/{AAAAMMDD}/{HH}).
+        :param save_annotate: Desenha bbox e rótulo na imagem salva. Sem anotação, a imagem
+                              salva pode ser a mesma variante enviada ao FindFace (uma
+                              única codificação).
         :param project_dir: Diretório base para salvamento de imagens.
         :param results_dir: Nome do subdiretório para resultados.
         :param min_movement_threshold: Limite mínimo de movimento em pixels.
@@ -83,8 +121,12 @@ class ByteTrackDetectorService:
         :param max_frames_per_track: Máximo de frames permitidos por track.
         :param inference_size: Tamanho da imagem para inferência (ex: 640, 1280).
         :param detection_skip_frames: Realiza detecção a cada N frames (tracking continua em todos os frames).
-        :param findface_queue_size: Tamanho da fila assíncrona para envios FindFace (0 = desabilita fila).
+        :param stall_timeout: Tempo máximo (s) sem receber frames; ao exceder, o watchdog
+                              interrompe e reabre o stream (0 = desabilita o watchdog).
+        :param reconnect_backoff: Espera inicial (s) antes de reabrir um stream encerrado.
+        :param reconnect_backoff_max: Espera máxima (s) entre reconexões (câmeras instáveis).
         :raises TypeError: Se camera não for do tipo Camera.
+        :raises ValueError: Se save_mode ou save_layout for inválido.
         """
         if not isinstance(camera, Camera):
             raise TypeError(f"camera deve ser Camera, recebido: {type(camera).__name__}")
@@ -92,6 +134,12 @@ class ByteTrackDetectorService:
         if findface_adapter is not None and not isinstance(findface_adapter, FindfaceAdapter):
             raise TypeError(f"findface_adapter deve ser FindfaceAdapter, recebido: {type(findface_adapter).__name__}")
         
+        if save_mode not in self.SAVE_MODES:
+            raise ValueError(f"save_mode deve ser um de {self.SAVE_MODES}, recebido: {save_mode}")
+        
+        if save_layout not in self.SAVE_LAYOUTS:
+            raise ValueError(f"save_layout deve ser um de {self.SAVE_LAYOUTS}, recebido: {save_layout}")
+        
         # Suprime warnings do OpenCV
         cv2.setLogLevel(0)
         
@@ -100,6 +148,8 @@ class ByteTrackDetectorService:
         self.landmarks_model = landmarks_model  # NOVO: Modelo de landmarks
         self.findface_adapter = findface_adapter
         self.image_save_service = image_save_service  # NOVO: Serviço de salvamento assíncrono
+        self.track_deduplicator = track_deduplicator  # NOVO: Deduplicação antes do envio
+        self.track_metadata_log = track_metadata_log  # NOVO: Metadados dos tracks finalizados
         self.tracker = tracker
         self.batch = batch
         self.show = show
@@ -109,6 +159,12 @@ class ByteTrackDetectorService:
         self.max_frames_lost = max_frames_lost
         self.verbose_log = verbose_log
         self.save_images = save_images
+        self.save_mode = save_mode
+        self.save_jpeg_quality = save_jpeg_quality
+        self.save_crop_context = save_crop_context
+        self.save_thumbnail_size = save_thumbnail_size
+        self.save_layout = save_layout
+        self.save_annotate = save_annotate
         self.project_dir = project_dir
         self.results_dir = results_dir
         self.min_movement_threshold = min_movement_threshold
@@ -118,8 +174,23 @@ class ByteTrackDetectorService:
         self.max_frames_per_track = max_frames_per_track  # RENOMEADO
         self.inference_size = inference_size  # NOVO
         self.detection_skip_frames = max(1, detection_skip_frames)  # NOVO: mínimo 1
+        self.stall_timeout = max(0.0, stall_timeout)
+        self.reconnect_backoff = max(0.1, reconnect_backoff)
+        self.reconnect_backoff_max = max(self.reconnect_backoff, reconnect_backoff_max)
         self.running = False
         
+        # Watchdog do stream: instante do último frame e estado da sessão atual
+        # (o prazo entre interrupções é separado: não altera o instante do último frame)
+        self._stop_event = threading.Event()
+        self._watchdog_thread: Optional[threading.Thread] = None
+        self._stream_active = False
+        self._stalled = False
+        self._last_frame_at = time.monotonic()
+        self._session_started_at = self._last_frame_at
+        self._last_abort_at = 0.0
+        self._reconnects = 0
+        self._stalls = 0
+        
         self.logger = logging.getLogger(
             f"ByteTrackDetectorService_{camera.camera_id.value()}_{camera.camera_name.value()}"
         )
@@ -146,167 +217,69 @@ class ByteTrackDetectorService:
         elif self.findface_adapter is not None:
             self.logger.info("Fila FindFace não fornecida - modo síncrono")
         
-        # OTIMIZAÇÃO 9: Fila assíncrona para inferência de landmarks em lote
-        self._landmarks_queue: Optional[Queue] = None
-        self._landmarks_worker: Optional[Thread] = None
-        self._landmarks_worker_running = False
-        self._landmarks_results: Dict[int, Optional[np.ndarray]] = {}  # Cache de resultados: event_id -> landmarks
-        self._landmarks_batch_size = batch  # Tamanho do batch para landmarks
-        
-        if self.landmarks_model is not None:
-            # Tamanho da fila: 3x o batch size para buffer
-            landmarks_queue_size = self._landmarks_batch_size * 3
-            self._landmarks_queue = Queue(maxsize=landmarks_queue_size)
-            self._landmarks_worker_running = True
-            self._landmarks_worker = Thread(
-                target=self._landmarks_batch_worker,
-                name=f"Landmarks-Worker-{camera.camera_id.value()}",
-                daemon=True
+        # OTIMIZAÇÃO 9: Inferência de landmarks em lote via serviço compartilhado entre câmeras
+        self._landmarks_service: Optional[LandmarksInferenceService] = landmarks_service
+        self._owns_landmarks_service = False
+        
+        if self._landmarks_service is None and self.landmarks_model is not None:
+            # Sem serviço compartilhado: cria um serviço exclusivo para esta câmera
+            self._landmarks_service = LandmarksInferenceService(
+                landmarks_model=self.landmarks_model,
+                batch_size=batch,
+                conf=conf
             )
-            self._landmarks_worker.start()
+            self._owns_landmarks_service = True
+        
+        if self._landmarks_service is not None:
             self.logger.info(
-                f"Worker assíncrono de landmarks iniciado "
-                f"(fila: {landmarks_queue_size}, batch: {self._landmarks_batch_size})"
+                "Usando serviço de landmarks "
+                f"{'exclusivo' if self._owns_landmarks_service else 'compartilhado'}"
             )
 
     # Worker FindFace agora é global (pool de workers em run.py)
     # Método _findface_sender_worker removido - workers globais processam fila compartilhada
-    
-    def _landmarks_batch_worker(self):
-        """Worker thread dedicado para inferência de landmarks em lote.
-        
-        Acumula crops de faces em batch e processa todos de uma vez,
-        maximizando performance da GPU/CPU.
-        """
-        self.logger.info("Landmarks worker iniciado")
-        
-        batch_buffer = []  # Buffer temporário: [(event_id, face_crop), ...]
-        
-        while self._landmarks_worker_running:
-            try:
-                # Tenta pegar primeiro item (bloqueia até 0.1s)
-                try:
-                    item = self._landmarks_queue.get(timeout=0.1)
-                    
-                    if item is None:  # Sinal de parada
-                        self.logger.info("Landmarks worker recebeu sinal de parada")
-                        break
-                    
-                    batch_buffer.append(item)
-                except:
-                    # Timeout - processa batch parcial se existir
-                    if batch_buffer and not self._landmarks_worker_running:
-                        break
-                    if not batch_buffer:
-                        continue
-                
-                # Acumula até completar batch (ou timeout)
-                while len(batch_buffer) < self._landmarks_batch_size:
-                    try:
-                        item = self._landmarks_queue.get(timeout=0.01)  # Timeout curto
-                        if item is None:
-                            break
-                        batch_buffer.append(item)
-                    except:
-                        break  # Timeout - processa o que tem
-                
-                if not batch_buffer:
-                    continue
-                
-                # Processa batch
-                try:
-                    # Prepara crops para inferência em lote
-                    event_ids = [item[0] for item in batch_buffer]
-                    crops = [item[1] for item in batch_buffer]
-                    
-                    # Infere landmarks em lote
-                    for event_id, crop in zip(event_ids, crops):
-                        try:
-                            if crop.size > 0:
-                                landmarks_result = self.landmarks_model.predict(
-                                    face_crop=crop,
-                                    conf=self.conf,
-                                    verbose=False  # Desabilita logs em batch
-                                )
-                                
-                                if landmarks_result is not None:
-                                    landmarks_array, _ = landmarks_result
-                                    self._landmarks_results[event_id] = landmarks_array
-                                else:
-                                    self._landmarks_results[event_id] = None
-                            else:
-                                self._landmarks_results[event_id] = None
-                        except Exception as e:
-                            # OTIMIZAÇÃO: Usa debug ao invés de warning para reduzir I/O
-                            self._landmarks_results[event_id] = None
-                    
-                    # Marca tarefas como concluídas
-                    for _ in batch_buffer:
-                        self._landmarks_queue.task_done()
-                    
-                    # OTIMIZAÇÃO: Log de batch removido para reduzir I/O
-                    
-                except Exception as e:
-                    self.logger.error(f"Erro no processamento de batch de landmarks: {e}")
-                    # Marca tarefas como concluídas mesmo com erro
-                    for _ in batch_buffer:
-                        try:
-                            self._landmarks_queue.task_done()
-                        except:
-                            pass
-                
-                # Limpa buffer
-                batch_buffer.clear()
-                
-            except Exception as e:
-                if not self._landmarks_worker_running:
-                    break
-                self.logger.error(f"Erro no landmarks worker: {e}")
-                continue
-        
-        self.logger.info("Landmarks worker finalizado")
+    # Worker de landmarks agora é global (LandmarksInferenceService compartilhado entre câmeras)
     
     def start(self):
         """Inicia o processamento do stream de vídeo"""
         self.running = True
+        self._stop_event.clear()
         self.logger.info(
             f"ByteTrackDetectorService iniciado para câmera "
             f"{self.camera.camera_name.value()} (ID: {self.camera.camera_id.value()})"
         )
+        if self.stall_timeout > 0:
+            self._watchdog_thread = threading.Thread(
+                target=self._watchdog,
+                name=f"Watchdog-{self.camera.camera_id.value()}",
+                daemon=True
+            )
+            self._watchdog_thread.start()
         self._process_stream()
 
     def stop(self):
         """Para o processamento do stream"""
         self.running = False
+        self._stop_event.set()
         
-        # Finaliza serviço de salvamento de imagens
-        if self.image_save_service is not None:
+        # Stream travado não entrega o próximo frame: interrompe para a thread de captura sair
+        if self._stream_active:
             try:
-                self.image_save_service.stop()
-                self.logger.info("ImageSaveService finalizado com sucesso")
+                self.model.abort_stream()
             except Exception as e:
-                self.logger.error(f"Erro ao finalizar ImageSaveService: {e}")
+                self.logger.error(f"Erro ao interromper stream: {e}")
         
-        # Finaliza worker de landmarks graciosamente
-        if self._landmarks_queue is not None and self._landmarks_worker is not None:
+        # NOTA: ImageSaveService é compartilhado entre câmeras (gerenciado em run.py) - não para aqui
+        
+        # Serviço de landmarks compartilhado é gerenciado em run.py - para apenas o exclusivo
+        if self._landmarks_service is not None:
             try:
-                self._landmarks_worker_running = False
-                
-                # Envia sinal de parada
-                try:
-                    self._landmarks_queue.put(None, timeout=0.5)
-                except:
-                    self.logger.warning("Não foi possível enviar sinal de parada para landmarks worker")
-                
-                # Aguarda worker finalizar
-                self._landmarks_worker.join(timeout=2.0)
-                
-                if self._landmarks_worker.is_alive():
-                    self.logger.warning("Landmarks worker não finalizou no tempo esperado")
+                if self._owns_landmarks_service:
+                    self._landmarks_service.stop()
                 else:
-                    self.logger.info("Landmarks worker finalizado com sucesso")
+                    self._landmarks_service.unregister_camera(self.camera.camera_id.value())
             except Exception as e:
-                self.logger.error(f"Erro ao finalizar landmarks worker: {e}")
+                self.logger.error(f"Erro ao finalizar serviço de landmarks: {e}")
         
         # NOTA: Workers FindFace são globais (gerenciados em run.py) - não para aqui
         
@@ -315,9 +288,55 @@ class ByteTrackDetectorService:
             f"{self.camera.camera_name.value()}"
         )
 
+    def _watchdog(self):
+        """
+        Verifica o tempo desde o último frame; ao exceder stall_timeout, interrompe o
+        stream (a thread de captura reabre a fonte com backoff). Enquanto a captura
+        ainda está sendo aberta não há fonte a fechar: a abertura é limitada pelo
+        timeout do FFmpeg (stream.open_timeout).
+        """
+        interval = min(1.0, self.stall_timeout / 4)
+        while not self._stop_event.wait(interval):
+            if not self._stream_active:
+                continue
+            now = time.monotonic()
+            idle = now - max(self._last_frame_at, self._session_started_at)
+            if idle < self.stall_timeout:
+                continue
+            if self._last_abort_at and now - self._last_abort_at < self.stall_timeout:
+                continue
+            
+            if not self._stalled:
+                self._stalled = True
+                self._stalls += 1
+                self.logger.warning(
+                    f"Stream da câmera {self.camera.camera_name.value()} sem frames há {idle:.0f}s; "
+                    f"interrompendo para reconectar"
+                )
+            elif self._last_abort_at:
+                # A interrupção anterior não encerrou a sessão: a captura ainda está sendo
+                # aberta (não há fonte a fechar); quem encerra é o timeout do FFmpeg
+                self.logger.warning(
+                    f"Stream da câmera {self.camera.camera_name.value()} não respondeu à interrupção "
+                    f"(sem frames há {idle:.0f}s); aguardando o timeout de abertura da captura"
+                )
+            # Nova tentativa de interrupção a cada stall_timeout enquanto o stream continuar travado
+            self._last_abort_at = now
+            try:
+                self.model.abort_stream()
+            except Exception as e:
+                self.logger.error(f"Erro ao interromper stream travado: {e}")
+
     def _process_stream(self):
-        """Processa o stream de vídeo frame a frame"""
+        """Processa o stream de vídeo frame a frame, reabrindo a fonte com backoff exponencial"""
+        backoff = self.reconnect_backoff
         while self.running:
+            session_started = time.monotonic()
+            session_frames = 0
+            self._session_started_at = session_started
+            self._last_abort_at = 0.0
+            self._stalled = False
+            self._stream_active = True
             try:
                 for result in self.model.track(
                     source=self.camera.source.value(),
@@ -334,6 +353,10 @@ class ByteTrackDetectorService:
                     if not self.running:
                         break
                     
+                    # Watchdog: instante do último frame recebido
+                    self._last_frame_at = time.monotonic()
+                    session_frames += 1
+                    
                     # Incrementa contador de frames
                     self._frame_counter += 1
                     
@@ -392,6 +415,8 @@ class ByteTrackDetectorService:
                                 event,
                                 min_threshold_pixels=self.min_movement_threshold
                             )
+                            if self.active_tracks[track_id].best_event is event:
+                                self._submit_landmarks(track_id, event)
                             self.track_frames_lost[track_id] = 0
                             self.track_frame_count[track_id] += 1  # NOVO: incrementa contador de frames
                             
@@ -415,8 +440,36 @@ class ByteTrackDetectorService:
                 self.logger.info("Execução interrompida pelo usuário.")
                 break
             except Exception as e:
-                self.logger.exception(f"Erro no stream RTSP: {e}. Tentando reconectar em 5 segundos...")
-                time.sleep(5)
+                if not self._stalled:
+                    self.logger.exception(f"Erro no stream RTSP: {e}")
+            finally:
+                self._stream_active = False
+            
+            if not self.running:
+                break
+            
+            # Stream encerrado (erro, travamento ou fim da fonte): os tracks não recebem mais
+            # frames - são finalizados agora (sem reter frames durante a queda) e o tracker é
+            # reiniciado; fragmentos do mesmo rosto ainda podem ser agrupados pela deduplicação
+            for track_id in list(self.active_tracks.keys()):
+                self._finalize_track(track_id)
+            self._flush_deduplicated()
+            self.model.reset_tracker()
+            
+            # Backoff exponencial: câmeras instáveis esperam cada vez mais (até o máximo);
+            # uma sessão estável com frames volta à espera inicial
+            if session_frames and time.monotonic() - session_started >= self.STABLE_STREAM_SECONDS:
+                backoff = self.reconnect_backoff
+            self._reconnects += 1
+            self.logger.warning(
+                f"Stream da câmera {self.camera.camera_name.value()} encerrado "
+                f"({'travado' if self._stalled else f'{session_frames} frames'}); "
+                f"reconectando em {backoff:.1f}s"
+            )
+            self._stop_event.wait(backoff)
+            backoff = min(backoff * 2, self.reconnect_backoff_max)
+        
+        self._stop_event.set()
         
         # Finaliza todos os tracks restantes ao encerrar
         self._finalize_all_tracks()
@@ -465,31 +518,10 @@ class ByteTrackDetectorService:
         # Extrai confiança
         confidence = ConfidenceVO(float(box.conf[0]))
         
-        # Enfileira crop para inferência assíncrona de landmarks (se disponível)
+        # Landmarks do modelo de detecção (se disponível); os do modelo dedicado chegam
+        # de forma assíncrona e refinam apenas o melhor evento, na finalização do track
         landmarks_array = None
-        if self.landmarks_model is not None and self._landmarks_queue is not None:
-            try:
-                # Obtém o ndarray do frame e faz o crop usando coordenadas do bbox
-                frame_array = frame.full_frame.ndarray_readonly
-                face_crop = frame_array[bbox.y1:bbox.y2, bbox.x1:bbox.x2]
-                
-                # Enfileira para processamento assíncrono em lote
-                if face_crop.size > 0:
-                    try:
-                        self._landmarks_queue.put_nowait((event_id, face_crop.copy()))
-                    except:
-                        # Fila cheia - usa fallback (sem log para evitar spam)
-                        pass
-                
-                # Tenta buscar resultado já processado (se existir)
-                landmarks_array = self._landmarks_results.pop(event_id, None)
-                    
-            except Exception:
-                # Erro ao processar landmarks - usa fallback silenciosamente
-                pass
-        
-        # Fallback: usa landmarks do modelo de detecção (se disponível)
-        if landmarks_array is None and keypoints is not None and len(keypoints) > index:
+        if keypoints is not None and len(keypoints) > index:
             kpts = keypoints[index].xy[0].cpu().numpy()
             landmarks_array = kpts
         
@@ -506,6 +538,56 @@ class ByteTrackDetectorService:
         
         return event
 
+    def _submit_landmarks(self, track_id: int, event: Event) -> None:
+        """
+        Enfileira o crop do novo melhor evento do track para inferência de landmarks.
+        Apenas candidatos a melhor evento são inferidos; o resultado é consultado na
+        finalização do track (``_refine_best_event``).
+        
+        :param track_id: ID do track.
+        :param event: Evento que passou a ser o melhor do track.
+        """
+        if self._landmarks_service is None:
+            return
+        try:
+            bbox = event.bbox
+            face_crop = event.frame.full_frame.ndarray_readonly[bbox.y1:bbox.y2, bbox.x1:bbox.x2]
+            # Processamento assíncrono em lote (fila cheia = mantém os landmarks do detector)
+            if face_crop.size > 0:
+                self._landmarks_service.submit(
+                    self.camera.camera_id.value(), track_id, event.id.value(), face_crop.copy()
+                )
+        except Exception:
+            # Erro ao enfileirar landmarks - mantém os do detector silenciosamente
+            pass
+
+    def _refine_best_event(self, track_id: int, event: Event) -> Event:
+        """
+        Substitui os landmarks do melhor evento pelos do modelo dedicado, se a inferência
+        desse evento já terminou; o score de qualidade é recalculado.
+        
+        :param track_id: ID do track.
+        :param event: Melhor evento do track.
+        :return: Evento com os landmarks refinados, ou o próprio evento se indisponíveis.
+        """
+        if self._landmarks_service is None:
+            return event
+        landmarks_array = self._landmarks_service.pop_result(
+            self.camera.camera_id.value(), track_id, event.id.value()
+        )
+        if landmarks_array is None:
+            return event
+        # Coordenadas do crop -> coordenadas do frame (como as do modelo de detecção)
+        landmarks_array = landmarks_array.astype(np.float32)
+        landmarks_array[:, :2] += (event.bbox.x1, event.bbox.y1)
+        return Event(
+            id=event.id,
+            frame=event.frame,
+            bbox=event.bbox,
+            confidence=event.confidence,
+            landmarks=LandmarksVO(landmarks_array)
+        )
+
     def is_valid(self, track: Track) -> tuple[bool, str]:
         """
         Valida se um track atende às condições necessárias para ser considerado válido.
@@ -550,6 +632,9 @@ class ByteTrackDetectorService:
         # Finaliza tracks perdidos
         for track_id in tracks_to_finalize:
             self._finalize_track(track_id)
+        
+        # Envia os grupos de fragmentos cujo horizonte de deduplicação expirou
+        self._flush_deduplicated()
 
     def _finalize_track(self, track_id: int):
         """
@@ -561,6 +646,7 @@ class ByteTrackDetectorService:
             return
         
         track = self.active_tracks[track_id]
+        finalize_started = time.monotonic()
         
         if track.is_empty:
             self.logger.warning(f"Track {track_id} vazio, não será processado")
@@ -577,12 +663,15 @@ class ByteTrackDetectorService:
         has_movement = track.has_movement
         movement_stats = track.get_movement_statistics()
         
-        # Obtém melhor evento do track
+        # Obtém melhor evento do track (com os landmarks do modelo dedicado, se prontos)
         best_event = track.get_best_event()
+        if best_event is not None:
+            best_event = self._refine_best_event(track_id, best_event)
         best_confidence = best_event.confidence.value() if best_event else 0.0
         
         # ATUALIZADO: Log com informação de frames processados
         total_frames = self.track_frame_count.get(track_id, 0)
+        frames_lost = self.track_frames_lost[track_id]
         
         self.logger.info(
             f"Track {track_id} finalizado após {self.track_frames_lost[track_id]} frames perdidos. "
@@ -601,6 +690,10 @@ class ByteTrackDetectorService:
         if track_id in self.track_frame_count:  # NOVO: limpa contador de frames
             del self.track_frame_count[track_id]
         
+        # Descarta crops de landmarks ainda pendentes deste track
+        if self._landmarks_service is not None:
+            self._landmarks_service.discard_track(self.camera.camera_id.value(), track_id)
+        
         # OTIMIZAÇÃO 7: Coleta de lixo periódica a cada 500 tracks (reduz overhead)
         self._tracks_finalized_count += 1
         if self._tracks_finalized_count % 500 == 0:
@@ -612,12 +705,27 @@ class ByteTrackDetectorService:
             self.logger.warning(f"Track {track_id} não possui melhor evento")
             return
         
+        dispatch = TrackMetadataLog.DISPATCH_SKIPPED
+        
+        # OTIMIZAÇÃO 10: Payload com as codificações JPEG do melhor evento, memoizadas entre
+        # salvamento em disco, deduplicação, tentativas de envio e outbox (cada variante é
+        # codificada uma única vez, fora da thread de captura)
+        payload = EventPayload(best_event)
+        
         # Salva melhor face (sempre salva, mas cor do bbox depende da validade)
-        self._save_best_event(track_id, best_event, track.event_count, has_movement, is_valid)
+        self._save_best_event(track_id, payload, track.event_count, has_movement, is_valid)
         
         # Envia para FindFace apenas se o track for válido
         if self.findface_adapter is not None and is_valid:
-            self._send_best_event_to_findface(track_id, best_event, track.event_count)
+            if self.track_deduplicator is not None:
+                # Retém o evento para agrupar com fragmentos do mesmo rosto (ByteTrack troca o ID após oclusão)
+                for item in self.track_deduplicator.add(track_id, track, payload):
+                    self._send_best_event_to_findface(*item)
+                dispatch = TrackMetadataLog.DISPATCH_HELD
+            elif self._send_best_event_to_findface(track_id, payload, track.event_count):
+                dispatch = TrackMetadataLog.DISPATCH_QUEUED
+            else:
+                dispatch = TrackMetadataLog.DISPATCH_DROPPED
         elif not is_valid:
             # Log detalhado do motivo da invalidação
             self.logger.warning(
@@ -626,76 +734,109 @@ class ByteTrackDetectorService:
                 f"Confiança: {best_confidence:.4f} | "
                 f"Largura bbox: {best_event.bbox.width}px"
             )
+        
+        # Registro colunar do track (apenas enfileira a linha; a gravação é feita em lote)
+        if self.track_metadata_log is not None:
+            last_time = track.last_event.frame.timestamp.value()
+            self.track_metadata_log.record_track(
+                camera_id=self.camera.camera_id.value(),
+                track_id=track_id,
+                frames=total_frames,
+                events=track.event_count,
+                frames_lost=frames_lost,
+                has_movement=has_movement,
+                movement_stats=movement_stats,
+                best_quality=best_event.face_quality_score.value(),
+                best_confidence=best_confidence,
+                bbox_width=best_event.bbox.width,
+                valid=is_valid,
+                invalid_reason=invalid_reason,
+                dispatch=dispatch,
+                duration=(last_time - track.first_event.frame.timestamp.value()).total_seconds(),
+                finalize_delay=(datetime.now() - last_time).total_seconds(),
+                finalize_time=time.monotonic() - finalize_started
+            )
 
-    def _save_best_event(self, track_id: int, event: Event, total_events: int, has_movement: bool, is_valid: bool):
+    @staticmethod
+    def _track_status(has_movement: bool, is_valid: bool) -> tuple:
         """
-        Salva o melhor evento do track em disco com bbox desenhado.
+        Retorna o rótulo e a cor do bbox conforme a validade do track.
+        
+        - Vermelho: inválido
+        - Verde: válido com movimento
+        - Amarelo: válido sem movimento (caso não usado, mantido para consistência)
+        
+        :return: Tupla (status_label, bbox_color).
+        """
+        if not is_valid:
+            return "INVALID", (0, 0, 255)  # Vermelho para inválidos
+        elif has_movement:
+            return "VALID", (0, 255, 0)  # Verde para válidos com movimento
+        return "STATIC", (0, 255, 255)  # Amarelo para válidos sem movimento
+
+    def _best_event_annotation(
+        self,
+        track_id: int,
+        event: Event,
+        has_movement: bool,
+        is_valid: bool
+    ) -> ImageAnnotation:
+        """
+        Monta as instruções de desenho (bbox e label) do melhor evento.
+        O desenho é feito pelos workers do ImageSaveService, fora da thread de captura.
         
         :param track_id: ID do track.
         :param event: Melhor evento do track.
+        :param has_movement: Se o track teve movimento significativo.
+        :param is_valid: Se o track é válido para envio ao FindFace.
+        :return: Anotação do melhor evento.
+        """
+        status_label, bbox_color = self._track_status(has_movement, is_valid)
+        label = (
+            f"Track {track_id} | "
+            f"{status_label} | "
+            f"Quality: {event.face_quality_score.value():.4f} | "
+            f"Conf: {event.confidence.value():.2f}"
+        )
+        return ImageAnnotation(bbox=event.bbox.value(), color=bbox_color, label=label)
+
+    def _crop_region(self, bbox: tuple, shape: tuple) -> tuple:
+        """
+        Calcula o recorte expandido em torno da face para o modo "crop".
+        
+        :param bbox: Bbox da face (x1, y1, x2, y2).
+        :param shape: Shape do frame (altura, largura, ...).
+        :return: Região (left, top, right, bottom) limitada ao frame.
+        """
+        x1, y1, x2, y2 = bbox
+        height, width = shape[:2]
+        margin_x = int((x2 - x1) * self.save_crop_context)
+        margin_y = int((y2 - y1) * self.save_crop_context)
+        return (
+            max(0, x1 - margin_x),
+            max(0, y1 - margin_y),
+            min(width, x2 + margin_x),
+            min(height, y2 + margin_y)
+        )
+
+    def _save_best_event(self, track_id: int, payload: EventPayload, total_events: int, has_movement: bool, is_valid: bool):
+        """
+        Salva o melhor evento do track em disco com bbox desenhado.
+        
+        :param track_id: ID do track.
+        :param payload: Payload do melhor evento do track (codificações memoizadas).
         :param total_events: Total de eventos no track.
         :param has_movement: Se o track teve movimento significativo.
         :param is_valid: Se o track é válido para envio ao FindFace.
         """
+        event = payload.event
         try:
-            # OTIMIZAÇÃO 5: Usa ndarray_readonly + copia apenas uma vez
-            frame_with_bbox = event.frame.full_frame.ndarray_readonly.copy()
-            
-            x1, y1, x2, y2 = event.bbox.value()
-            
-            # Cor do bbox baseada na validade:
-            # - Vermelho: inválido
-            # - Verde: válido com movimento
-            # - Amarelo: válido sem movimento (caso não usado, mantido para consistência)
-            if not is_valid:
-                bbox_color = (0, 0, 255)  # Vermelho para inválidos
-                status_label = "INVALID"
-            elif has_movement:
-                bbox_color = (0, 255, 0)  # Verde para válidos com movimento
-                status_label = "VALID"
-            else:
-                bbox_color = (0, 255, 255)  # Amarelo para válidos sem movimento
-                status_label = "STATIC"
-            
-            # Desenha bbox
-            cv2.rectangle(frame_with_bbox, (x1, y1), (x2, y2), bbox_color, 2)
-            
-            # Label
-            label = (
-                f"Track {track_id} | "
-                f"{status_label} | "
-                f"Quality: {event.face_quality_score.value():.4f} | "
-                f"Conf: {event.confidence.value():.2f}"
-            )
-            
-            label_size, _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
-            cv2.rectangle(
-                frame_with_bbox,
-                (x1, y1 - label_size[1] - 10),
-                (x1 + label_size[0], y1),
-                bbox_color,
-                -1
-            )
-            cv2.putText(
-                frame_with_bbox,
-                label,
-                (x1, y1 - 5),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.6,
-                (255, 255, 255),  # Texto branco para melhor contraste
-                2
-            )
-            
             # Nome do arquivo
-            timestamp_str = event.frame.timestamp.value().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+            event_time = event.frame.timestamp.value()
+            timestamp_str = event_time.strftime("%Y%m%d_%H%M%S_%f")[:-3]
             
             # Prefixo baseado na validade
-            if not is_valid:
-                prefix = "INVALID"
-            elif has_movement:
-                prefix = "VALID"
-            else:
-                prefix = "STATIC"
+            prefix, _ = self._track_status(has_movement, is_valid)
             
             # Sanitiza o nome da câmera para usar no filename (remove caracteres inválidos)
             camera_name_clean = self.camera.camera_name.value().replace(" ", "-").replace("/", "-").replace("\\", "-")
@@ -706,15 +847,46 @@ class ByteTrackDetectorService:
             # Salva no disco apenas se habilitado
             if self.save_images:
                 from pathlib import Path
-                filepath = Path(self.project_dir) / self.results_dir / filename
-                filepath.parent.mkdir(parents=True, exist_ok=True)
+                directory = Path(self.project_dir) / self.results_dir
+                if self.save_layout == "sharded":
+                    # OTIMIZAÇÃO: Diretórios por câmera/data/hora mantêm poucos arquivos por
+                    # diretório (criação e busca não degradam com milhões de imagens)
+                    directory = directory / f"camera-{camera_id}" / event_time.strftime("%Y%m%d") / event_time.strftime("%H")
+                filepath = directory / filename
+                
+                annotations = []
+                if self.save_annotate:
+                    annotations.append(self._best_event_annotation(track_id, event, has_movement, is_valid))
+                region = None
+                max_size = self.save_thumbnail_size if self.save_mode == "thumbnail" else 0
                 
-                # OTIMIZAÇÃO: Salvamento assíncrono via ImageSaveService
+                if self.save_mode == "crop":
+                    # Recorte expandido; bbox da anotação em coordenadas do recorte
+                    region = self._crop_region(event.bbox.value(), event.frame.ndarray_readonly.shape)
+                    left, top = region[0], region[1]
+                    for i, annotation in enumerate(annotations):
+                        x1, y1, x2, y2 = annotation.bbox
+                        annotations[i] = ImageAnnotation(
+                            bbox=(x1 - left, y1 - top, x2 - left, y2 - top),
+                            color=annotation.color,
+                            label=annotation.label
+                        )
+                
+                # OTIMIZAÇÃO: Salvamento assíncrono via ImageSaveService - a thread de captura
+                # passa apenas o payload e as instruções de desenho; recorte, desenho e
+                # codificação (memoizada no payload, compartilhada com o envio ao FindFace
+                # quando a variante é a mesma) e criação do diretório ficam com os workers
                 if self.image_save_service is not None:
-                    self.image_save_service.save_async(frame_with_bbox, filepath, jpeg_quality=95)
+                    self.image_save_service.save_payload_async(
+                        payload, filepath, self.save_jpeg_quality,
+                        camera_id=camera_id, region=region, annotations=annotations,
+                        max_size=max_size, track_id=track_id, timestamp=event_time.timestamp()
+                    )
                 else:
                     # Fallback síncrono se o serviço não foi fornecido
-                    cv2.imwrite(str(filepath), frame_with_bbox, [cv2.IMWRITE_JPEG_QUALITY, 95])
+                    data = payload.jpeg(region, self.save_jpeg_quality, annotations, max_size)
+                    filepath.parent.mkdir(parents=True, exist_ok=True)
+                    filepath.write_bytes(data)
                 
                 # Log de salvamento apenas em modo verboso
                 if self.verbose_log:
@@ -729,31 +901,33 @@ class ByteTrackDetectorService:
         except Exception as e:
             self.logger.error(f"Erro ao salvar evento do track {track_id}: {e}", exc_info=True)
 
-    def _send_best_event_to_findface(self, track_id: int, event: Event, total_events: int):
+    def _send_best_event_to_findface(self, track_id: int, payload: EventPayload, total_events: int) -> bool:
         """
         Enfileira o melhor evento do track para envio assíncrono ao FindFace.
         OTIMIZAÇÃO 8: Usa fila global compartilhada processada por pool de workers.
         
         :param track_id: ID do track.
-        :param event: Melhor evento do track.
+        :param payload: Payload do melhor evento do track.
         :param total_events: Total de eventos no track.
+        :return: True se o evento foi enfileirado.
         """
+        event = payload.event
         if self.findface_adapter is None:
             self.logger.warning(f"FindFace adapter não configurado. Track {track_id} não será enviado.")
-            return
+            return False
         
         if self._findface_queue is None:
             self.logger.error(f"Fila FindFace não inicializada. Track {track_id} não será enviado.")
-            return
+            return False
         
         try:
             # Enfileira evento para processamento assíncrono (non-blocking)
-            # Formato: (camera_id, camera_name, track_id, event, total_events)
+            # Formato: (camera_id, camera_name, track_id, payload, total_events)
             event_data = (
                 self.camera.camera_id.value(),
                 self.camera.camera_name.value(),
                 track_id,
-                event,
+                payload,
                 total_events
             )
             self._findface_queue.put_nowait(event_data)
@@ -763,6 +937,7 @@ class ByteTrackDetectorService:
                     f"Track {track_id} enfileirado para envio FindFace "
                     f"(fila global: {self._findface_queue.qsize()}/{self._findface_queue.maxsize})"
                 )
+            return True
             
         except Exception as e:
             # Fila cheia - descarta evento e loga warning
@@ -773,10 +948,37 @@ class ByteTrackDetectorService:
                 f"fila_size={self._findface_queue.qsize()}, "
                 f"erro={e}"
             )
+            return False
+
+    def _flush_deduplicated(self, force: bool = False):
+        """
+        Envia ao FindFace os grupos de tracks fragmentados prontos.
+        
+        :param force: Se True, envia todos os grupos retidos (encerramento).
+        """
+        if self.track_deduplicator is None or not self.track_deduplicator.pending:
+            return
+        for item in self.track_deduplicator.flush(self.active_tracks.values(), force=force):
+            self._send_best_event_to_findface(*item)
+
+    def get_stream_stats(self) -> dict:
+        """
+        Retorna o estado do stream da câmera.
+        
+        :return: Dicionário com conexão ativa, segundos desde o último frame, reconexões
+                 e travamentos detectados pelo watchdog.
+        """
+        return {
+            'connected': self._stream_active and not self._stalled,
+            'last_frame_age': time.monotonic() - self._last_frame_at,
+            'reconnects': self._reconnects,
+            'stalls': self._stalls,
+        }
 
     def _finalize_all_tracks(self):
         """Finaliza todos os tracks ativos"""
         track_ids = list(self.active_tracks.keys())
         for track_id in track_ids:
             self._finalize_track(track_id)
+        self._flush_deduplicated(force=True)
         self.logger.info("Todos os tracks foram finalizados")
@@ -0,0 +1,74 @@
+"""
+Serviço de domínio para distribuição determinística de câmeras entre nós.
+Usa rendezvous hashing (HRW): cada câmera fica com o nó de maior peso para o seu ID.
+"""
+
+import hashlib
+from typing import Dict, Iterable, List
+
+
+class CameraSharding:
+    """
+    Atribui cada câmera a um dos ``node_count`` nós (0 .. node_count - 1) de forma
+    estável e sem coordenação entre os nós: todos calculam a mesma atribuição a
+    partir apenas do ID da câmera.
+
+    - o peso de cada par (nó, câmera) vem de um hash estável (blake2b), e não de
+      ``hash()``, que varia entre processos;
+    - ao adicionar um nó (node_count + 1), apenas as câmeras que passam a ter o novo
+      nó como maior peso mudam de dono (~1/N das câmeras); as demais permanecem onde
+      estavam. O mesmo vale ao remover o último nó.
+    """
+
+    def __init__(self, node_count: int, node_id: int = 0):
+        """
+        Inicializa a distribuição.
+
+        :param node_count: Número total de nós.
+        :param node_id: Índice deste nó (0 .. node_count - 1).
+        :raises ValueError: Se node_count for menor que 1 ou node_id estiver fora do intervalo.
+        """
+        if node_count < 1:
+            raise ValueError(f"node_count deve ser maior ou igual a 1, recebido: {node_count}")
+        if not 0 <= node_id < node_count:
+            raise ValueError(f"node_id deve estar entre 0 e {node_count - 1}, recebido: {node_id}")
+        self.node_count = node_count
+        self.node_id = node_id
+
+    @staticmethod
+    def _weight(node: int, camera_id: int) -> int:
+        """Peso estável do par (nó, câmera)."""
+        digest = hashlib.blake2b(f"{node}:{camera_id}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def owner(self, camera_id: int) -> int:
+        """
+        Retorna o nó responsável por uma câmera.
+
+        :param camera_id: ID da câmera.
+        :return: Índice do nó.
+        """
+        if self.node_count == 1:
+            return 0
+        return max(range(self.node_count), key=lambda node: self._weight(node, camera_id))
+
+    def owns(self, camera_id: int) -> bool:
+        """
+        Indica se a câmera pertence a este nó.
+
+        :param camera_id: ID da câmera.
+        :return: True se este nó é o responsável pela câmera.
+        """
+        return self.owner(camera_id) == self.node_id
+
+    def assign(self, camera_ids: Iterable[int]) -> Dict[int, List[int]]:
+        """
+        Calcula a atribuição completa (usada no dry-run).
+
+        :param camera_ids: IDs das câmeras.
+        :return: Dicionário nó -> IDs das câmeras atribuídas (todos os nós presentes).
+        """
+        assignment: Dict[int, List[int]] = {node: [] for node in range(self.node_count)}
+        for camera_id in camera_ids:
+            assignment[self.owner(camera_id)].append(camera_id)
+        return assignment
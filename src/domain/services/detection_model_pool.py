@@ -0,0 +1,89 @@
+"""
+Pool de modelos de detecção já carregados, reaproveitados entre câmeras.
+"""
+
+import logging
+from threading import Lock
+from typing import Callable, Dict, List
+
+from src.domain.services.model_interface import IDetectionModel
+
+
+class DetectionModelPool:
+    """
+    Mantém modelos de detecção ociosos por dispositivo (GPU).
+
+    Carregar um modelo (principalmente TensorRT/OpenVINO) leva segundos e ocupa
+    memória de GPU; quando uma câmera é removida, seu modelo volta ao pool (com o
+    tracker descartado) e é entregue à próxima câmera iniciada no mesmo dispositivo.
+    """
+
+    def __init__(self, factory: Callable[[int], IDetectionModel], max_idle_per_device: int = 2):
+        """
+        :param factory: Função que carrega um novo modelo no dispositivo informado.
+        :param max_idle_per_device: Máximo de modelos ociosos mantidos por dispositivo
+                                    (excedentes são liberados).
+        """
+        self.factory = factory
+        self.max_idle_per_device = max(0, max_idle_per_device)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._idle: Dict[int, List[IDetectionModel]] = {}
+        self._lock = Lock()
+        self._created = 0
+        self._reused = 0
+        self._discarded = 0
+
+    def acquire(self, device_id: int) -> IDetectionModel:
+        """
+        Retorna um modelo ocioso do dispositivo ou carrega um novo.
+
+        :param device_id: Dispositivo (GPU) desejado.
+        :return: Modelo pronto para uso exclusivo de uma câmera.
+        """
+        with self._lock:
+            idle = self._idle.get(device_id)
+            if idle:
+                self._reused += 1
+                return idle.pop()
+
+        model = self.factory(device_id)
+        with self._lock:
+            self._created += 1
+        return model
+
+    def release(self, device_id: int, model: IDetectionModel) -> None:
+        """
+        Devolve um modelo ao pool após descartar o estado do tracker.
+
+        :param device_id: Dispositivo (GPU) em que o modelo está carregado.
+        :param model: Modelo que não está mais em uso.
+        """
+        try:
+            model.reset_tracker()
+        except Exception as e:
+            self.logger.warning(f"Falha ao descartar tracker do modelo ({e}); modelo não será reutilizado")
+            with self._lock:
+                self._discarded += 1
+            return
+
+        with self._lock:
+            idle = self._idle.setdefault(device_id, [])
+            if len(idle) >= self.max_idle_per_device:
+                self._discarded += 1
+                return
+            idle.append(model)
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do pool.
+
+        :return: Dicionário com modelos carregados, reutilizados, descartados e ociosos.
+        """
+        with self._lock:
+            return {
+                'created': self._created,
+                'reused': self._reused,
+                'discarded': self._discarded,
+                'idle': sum(len(models) for models in self._idle.values()),
+            }
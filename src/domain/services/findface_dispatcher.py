@@ -0,0 +1,672 @@
+"""
+Dispatchers de envio de eventos para o FindFace.
+Consomem a fila global de melhores faces alimentada por todas as câmeras.
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Full, Queue
+from threading import Event as ThreadEvent, Lock, Thread
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.domain.adapters.findface_adapter import FindfaceAdapter
+from src.domain.entities import EventPayload
+from src.domain.repositories import FindfaceOutboxRepository
+from src.domain.services.findface_priority_queue import FindfacePriorityQueue
+from src.domain.services.adaptive_concurrency_limiter import AdaptiveConcurrencyLimiter
+from src.domain.services.track_metadata_log import TrackMetadataLog
+from src.infrastructure.clients import AsyncFindfaceMulti
+
+
+class FindfaceDispatcher(ABC):
+    """
+    Interface comum dos dispatchers FindFace.
+
+    Expõe a mesma interface de enfileiramento de ``queue.Queue`` usada pelo
+    ByteTrackDetectorService (``put_nowait``, ``qsize`` e ``maxsize``). Os itens
+    têm o formato ``(camera_id, camera_name, track_id, payload, total_events)``,
+    onde ``payload`` é o EventPayload do melhor evento do track.
+
+    Com um outbox configurado, eventos que não cabem na fila ou cujo envio falha
+    por erro transitório são persistidos e reenviados (com limite de taxa) quando
+    o FindFace volta a responder.
+
+    O outbox é um transbordo, não um log de escrita antecipada: gravar cada evento
+    em disco antes de aceitá-lo bloquearia a thread de captura no fsync. Garantias:
+    - encerramento gracioso (``stop()``): a fila em memória é drenada para o outbox;
+    - queda do processo: os eventos ainda na fila em memória (até ``maxsize``) e os
+      envios em andamento são perdidos; apenas os já transbordados sobrevivem.
+    """
+
+    def __init__(
+        self,
+        findface_adapter: FindfaceAdapter,
+        queue_size: int = 500,
+        outbox: Optional[FindfaceOutboxRepository] = None,
+        replay_rate: float = 5.0,
+        dispatch_queue: Optional[Any] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        metadata_log: Optional[TrackMetadataLog] = None
+    ):
+        """
+        :param findface_adapter: Adapter FindFace usado para montar e enviar os eventos.
+        :param queue_size: Tamanho máximo da fila FIFO padrão (ignorado se dispatch_queue for informada).
+        :param outbox: Outbox durável para eventos não entregues (opcional).
+        :param replay_rate: Máximo de eventos reenviados do outbox por segundo.
+        :param dispatch_queue: Fila de envio com interface de queue.Queue
+                               (ex.: FindfacePriorityQueue). Padrão: FIFO ``Queue(queue_size)``.
+        :param limiter: Limitador adaptativo de envios simultâneos (opcional). Sem ele, a
+                        concorrência é fixa (número de workers ou max_in_flight).
+        :param metadata_log: Registro colunar onde o resultado e a latência de cada envio
+                             são gravados (opcional).
+        :raises TypeError: Se findface_adapter ou outbox forem de tipo inválido.
+        """
+        if not isinstance(findface_adapter, FindfaceAdapter):
+            raise TypeError(
+                f"findface_adapter deve ser FindfaceAdapter, recebido: {type(findface_adapter).__name__}"
+            )
+        if outbox is not None and not isinstance(outbox, FindfaceOutboxRepository):
+            raise TypeError(
+                f"outbox deve ser FindfaceOutboxRepository, recebido: {type(outbox).__name__}"
+            )
+
+        self.findface_adapter = findface_adapter
+        self.outbox = outbox
+        self.limiter = limiter
+        self.metadata_log = metadata_log
+        self.replay_rate = max(0.1, replay_rate)
+        self._queue = dispatch_queue if dispatch_queue is not None else Queue(maxsize=queue_size)
+        self._running = False
+        self._stats_lock = Lock()
+        self._sent = 0
+        self._failed = 0
+        self._spilled = 0
+        self._replayed = 0
+        self._replay_stop = ThreadEvent()
+        self._replay_thread: Optional[Thread] = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # Eventos descartados pela fila priorizada vão para o outbox em vez de serem perdidos
+        if self.outbox is not None and isinstance(self._queue, FindfacePriorityQueue):
+            self._queue.on_evict = self._spill_evicted
+
+    def put_nowait(self, item: Tuple[int, str, int, EventPayload, int]) -> None:
+        """
+        Enfileira um evento sem bloquear.
+        Com outbox, a fila cheia desvia o evento para o disco em vez de descartá-lo.
+
+        :param item: Tupla (camera_id, camera_name, track_id, payload, total_events).
+        :raises queue.Full: Se a fila (e o outbox, quando configurado) estiver cheia.
+        """
+        try:
+            self._queue.put_nowait(item)
+        except Full:
+            if self.outbox is None:
+                raise
+            payload = item[3]
+            # A codificação do evento é feita pela thread de gravação do outbox
+            if not self._spill(item, lambda: self.findface_adapter.build_face_event_request(payload.event, payload)):
+                raise
+
+    def qsize(self) -> int:
+        """Retorna o número aproximado de eventos pendentes."""
+        return self._queue.qsize()
+
+    @property
+    def maxsize(self) -> int:
+        """Tamanho máximo da fila."""
+        return self._queue.maxsize
+
+    @staticmethod
+    def _metadata(item: Tuple[int, str, int, EventPayload, int]) -> Dict[str, Any]:
+        """Extrai os metadados serializáveis de um item da fila."""
+        camera_id, camera_name, track_id, payload, total_events = item
+        return {
+            'camera_id': camera_id,
+            'camera_name': camera_name,
+            'track_id': track_id,
+            'total_events': total_events,
+            'quality': payload.event.face_quality_score.value(),
+        }
+
+    def _spill(self, item: Tuple[int, str, int, EventPayload, int], request) -> bool:
+        """
+        Persiste um evento no outbox para reenvio posterior.
+
+        :param item: Item da fila.
+        :param request: Requisição já montada ou função que a constrói.
+        :return: True se o outbox aceitou o evento.
+        """
+        if self.outbox is None or not self.outbox.append(self._metadata(item), request):
+            return False
+        with self._stats_lock:
+            self._spilled += 1
+        return True
+
+    def _spill_evicted(self, item) -> None:
+        """Callback da fila priorizada: guarda no outbox o evento descartado por falta de espaço."""
+        if item is None:
+            return
+        payload = item[3]
+        if not self._spill(item, lambda: self.findface_adapter.build_face_event_request(payload.event, payload)):
+            raise Full("Outbox FindFace saturado")
+
+    def _outcome(self, error: Optional[Exception]) -> str:
+        """Classifica o resultado de um envio para o limitador de concorrência."""
+        if error is None:
+            return AdaptiveConcurrencyLimiter.OUTCOME_SUCCESS
+        if self.findface_adapter.is_retryable_error(error):
+            return AdaptiveConcurrencyLimiter.OUTCOME_OVERLOAD
+        return AdaptiveConcurrencyLimiter.OUTCOME_ERROR
+
+    def _handle_send_failure(self, item, request: Optional[Dict[str, Any]], error: Exception) -> None:
+        """
+        Registra a falha de envio e, se transitória, persiste o evento no outbox.
+
+        :param item: Item da fila cujo envio falhou.
+        :param request: Requisição montada (None se a falha ocorreu na montagem).
+        :param error: Exceção levantada.
+        """
+        self._record_result(False)
+        self.findface_adapter.log_send_error(item[3].event, error)
+        if request is not None and self.findface_adapter.is_retryable_error(error):
+            if self._spill(item, request):
+                self.logger.info(
+                    f"FindFace - Track {item[2]} da câmera {item[1]} guardado no outbox para reenvio"
+                )
+
+    def _start_replay(self) -> None:
+        """Inicia a thread de reenvio do outbox, se configurado."""
+        if self.outbox is None:
+            return
+        self._replay_stop.clear()
+        self._replay_thread = Thread(target=self._replay_worker, name="FindFaceOutbox-Replay", daemon=True)
+        self._replay_thread.start()
+
+    def _stop_replay(self) -> None:
+        """Para a thread de reenvio do outbox."""
+        if self._replay_thread is None:
+            return
+        self._replay_stop.set()
+        self._replay_thread.join(timeout=5.0)
+        self._replay_thread = None
+
+    def _drain_to_outbox(self) -> None:
+        """Persiste no outbox os eventos ainda na fila ao encerrar (não são perdidos no shutdown)."""
+        if self.outbox is None:
+            return
+
+        drained = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                break
+            self._queue.task_done()
+            if item is None:
+                continue
+            payload = item[3]
+            if self._spill(item, lambda p=payload: self.findface_adapter.build_face_event_request(p.event, p)):
+                drained += 1
+
+        if drained:
+            self.logger.info(f"{drained} evento(s) pendente(s) guardado(s) no outbox FindFace")
+
+    def _replay_worker(self) -> None:
+        """
+        Reenvia eventos do outbox respeitando replay_rate (eventos/s).
+        Em falha transitória, aguarda antes de tentar novamente (FindFace ainda indisponível).
+        """
+        interval = 1.0 / self.replay_rate
+        backoff = 5.0
+        self.logger.info(f"Replay do outbox FindFace iniciado (máx. {self.replay_rate:.1f} eventos/s)")
+
+        while not self._replay_stop.is_set():
+            try:
+                records = self.outbox.fetch(limit=32)
+            except Exception as e:
+                self.logger.error(f"Erro ao ler outbox FindFace: {e}")
+                records = []
+
+            if not records:
+                self._replay_stop.wait(1.0)
+                continue
+
+            for record_id, metadata, request in records:
+                if self._replay_stop.is_set():
+                    break
+
+                started = time.monotonic()
+                try:
+                    self.findface_adapter.findface.add_face_event(**request)
+                except Exception as e:
+                    if self.findface_adapter.is_retryable_error(e):
+                        self.logger.warning(
+                            f"FindFace indisponível para reenvio ({self.outbox.count()} no outbox): {e}. "
+                            f"Nova tentativa em {backoff:.0f}s"
+                        )
+                        self._replay_stop.wait(backoff)
+                        break
+                    # Rejeição definitiva: não adianta reenviar
+                    self.logger.error(
+                        f"✗ FindFace - Reenvio REJEITADO - Camera {metadata.get('camera_name')} "
+                        f"Track {metadata.get('track_id')}: {e}"
+                    )
+                else:
+                    with self._stats_lock:
+                        self._replayed += 1
+                    self.logger.info(
+                        f"✓ FindFace - Track {metadata.get('track_id')} reenviado do outbox! "
+                        f"Camera: {metadata.get('camera_name')} (ID: {metadata.get('camera_id')})"
+                    )
+
+                self.outbox.ack([record_id])
+                # Limite de taxa do reenvio
+                self._replay_stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+        self.logger.info("Replay do outbox FindFace finalizado")
+
+    def _record_dispatch(self, item, success: bool, latency: Optional[float], error: Optional[Exception]) -> None:
+        """Registra o resultado do envio no registro colunar (se configurado)."""
+        if self.metadata_log is None:
+            return
+        camera_id, _, track_id, _, total_events = item
+        self.metadata_log.record_dispatch(camera_id, track_id, total_events, success, latency, error)
+
+    def _record_result(self, success: bool) -> None:
+        """Atualiza os contadores de envio."""
+        with self._stats_lock:
+            if success:
+                self._sent += 1
+            else:
+                self._failed += 1
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do dispatcher.
+
+        :return: Dicionário com eventos enviados, falhas, tamanho da fila e contadores do outbox.
+        """
+        with self._stats_lock:
+            stats = {
+                'sent': self._sent,
+                'failed': self._failed,
+                'queue_size': self._queue.qsize(),
+                'spilled': self._spilled,
+                'replayed': self._replayed,
+            }
+        stats['outbox_pending'] = self.outbox.count() if self.outbox is not None else 0
+        if hasattr(self._queue, 'get_stats'):
+            stats['queue'] = self._queue.get_stats()
+        if self.limiter is not None:
+            stats['concurrency'] = self.limiter.get_stats()
+        return stats
+
+    def is_running(self) -> bool:
+        """Verifica se o dispatcher está rodando."""
+        return self._running
+
+    @abstractmethod
+    def start(self) -> None:
+        """Inicia o consumo da fila."""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Para o consumo da fila graciosamente."""
+
+
+class FindfaceThreadDispatcher(FindfaceDispatcher):
+    """
+    Dispatcher baseado em um pool de threads bloqueantes.
+    Cada worker envia um evento por vez usando o cliente HTTP síncrono.
+    """
+
+    def __init__(
+        self,
+        findface_adapter: FindfaceAdapter,
+        num_workers: int = 4,
+        queue_size: int = 500,
+        outbox: Optional[FindfaceOutboxRepository] = None,
+        replay_rate: float = 5.0,
+        dispatch_queue: Optional[Any] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        metadata_log: Optional[TrackMetadataLog] = None
+    ):
+        """
+        :param findface_adapter: Adapter FindFace usado para enviar os eventos.
+        :param num_workers: Número de threads de envio (teto de concorrência com limiter).
+        :param queue_size: Tamanho máximo da fila FIFO padrão.
+        :param outbox: Outbox durável para eventos não entregues (opcional).
+        :param replay_rate: Máximo de eventos reenviados do outbox por segundo.
+        :param dispatch_queue: Fila de envio alternativa (opcional).
+        :param limiter: Limitador adaptativo de envios simultâneos (opcional).
+        :param metadata_log: Registro colunar dos resultados de envio (opcional).
+        """
+        super().__init__(findface_adapter, queue_size, outbox, replay_rate, dispatch_queue, limiter, metadata_log)
+        self.num_workers = max(1, num_workers)
+        self._workers: List[Thread] = []
+
+    def start(self) -> None:
+        """Cria e inicia o pool de workers."""
+        if self._running:
+            return
+
+        self._running = True
+        for i in range(self.num_workers):
+            worker_thread = Thread(
+                target=self._worker,
+                args=(i + 1,),
+                name=f"FindFaceWorker-{i + 1}",
+                daemon=True
+            )
+            worker_thread.start()
+            self._workers.append(worker_thread)
+
+        self._start_replay()
+        self.logger.info(f"Pool de {self.num_workers} workers FindFace iniciado")
+
+    def _worker(self, worker_id: int) -> None:
+        """Worker FindFace que processa eventos de todas as câmeras."""
+        worker_logger = logging.getLogger(f"FindFaceWorker-{worker_id}")
+        worker_logger.info(f"Worker {worker_id} iniciado")
+
+        while self._running:
+            # Com limitador adaptativo, só retira da fila quando há vaga de concorrência
+            if self.limiter is not None and not self.limiter.acquire(timeout=0.5):
+                continue
+
+            try:
+                event_data = self._queue.get(timeout=0.5)
+            except Empty:
+                if self.limiter is not None:
+                    self.limiter.release()
+                continue
+
+            if event_data is None:  # Sinal de parada
+                worker_logger.info(f"Worker {worker_id} recebeu sinal de parada")
+                if self.limiter is not None:
+                    self.limiter.release()
+                self._queue.task_done()
+                break
+
+            camera_id, camera_name, track_id, payload, total_events = event_data
+            request = None
+            error = None
+            started = None
+            latency = None
+            resposta = None
+
+            try:
+                request = self.findface_adapter.build_face_event_request(payload.event, payload)
+                started = time.monotonic()
+                resposta = self.findface_adapter.findface.add_face_event(**request)
+                latency = time.monotonic() - started
+                self._record_result(bool(resposta))
+
+                if resposta:
+                    worker_logger.info(
+                        f"✓ FindFace - Melhor face do Track {track_id} enviada com sucesso! "
+                        f"Camera: {camera_name} (ID: {camera_id}) | Total de eventos: {total_events}"
+                    )
+            except Exception as e:
+                if started is not None:
+                    latency = time.monotonic() - started
+                error = e
+                self._handle_send_failure(event_data, request, e)
+            finally:
+                if self.limiter is not None:
+                    self.limiter.release(latency, self._outcome(error))
+                self._record_dispatch(event_data, bool(resposta), latency, error)
+                self._queue.task_done()
+
+        worker_logger.info(f"Worker {worker_id} finalizado")
+
+    def stop(self) -> None:
+        """Sinaliza a parada e aguarda os workers finalizarem."""
+        if not self._running:
+            return
+
+        self.logger.info("Finalizando pool de workers FindFace...")
+        self._running = False
+        self._stop_replay()
+
+        # Envia sinais de parada para todos os workers
+        for _ in self._workers:
+            try:
+                self._queue.put(None, timeout=0.5)
+            except Exception:
+                pass
+
+        for i, worker in enumerate(self._workers, 1):
+            worker.join(timeout=2.0)
+            if worker.is_alive():
+                self.logger.warning(f"FindFace worker {i}/{self.num_workers} não finalizou no tempo esperado")
+            else:
+                self.logger.info(f"FindFace worker {i}/{self.num_workers} finalizado")
+
+        self._workers.clear()
+        self._drain_to_outbox()
+        self.logger.info("✓ Pool de workers FindFace finalizado")
+
+
+class FindfaceAsyncDispatcher(FindfaceDispatcher):
+    """
+    Dispatcher assíncrono baseado em asyncio + aiohttp.
+
+    Um único event loop (em thread própria) mantém até ``max_in_flight`` envios
+    simultâneos. A codificação JPEG é feita em um pequeno pool de threads para
+    não bloquear o loop; a espera pela resposta HTTP não ocupa nenhuma thread.
+    """
+
+    def __init__(
+        self,
+        findface_adapter: FindfaceAdapter,
+        max_in_flight: int = 64,
+        encoder_workers: int = 2,
+        queue_size: int = 500,
+        outbox: Optional[FindfaceOutboxRepository] = None,
+        replay_rate: float = 5.0,
+        dispatch_queue: Optional[Any] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        metadata_log: Optional[TrackMetadataLog] = None
+    ):
+        """
+        :param findface_adapter: Adapter FindFace usado para montar os eventos.
+        :param max_in_flight: Máximo de requisições HTTP simultâneas (teto com limiter).
+        :param encoder_workers: Threads dedicadas à codificação JPEG dos eventos.
+        :param queue_size: Tamanho máximo da fila FIFO padrão.
+        :param outbox: Outbox durável para eventos não entregues (opcional).
+        :param replay_rate: Máximo de eventos reenviados do outbox por segundo.
+        :param dispatch_queue: Fila de envio alternativa (opcional).
+        :param limiter: Limitador adaptativo de envios simultâneos (opcional).
+        :param metadata_log: Registro colunar dos resultados de envio (opcional).
+        :raises RuntimeError: Se aiohttp não estiver instalado.
+        :raises ValueError: Se max_in_flight for menor que 1.
+        """
+        if not AsyncFindfaceMulti.is_available():
+            raise RuntimeError("aiohttp não está instalado. Instale com: pip install aiohttp")
+        super().__init__(findface_adapter, queue_size, outbox, replay_rate, dispatch_queue, limiter, metadata_log)
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight deve ser maior ou igual a 1")
+
+        self.max_in_flight = max_in_flight
+        self.encoder_workers = max(1, encoder_workers)
+        self._in_flight = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> None:
+        """Inicia o event loop de envio em uma thread dedicada."""
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = Thread(target=self._run_loop, name="FindFaceAsyncLoop", daemon=True)
+        self._thread.start()
+        self._start_replay()
+        self.logger.info(
+            f"Dispatcher FindFace assíncrono iniciado "
+            f"(máx. em voo: {self.max_in_flight}, encoders: {self.encoder_workers})"
+        )
+
+    def _run_loop(self) -> None:
+        """Executa o event loop até o dispatcher ser parado."""
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._main())
+        except Exception as e:
+            self.logger.error(f"Erro no loop do dispatcher FindFace: {e}", exc_info=True)
+        finally:
+            self._loop.close()
+            self.logger.info("Loop do dispatcher FindFace finalizado")
+
+    def _get_item(self):
+        """Lê o próximo item da fila (executado fora do event loop)."""
+        try:
+            return self._queue.get(timeout=0.2)
+        except Empty:
+            return None
+
+    async def _main(self) -> None:
+        """Bombeia a fila para tarefas de envio respeitando o limite de concorrência."""
+        loop = asyncio.get_running_loop()
+        client = AsyncFindfaceMulti(self.findface_adapter.findface, max_connections=self.max_in_flight)
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        slot_released = asyncio.Event()
+        tasks: Set[asyncio.Task] = set()
+
+        # Leitura da fila bloqueante e codificação JPEG ficam fora do event loop
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="FindFaceReader") as reader, \
+                ThreadPoolExecutor(max_workers=self.encoder_workers, thread_name_prefix="FindFaceEncoder") as encoder:
+            try:
+                while self._running:
+                    # Só retira da fila quando há vaga para uma nova requisição
+                    await self._acquire_slot(semaphore, slot_released)
+                    event_data = await loop.run_in_executor(reader, self._get_item)
+                    if event_data is None:
+                        self._release_slot(semaphore, slot_released)
+                        continue
+
+                    task = loop.create_task(self._dispatch(client, encoder, semaphore, slot_released, event_data))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                # Aguarda envios em andamento antes de fechar a sessão; os que não terminam
+                # no prazo são cancelados e seus eventos vão para o outbox (ou contam como falha)
+                if tasks:
+                    _, pending = await asyncio.wait(tasks, timeout=5.0)
+                    if pending:
+                        self.logger.warning(
+                            f"{len(pending)} envio(s) FindFace não terminaram no encerramento; cancelando"
+                        )
+                        for task in pending:
+                            task.cancel()
+                        await asyncio.gather(*pending, return_exceptions=True)
+            finally:
+                await client.close()
+
+    async def _acquire_slot(self, semaphore: asyncio.Semaphore, slot_released: asyncio.Event) -> None:
+        """Aguarda uma vaga de envio (teto fixo e, se configurado, limite adaptativo)."""
+        await semaphore.acquire()
+        if self.limiter is None:
+            return
+        # Executado apenas no event loop: não há corrida entre try_acquire e clear
+        while not self.limiter.try_acquire():
+            slot_released.clear()
+            await slot_released.wait()
+
+    def _release_slot(self, semaphore: asyncio.Semaphore, slot_released: asyncio.Event,
+                      latency: Optional[float] = None, error: Optional[Exception] = None) -> None:
+        """Libera a vaga de envio, alimentando o limitador com a amostra da requisição."""
+        if self.limiter is not None:
+            self.limiter.release(latency, self._outcome(error))
+            slot_released.set()
+        semaphore.release()
+
+    async def _dispatch(self, client: AsyncFindfaceMulti, encoder: ThreadPoolExecutor,
+                        semaphore: asyncio.Semaphore, slot_released: asyncio.Event, event_data) -> None:
+        """Monta e envia um evento ao FindFace."""
+        camera_id, camera_name, track_id, payload, total_events = event_data
+        request = None
+        error = None
+        started = None
+        latency = None
+        resposta = None
+        self._in_flight += 1
+        try:
+            request = await asyncio.get_running_loop().run_in_executor(
+                encoder, self.findface_adapter.build_face_event_request, payload.event, payload
+            )
+            started = time.monotonic()
+            resposta = await client.add_face_event(**request)
+            latency = time.monotonic() - started
+            self._record_result(bool(resposta))
+
+            if resposta:
+                self.logger.info(
+                    f"✓ FindFace - Melhor face do Track {track_id} enviada com sucesso! "
+                    f"Camera: {camera_name} (ID: {camera_id}) | Total de eventos: {total_events}"
+                )
+        except asyncio.CancelledError as e:
+            error = e
+            self._abandon(event_data, request)
+            raise
+        except Exception as e:
+            if started is not None:
+                latency = time.monotonic() - started
+            error = e
+            self._handle_send_failure(event_data, request, e)
+        finally:
+            self._in_flight -= 1
+            self._release_slot(semaphore, slot_released, latency, error)
+            self._record_dispatch(event_data, bool(resposta), latency, error)
+            self._queue.task_done()
+
+    def _abandon(self, item, request: Optional[Dict[str, Any]]) -> None:
+        """
+        Trata um envio cancelado no encerramento: conta como falha e guarda o evento no
+        outbox (o FindFace pode já tê-lo recebido; o reenvio prefere duplicar a perder).
+
+        :param item: Item da fila cujo envio foi cancelado.
+        :param request: Requisição montada (None se cancelado durante a montagem).
+        """
+        self._record_result(False)
+        payload = item[3]
+        if request is None:
+            request = lambda: self.findface_adapter.build_face_event_request(payload.event, payload)
+        if self._spill(item, request):
+            self.logger.info(f"FindFace - Track {item[2]} da câmera {item[1]} cancelado; guardado no outbox")
+        else:
+            self.logger.warning(f"FindFace - Track {item[2]} da câmera {item[1]} cancelado no encerramento e perdido")
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do dispatcher.
+
+        :return: Dicionário com eventos enviados, falhas, tamanho da fila e requisições em voo.
+        """
+        stats = super().get_stats()
+        stats['in_flight'] = self._in_flight
+        return stats
+
+    def stop(self) -> None:
+        """Para o bombeamento da fila e aguarda os envios em andamento."""
+        if not self._running:
+            return
+
+        self.logger.info("Finalizando dispatcher FindFace assíncrono...")
+        self._running = False
+        self._stop_replay()
+
+        if self._thread is not None:
+            self._thread.join(timeout=7.0)
+            if self._thread.is_alive():
+                self.logger.warning("Dispatcher FindFace assíncrono não finalizou no tempo esperado")
+            else:
+                self.logger.info("✓ Dispatcher FindFace assíncrono finalizado")
+
+        self._drain_to_outbox()
@@ -0,0 +1,185 @@
+"""
+Fila de envio FindFace com escalonamento justo e ponderado entre câmeras.
+"""
+
+import bisect
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.domain.services.findface_priority_queue import FindfacePriorityQueue
+
+Entry = Tuple[float, int, float, Any]
+
+
+class FindfaceFairQueue(FindfacePriorityQueue):
+    """
+    Fila limitada com uma sub-fila por câmera e escalonamento WFQ (stride scheduling).
+
+    Cada câmera recebe uma fração dos envios proporcional ao seu peso; uma câmera
+    lotada não impede as demais de serem atendidas. A fila é conservativa em trabalho:
+    enquanto houver qualquer evento pendente, os workers são alimentados.
+
+    Dentro de cada câmera, os eventos são ordenados pelo valor (qualidade e idade),
+    como em FindfacePriorityQueue. Com a fila cheia, o descarte ocorre na câmera que
+    mais excede sua parcela justa (profundidade / peso); o limite por câmera descarta
+    o evento de menor valor da própria câmera.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 500,
+        age_weight: float = 0.005,
+        weights: Optional[Dict[int, float]] = None,
+        caps: Optional[Dict[int, int]] = None,
+        default_weight: float = 1.0,
+        default_cap: int = 0
+    ):
+        """
+        :param maxsize: Capacidade total da fila.
+        :param age_weight: Perda de valor por segundo de espera (ordenação dentro da câmera).
+        :param weights: Peso por camera_id (câmeras ausentes usam default_weight).
+        :param caps: Limite de eventos pendentes por camera_id (câmeras ausentes usam default_cap).
+        :param default_weight: Peso padrão das câmeras.
+        :param default_cap: Limite padrão por câmera (0 = apenas o limite total).
+        :raises ValueError: Se algum peso não for positivo.
+        """
+        super().__init__(maxsize=maxsize, age_weight=age_weight)
+
+        self.weights = dict(weights or {})
+        self.caps = dict(caps or {})
+        self.default_weight = default_weight
+        self.default_cap = default_cap
+        if default_weight <= 0 or any(w <= 0 for w in self.weights.values()):
+            raise ValueError("Pesos das câmeras devem ser maiores que 0")
+
+        self._control: List[Entry] = []  # Sinais de parada (None), atendidos primeiro
+        self._queues: Dict[int, List[Entry]] = {}
+        self._pass: Dict[int, float] = {}
+        self._virtual_time = 0.0
+
+        # Estatísticas por câmera
+        self._served: Dict[int, int] = {}
+        self._wait_total: Dict[int, float] = {}
+        self._wait_max: Dict[int, float] = {}
+        self._camera_evicted: Dict[int, int] = {}
+
+    def _weight(self, camera_id: int) -> float:
+        return self.weights.get(camera_id, self.default_weight)
+
+    def _cap(self, camera_id: int) -> int:
+        cap = self.caps.get(camera_id, self.default_cap)
+        return cap if cap > 0 else self.maxsize
+
+    @staticmethod
+    def _camera_of(entry: Entry) -> Optional[int]:
+        item = entry[3]
+        return None if item is None else item[0]
+
+    def _push(self, entry: Entry) -> None:
+        """Insere a entrada na sub-fila da câmera, ativando-a no escalonador se necessário."""
+        camera_id = self._camera_of(entry)
+        if camera_id is None:
+            self._control.append(entry)
+            return
+
+        queue = self._queues.get(camera_id)
+        if queue is None:
+            queue = []
+            self._queues[camera_id] = queue
+            # Câmera voltando a ficar ativa não acumula crédito do período ociosa
+            self._pass[camera_id] = max(self._pass.get(camera_id, 0.0), self._virtual_time)
+        bisect.insort(queue, entry)
+
+    def _pop_best(self) -> Entry:
+        """Atende a câmera ativa com menor passo virtual e retorna seu evento de maior valor."""
+        if self._control:
+            return self._control.pop(0)
+
+        camera_id = min(self._queues, key=lambda c: (self._pass[c], c))
+        queue = self._queues[camera_id]
+        entry = queue.pop()
+        if not queue:
+            del self._queues[camera_id]
+
+        self._virtual_time = self._pass[camera_id]
+        self._pass[camera_id] += 1.0 / self._weight(camera_id)
+        return entry
+
+    def _is_full_for(self, entry: Entry) -> bool:
+        if self._size >= self.maxsize:
+            return True
+        camera_id = self._camera_of(entry)
+        if camera_id is None:
+            return False
+        return len(self._queues.get(camera_id, ())) >= self._cap(camera_id)
+
+    def _eviction_candidate(self, entry: Entry) -> Optional[Entry]:
+        """
+        Escolhe o evento a descartar: na própria câmera se ela atingiu o limite;
+        caso contrário, na câmera que mais excede sua parcela justa.
+        """
+        incoming = self._camera_of(entry)
+        incoming_queue = self._queues.get(incoming, [])
+
+        if incoming is not None and len(incoming_queue) >= self._cap(incoming):
+            victim_camera = incoming
+        else:
+            def share(camera_id: int) -> float:
+                depth = len(self._queues.get(camera_id, ())) + (1 if camera_id == incoming else 0)
+                return depth / self._weight(camera_id)
+
+            candidates = list(self._queues)
+            if incoming is not None and incoming not in self._queues:
+                candidates.append(incoming)
+            if not candidates:
+                return None
+            victim_camera = max(candidates, key=share)
+
+        if victim_camera == incoming:
+            if not incoming_queue or incoming_queue[0][0] >= entry[0]:
+                return None
+            return incoming_queue[0]
+        return self._queues[victim_camera][0]
+
+    def _remove(self, entry: Entry) -> None:
+        camera_id = self._camera_of(entry)
+        queue = self._queues[camera_id]
+        del queue[bisect.bisect_left(queue, entry)]
+        if not queue:
+            del self._queues[camera_id]
+        self._camera_evicted[camera_id] = self._camera_evicted.get(camera_id, 0) + 1
+
+    def _on_dequeued(self, entry: Entry) -> None:
+        """Registra o tempo de espera do evento na fila da câmera."""
+        camera_id = self._camera_of(entry)
+        if camera_id is None:
+            return
+        wait = time.monotonic() - entry[2]
+        self._served[camera_id] = self._served.get(camera_id, 0) + 1
+        self._wait_total[camera_id] = self._wait_total.get(camera_id, 0.0) + wait
+        self._wait_max[camera_id] = max(self._wait_max.get(camera_id, 0.0), wait)
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas da fila, incluindo profundidade e espera por câmera.
+
+        :return: Dicionário com totais e ``per_camera`` (depth, weight, cap, served,
+                 evicted, avg_wait_ms, max_wait_ms).
+        """
+        stats = super().get_stats()
+        with self._not_empty:
+            cameras = set(self._queues) | set(self._served) | set(self._camera_evicted)
+            per_camera = {}
+            for camera_id in cameras:
+                served = self._served.get(camera_id, 0)
+                per_camera[camera_id] = {
+                    'depth': len(self._queues.get(camera_id, ())),
+                    'weight': self._weight(camera_id),
+                    'cap': self._cap(camera_id),
+                    'served': served,
+                    'evicted': self._camera_evicted.get(camera_id, 0),
+                    'avg_wait_ms': (self._wait_total.get(camera_id, 0.0) / served * 1000) if served else 0.0,
+                    'max_wait_ms': self._wait_max.get(camera_id, 0.0) * 1000,
+                }
+        stats['per_camera'] = per_camera
+        return stats
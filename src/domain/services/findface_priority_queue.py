@@ -0,0 +1,212 @@
+"""
+Fila de envio FindFace ordenada pelo valor do evento (qualidade da face e idade).
+"""
+
+import bisect
+import itertools
+import logging
+import time
+from queue import Empty, Full
+from threading import Condition
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class FindfacePriorityQueue:
+    """
+    Fila limitada com a mesma interface de ``queue.Queue`` usada pelos dispatchers
+    (``put_nowait``, ``put``, ``get``, ``get_nowait``, ``qsize``, ``maxsize``, ``task_done``).
+
+    O valor de um evento é ``quality - age_weight * idade_em_segundos``. Como todos os
+    eventos envelhecem na mesma taxa, a ordem relativa não muda com o tempo e pode ser
+    calculada uma única vez no enfileiramento (``quality + age_weight * t_enfileiramento``).
+
+    - ``get`` retorna sempre o evento de maior valor;
+    - com a fila cheia, o evento de menor valor é descartado (o próprio evento recebido,
+      se for ele o de menor valor, e nesse caso ``queue.Full`` é levantada).
+
+    Itens ``None`` (sinal de parada dos workers) têm prioridade máxima.
+    """
+
+    def __init__(self, maxsize: int = 500, age_weight: float = 0.005):
+        """
+        :param maxsize: Capacidade máxima da fila.
+        :param age_weight: Perda de valor por segundo de espera (em pontos de qualidade).
+        :raises ValueError: Se maxsize for menor que 1.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize deve ser maior ou igual a 1, recebido: {maxsize}")
+
+        self.maxsize = maxsize
+        self.age_weight = age_weight
+        # Chamado com cada item descartado para abrir espaço a um evento de maior valor
+        self.on_evict: Optional[Callable[[Any], None]] = None
+
+        self._entries: List[Tuple[float, int, float, Any]] = []  # (rank, seq, enqueued_at, item)
+        self._seq = itertools.count()
+        self._size = 0
+        self._unfinished_tasks = 0
+        self._evicted = 0
+        self._rejected = 0
+        self._not_empty = Condition()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def _rank(self, item: Any, now: float) -> float:
+        """Calcula a chave de ordenação do item (maior = mais valioso)."""
+        if item is None:
+            return float("inf")
+        quality = item[3].event.face_quality_score.value()
+        return quality + self.age_weight * now
+
+    # ------------------------------------------------------------------
+    # Armazenamento (sobrescrito por filas com outra organização interna)
+    # ------------------------------------------------------------------
+
+    def _push(self, entry: Tuple[float, int, float, Any]) -> None:
+        """Insere uma entrada mantendo a ordenação por valor."""
+        bisect.insort(self._entries, entry)
+
+    def _pop_best(self) -> Tuple[float, int, float, Any]:
+        """Remove e retorna a entrada de maior valor."""
+        return self._entries.pop()
+
+    def _eviction_candidate(self, entry: Tuple[float, int, float, Any]) -> Optional[Tuple[float, int, float, Any]]:
+        """
+        Retorna a entrada pendente a ser descartada para admitir ``entry``
+        (ou None se ``entry`` for a de menor valor).
+        """
+        lowest = self._entries[0]
+        return lowest if lowest[0] < entry[0] else None
+
+    def _remove(self, entry: Tuple[float, int, float, Any]) -> None:
+        """Remove uma entrada específica."""
+        index = bisect.bisect_left(self._entries, entry)
+        del self._entries[index]
+
+    def _is_full_for(self, entry: Tuple[float, int, float, Any]) -> bool:
+        """Indica se não há espaço para ``entry`` sem descartar outra entrada."""
+        return self._size >= self.maxsize
+
+    # ------------------------------------------------------------------
+    # Interface de queue.Queue
+    # ------------------------------------------------------------------
+
+    def put_nowait(self, item: Any) -> None:
+        """
+        Enfileira um item sem bloquear, descartando o de menor valor se a fila estiver cheia.
+
+        :param item: Tupla (camera_id, camera_name, track_id, payload, total_events) ou None.
+        :raises queue.Full: Se o item recebido for o de menor valor com a fila cheia.
+        """
+        now = time.monotonic()
+        entry = (self._rank(item, now), next(self._seq), now, item)
+        evicted = None
+
+        with self._not_empty:
+            if self._is_full_for(entry):
+                evicted = self._eviction_candidate(entry)
+                if evicted is None:
+                    self._rejected += 1
+                    raise Full
+                self._remove(evicted)
+                self._size -= 1
+                self._unfinished_tasks -= 1
+                self._evicted += 1
+
+            self._push(entry)
+            self._size += 1
+            self._unfinished_tasks += 1
+            self._not_empty.notify()
+
+        if evicted is not None:
+            self._handle_evicted(evicted[3])
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Enfileira um item. Nunca bloqueia: com a fila cheia, aplica a política de descarte.
+
+        :raises queue.Full: Se o item recebido for o de menor valor com a fila cheia.
+        """
+        self.put_nowait(item)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """
+        Remove e retorna o item de maior valor.
+
+        :param block: Se deve aguardar um item.
+        :param timeout: Tempo máximo de espera em segundos (None = indefinido).
+        :raises queue.Empty: Se não houver item no tempo especificado.
+        """
+        with self._not_empty:
+            if not block:
+                if self._size == 0:
+                    raise Empty
+            elif timeout is None:
+                while self._size == 0:
+                    self._not_empty.wait()
+            else:
+                deadline = time.monotonic() + timeout
+                while self._size == 0:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Empty
+                    self._not_empty.wait(remaining)
+
+            entry = self._pop_best()
+            self._size -= 1
+            self._on_dequeued(entry)
+            return entry[3]
+
+    def get_nowait(self) -> Any:
+        """Remove e retorna o item de maior valor sem bloquear."""
+        return self.get(block=False)
+
+    def _on_dequeued(self, entry: Tuple[float, int, float, Any]) -> None:
+        """Gancho chamado (com o lock adquirido) quando uma entrada é entregue a um worker."""
+
+    def task_done(self) -> None:
+        """Indica que um item retirado da fila foi processado."""
+        with self._not_empty:
+            if self._unfinished_tasks > 0:
+                self._unfinished_tasks -= 1
+
+    def qsize(self) -> int:
+        """Retorna o número de itens pendentes."""
+        with self._not_empty:
+            return self._size
+
+    def empty(self) -> bool:
+        """Indica se a fila está vazia."""
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        """Indica se a fila atingiu a capacidade máxima."""
+        return self.qsize() >= self.maxsize
+
+    def _handle_evicted(self, item: Any) -> None:
+        """Entrega o item descartado ao callback (ex.: outbox) ou registra o descarte."""
+        if self.on_evict is not None:
+            try:
+                self.on_evict(item)
+                return
+            except Exception as e:
+                self.logger.error(f"Erro ao tratar evento descartado da fila: {e}")
+
+        if item is not None:
+            camera_id, camera_name, track_id, payload, _ = item
+            self.logger.warning(
+                f"⚠ FindFace - Fila CHEIA - Track {track_id} (Camera {camera_name}) DESCARTADO "
+                f"em favor de evento de maior valor: quality={payload.event.face_quality_score.value():.4f}"
+            )
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas da fila.
+
+        :return: Dicionário com tamanho, descartes por evicção e rejeições.
+        """
+        with self._not_empty:
+            return {
+                'size': self._size,
+                'evicted': self._evicted,
+                'rejected': self._rejected,
+            }
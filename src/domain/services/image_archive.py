@@ -0,0 +1,260 @@
+"""
+Arquivo de imagens em segmentos append-only com índice compacto.
+Substitui milhões de arquivos pequenos por gravações sequenciais em poucos arquivos grandes.
+"""
+
+import logging
+import os
+import re
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import BinaryIO, Iterator, List, Optional
+
+
+@dataclass(frozen=True)
+class ArchiveRecord:
+    """Entrada do índice: posição da imagem no segmento e seus metadados."""
+    segment: int
+    offset: int
+    length: int
+    camera_id: Optional[int]
+    track_id: Optional[int]
+    timestamp: float
+
+
+class ImageArchive:
+    """
+    Grava imagens codificadas (JPEG) concatenadas em segmentos ``segment-NNNNNNNN.dat``,
+    cada um com um índice ``segment-NNNNNNNN.idx`` de registros binários de tamanho fixo
+    (offset, tamanho, câmera, track, timestamp).
+
+    - as gravações são sequenciais e bufferizadas; uma thread descarrega os buffers a
+      cada ``flush_interval`` segundos (também com a câmera ociosa) e ao
+      rotacionar/fechar o segmento;
+    - o segmento é rotacionado ao atingir ``segment_bytes``; com ``max_segments`` > 0,
+      os segmentos mais antigos (dados + índice) são removidos na rotação;
+    - a cada inicialização um novo segmento é aberto (segmentos anteriores nunca são
+      reabertos para escrita);
+    - registros do índice que apontam além do fim dos dados (ex.: queda do processo
+      antes do flush) são ignorados na leitura.
+
+    Seguro para uso por várias threads de gravação (append serializado por lock).
+    """
+
+    # offset (u64), tamanho (u32), câmera (i32), track (i64), timestamp (f64)
+    INDEX_RECORD = struct.Struct("<QIiqd")
+    SEGMENT_PATTERN = re.compile(r"^segment-(\d{8})\.dat$")
+
+    def __init__(
+        self,
+        root: str,
+        segment_bytes: int = 256 * 1024 * 1024,
+        max_segments: int = 0,
+        flush_interval: float = 1.0
+    ):
+        """
+        Inicializa o arquivo de imagens.
+
+        :param root: Diretório dos segmentos.
+        :param segment_bytes: Tamanho (bytes) a partir do qual o segmento é rotacionado.
+        :param max_segments: Máximo de segmentos mantidos em disco (0 = sem limite).
+        :param flush_interval: Intervalo máximo (s) com dados apenas em buffer.
+        """
+        self.root = Path(root)
+        self.segment_bytes = max(1, segment_bytes)
+        self.max_segments = max(0, max_segments)
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._lock = Lock()
+        self._segment = max(self.segments(), default=0)
+        self._data: Optional[BinaryIO] = None
+        self._index: Optional[BinaryIO] = None
+        self._size = 0
+        self._dirty = False
+        self._closed = False
+
+        # Estatísticas
+        self._appended = 0
+        self._appended_bytes = 0
+        self._rotations = 0
+
+        # Descarga periódica: dados em buffer não esperam o próximo append
+        self._stop_event = Event()
+        self._flush_thread = Thread(target=self._flush_loop, name="ImageArchiveFlush", daemon=True)
+        self._flush_thread.start()
+
+    def _flush_loop(self) -> None:
+        """Descarrega os buffers a cada flush_interval segundos até o fechamento."""
+        while not self._stop_event.wait(self.flush_interval):
+            with self._lock:
+                if self._dirty and self._data is not None:
+                    try:
+                        self._flush()
+                    except OSError as e:
+                        self.logger.error(f"Erro ao descarregar o segmento {self._segment}: {e}")
+
+    def append(
+        self,
+        data: bytes,
+        camera_id: Optional[int] = None,
+        track_id: Optional[int] = None,
+        timestamp: Optional[float] = None
+    ) -> ArchiveRecord:
+        """
+        Acrescenta uma imagem codificada ao segmento atual.
+
+        :param data: Bytes da imagem.
+        :param camera_id: Câmera de origem.
+        :param track_id: Track de origem.
+        :param timestamp: Instante da imagem (epoch); padrão: agora.
+        :return: Registro do índice da imagem gravada.
+        :raises ValueError: Se o arquivo já foi fechado.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            if self._closed:
+                raise ValueError("arquivo de imagens fechado")
+            if self._data is None or (self._size and self._size + len(data) > self.segment_bytes):
+                self._rotate()
+
+            record = ArchiveRecord(self._segment, self._size, len(data), camera_id, track_id, timestamp)
+            self._data.write(data)
+            self._index.write(self.INDEX_RECORD.pack(
+                record.offset,
+                record.length,
+                -1 if camera_id is None else camera_id,
+                -1 if track_id is None else track_id,
+                timestamp
+            ))
+            self._size += len(data)
+            self._appended += 1
+            self._appended_bytes += len(data)
+            self._dirty = True
+        return record
+
+    def _flush(self) -> None:
+        """Descarrega os buffers (dados antes do índice)."""
+        self._data.flush()
+        self._index.flush()
+        self._dirty = False
+
+    def _close_segment(self) -> None:
+        """Fecha o segmento atual."""
+        if self._data is None:
+            return
+        self._flush()
+        self._data.close()
+        self._index.close()
+        self._data = self._index = None
+
+    def _rotate(self) -> None:
+        """Fecha o segmento atual, abre o próximo e remove os excedentes."""
+        self._close_segment()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._segment += 1
+        self._data = open(self._path(self._segment, ".dat"), 'ab', buffering=1024 * 1024)
+        self._index = open(self._path(self._segment, ".idx"), 'ab', buffering=64 * 1024)
+        self._size = 0
+        self._rotations += 1
+
+        if self.max_segments:
+            for segment in self.segments()[:-self.max_segments]:
+                for suffix in (".dat", ".idx"):
+                    try:
+                        os.remove(self._path(segment, suffix))
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        self.logger.warning(f"Não foi possível remover o segmento {segment}: {e}")
+
+    def _path(self, segment: int, suffix: str) -> Path:
+        """Caminho do arquivo de dados ou de índice de um segmento."""
+        return self.root / f"segment-{segment:08d}{suffix}"
+
+    def segments(self) -> List[int]:
+        """
+        Lista os segmentos existentes em disco.
+
+        :return: Números dos segmentos em ordem crescente.
+        """
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            int(match.group(1))
+            for match in map(self.SEGMENT_PATTERN.match, names)
+            if match
+        )
+
+    def records(self, segment: int) -> Iterator[ArchiveRecord]:
+        """
+        Lê o índice de um segmento.
+
+        :param segment: Número do segmento.
+        :return: Iterador de registros cujos dados estão completos em disco.
+        """
+        with self._lock:
+            if segment == self._segment and self._data is not None:
+                self._flush()
+        try:
+            data_size = os.path.getsize(self._path(segment, ".dat"))
+            with open(self._path(segment, ".idx"), 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return
+
+        usable = len(raw) - len(raw) % self.INDEX_RECORD.size
+        for offset, length, camera_id, track_id, timestamp in self.INDEX_RECORD.iter_unpack(raw[:usable]):
+            if offset + length > data_size:
+                break
+            yield ArchiveRecord(
+                segment,
+                offset,
+                length,
+                None if camera_id < 0 else camera_id,
+                None if track_id < 0 else track_id,
+                timestamp
+            )
+
+    def read(self, record: ArchiveRecord) -> bytes:
+        """
+        Lê os bytes de uma imagem do arquivo.
+
+        :param record: Registro obtido de ``append()`` ou ``records()``.
+        :return: Bytes da imagem.
+        """
+        with self._lock:
+            if record.segment == self._segment and self._data is not None:
+                self._flush()
+        with open(self._path(record.segment, ".dat"), 'rb') as f:
+            f.seek(record.offset)
+            return f.read(record.length)
+
+    def close(self) -> None:
+        """Descarrega e fecha o segmento atual."""
+        self._stop_event.set()
+        self._flush_thread.join(timeout=5)
+        with self._lock:
+            self._close_segment()
+            self._closed = True
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do arquivo.
+
+        :return: Dicionário com imagens e bytes acrescentados, segmento atual, seu
+                 tamanho e número de rotações.
+        """
+        with self._lock:
+            return {
+                'appended': self._appended,
+                'appended_bytes': self._appended_bytes,
+                'segment': self._segment,
+                'segment_bytes': self._size,
+                'rotations': self._rotations,
+            }
@@ -0,0 +1,223 @@
+"""
+Serviço de domínio para retenção das imagens salvas em disco.
+Aplica, por câmera, cota de bytes e idade máxima em segundo plano.
+"""
+
+import logging
+import os
+import re
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+
+class ImageRetentionService:
+    """
+    Mantém um índice (por câmera, em ordem de gravação) das imagens salvas e remove
+    as mais antigas quando a câmera excede a cota de bytes ou a idade máxima.
+
+    - Na inicialização, uma thread de fundo indexa as imagens já existentes (o
+      diretório não é mais apagado no boot; imagens antigas saem pela retenção);
+    - imagens novas entram no índice via ``add()`` (chamado pelo ImageSaveService
+      após gravar), sem varrer o disco novamente;
+    - a cada ``interval`` segundos a cota e a idade são aplicadas.
+    """
+
+    # Câmera extraída do nome do arquivo: "..._Camera-{id}-{nome}_Track_..."
+    CAMERA_PATTERN = re.compile(r"_Camera-(\d+)-")
+
+    def __init__(
+        self,
+        root: str,
+        max_bytes_per_camera: int = 0,
+        max_age: float = 0.0,
+        interval: float = 60.0,
+        camera_filter: Optional[Callable[[Optional[int]], bool]] = None
+    ):
+        """
+        Inicializa o serviço de retenção.
+
+        :param root: Diretório das imagens salvas.
+        :param max_bytes_per_camera: Cota de bytes por câmera (0 = sem cota).
+        :param max_age: Idade máxima (s) de uma imagem (0 = sem limite).
+        :param interval: Intervalo (s) entre as aplicações da retenção.
+        :param camera_filter: Câmeras (ID, ou None para arquivos não reconhecidos) indexadas
+                              na varredura inicial; usado quando cada processo de trabalho
+                              cuida apenas das imagens do seu grupo. None = todas.
+        """
+        self.root = Path(root)
+        self.max_bytes_per_camera = max(0, max_bytes_per_camera)
+        self.max_age = max(0.0, max_age)
+        self.interval = max(1.0, interval)
+        self.camera_filter = camera_filter
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # camera_id -> deque[(mtime, caminho, bytes)] em ordem de gravação
+        self._index: Dict[Optional[int], Deque[Tuple[float, str, int]]] = defaultdict(deque)
+        self._bytes: Dict[Optional[int], int] = defaultdict(int)
+        self._lock = Lock()
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+        # Estatísticas
+        self._removed_files = 0
+        self._removed_bytes = 0
+        self._scanned_files = 0
+
+    def start(self) -> None:
+        """Inicia a indexação das imagens existentes e a retenção periódica em segundo plano."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = Thread(target=self._worker, name="ImageRetention", daemon=True)
+        self._thread.start()
+        self.logger.info(
+            f"Retenção de imagens iniciada em '{self.root}' "
+            f"(cota por câmera: {self.max_bytes_per_camera / (1024 * 1024):.0f}MB, "
+            f"idade máxima: {self.max_age / 3600:.1f}h)"
+        )
+
+    def stop(self) -> None:
+        """Para a thread de retenção."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def add(self, camera_id: Optional[int], path: Path, size: int) -> None:
+        """
+        Registra uma imagem recém-gravada no índice.
+
+        :param camera_id: Câmera de origem.
+        :param path: Caminho do arquivo gravado.
+        :param size: Tamanho do arquivo em bytes.
+        """
+        with self._lock:
+            self._index[camera_id].append((time.time(), str(path), size))
+            self._bytes[camera_id] += size
+
+    def _worker(self) -> None:
+        """Indexa as imagens existentes e aplica a retenção periodicamente."""
+        try:
+            self._scan()
+        except Exception as e:
+            self.logger.error(f"Erro ao indexar imagens existentes: {e}", exc_info=True)
+
+        while True:
+            try:
+                self.enforce()
+            except Exception as e:
+                self.logger.error(f"Erro na retenção de imagens: {e}", exc_info=True)
+            if self._stop_event.wait(self.interval):
+                break
+
+    def _scan(self) -> None:
+        """Indexa as imagens já existentes no diretório (mais antigas primeiro)."""
+        found: Dict[Optional[int], List[Tuple[float, str, int]]] = defaultdict(list)
+        pending = [str(self.root)]
+        count = 0
+        while pending and not self._stop_event.is_set():
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            camera_id = self._camera_of(entry.name)
+                            if self.camera_filter is not None and not self.camera_filter(camera_id):
+                                continue
+                            stat = entry.stat(follow_symlinks=False)
+                            found[camera_id].append((stat.st_mtime, entry.path, stat.st_size))
+                            count += 1
+            except FileNotFoundError:
+                continue
+
+        with self._lock:
+            for camera_id, files in found.items():
+                # Arquivos existentes são anteriores aos gravados desde a inicialização
+                # (os gravados durante a varredura já estão no índice)
+                known = {path for _, path, _ in self._index[camera_id]}
+                files = sorted(f for f in files if f[1] not in known)
+                self._index[camera_id] = deque(files + list(self._index[camera_id]))
+                self._bytes[camera_id] += sum(size for _, _, size in files)
+            self._scanned_files = count
+
+        self.logger.info(f"{count} imagem(ns) existente(s) indexada(s) para retenção")
+
+    def _camera_of(self, filename: str) -> Optional[int]:
+        """Extrai o ID da câmera do nome do arquivo (None se não reconhecido)."""
+        match = self.CAMERA_PATTERN.search(filename)
+        return int(match.group(1)) if match else None
+
+    def enforce(self, now: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Remove as imagens que excedem a idade máxima ou a cota de cada câmera.
+
+        :param now: Instante atual (time.time()); usado em testes.
+        :return: Tupla (arquivos removidos, bytes removidos).
+        """
+        now = time.time() if now is None else now
+        expired: List[str] = []
+        removed_bytes = 0
+
+        with self._lock:
+            for camera_id, files in self._index.items():
+                while files and (
+                    (self.max_age and now - files[0][0] > self.max_age)
+                    or (self.max_bytes_per_camera and self._bytes[camera_id] > self.max_bytes_per_camera)
+                ):
+                    _, path, size = files.popleft()
+                    self._bytes[camera_id] -= size
+                    removed_bytes += size
+                    expired.append(path)
+
+        # Remoção fora do lock (não bloqueia o registro de novas imagens)
+        for path in expired:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"Não foi possível remover '{path}': {e}")
+                continue
+            self._remove_empty_dirs(Path(path).parent)
+
+        if expired:
+            with self._lock:
+                self._removed_files += len(expired)
+                self._removed_bytes += removed_bytes
+            self.logger.info(
+                f"Retenção: {len(expired)} imagem(ns) removida(s) "
+                f"({removed_bytes / (1024 * 1024):.1f}MB liberados)"
+            )
+        return len(expired), removed_bytes
+
+    def _remove_empty_dirs(self, directory: Path) -> None:
+        """Remove os diretórios vazios (ex.: horas já expiradas no layout particionado) até a raiz."""
+        while directory != self.root and self.root in directory.parents:
+            try:
+                directory.rmdir()
+            except OSError:
+                # Não vazio (ou já removido): os diretórios acima também não estão vazios
+                return
+            directory = directory.parent
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas da retenção.
+
+        :return: Dicionário com arquivos e bytes removidos, arquivos indexados na
+                 inicialização e, por câmera, arquivos e bytes mantidos.
+        """
+        with self._lock:
+            return {
+                'removed_files': self._removed_files,
+                'removed_bytes': self._removed_bytes,
+                'scanned_files': self._scanned_files,
+                'per_camera': {
+                    camera_id: {'files': len(files), 'bytes': self._bytes[camera_id]}
+                    for camera_id, files in self._index.items()
+                },
+            }
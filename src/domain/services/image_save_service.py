@@ -1,170 +1,469 @@
 """
 Serviço de domínio para salvamento assíncrono de imagens.
-Processa salvamentos em lote usando worker thread para evitar bloqueio da thread principal.
+Processa salvamentos em dois estágios (codificação JPEG e gravação em disco),
+cada um com seu pool de threads, para não bloquear as threads de captura.
 """
 
 import logging
+import time
 import cv2
-from queue import Queue, Empty
-from threading import Thread
+from collections import defaultdict
+from dataclasses import dataclass
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
 import numpy as np
 
+from src.domain.entities.event_payload_entity import EventPayload
+from .image_archive import ImageArchive
+
+
+@dataclass(frozen=True)
+class ImageAnnotation:
+    """Instrução de desenho aplicada pelo ImageSaveService: bbox (x1, y1, x2, y2), cor BGR e rótulo."""
+    bbox: Tuple[int, int, int, int]
+    color: Tuple[int, int, int]
+    label: str = ""
+
 
 class ImageSaveService:
     """
     Serviço de domínio para salvamento assíncrono de imagens.
-    Usa fila e worker thread para processar salvamentos em background.
+
+    Compartilhado por todas as câmeras:
+    - estágio de codificação: N threads copiam o frame (recebido por referência,
+      somente leitura), desenham as anotações e executam cv2.imencode (libera o GIL).
+      Imagens de um EventPayload usam a codificação memoizada no payload: a mesma
+      variante pedida pelo envio ao FindFace não é codificada de novo;
+    - estágio de gravação: M threads gravam os bytes em disco; diretórios já
+      criados ficam em cache (um único mkdir por diretório). Com um ImageArchive,
+      as imagens são acrescentadas aos segmentos do arquivo em vez de gravadas
+      como arquivos individuais;
+    - a fila de entrada é limitada: quando cheia, a imagem é descartada e o descarte
+      é contabilizado por câmera.
     """
-    
-    def __init__(self, queue_size: int = 200, camera_name: str = "Unknown"):
+
+    def __init__(
+        self,
+        queue_size: int = 200,
+        camera_name: str = "Unknown",
+        encoder_workers: int = 2,
+        writer_workers: int = 2,
+        on_saved: Optional[Callable[[Optional[int], Path, int], None]] = None,
+        archive: Optional[ImageArchive] = None
+    ):
         """
-        Inicializa o serviço de salvamento assíncrono.
-        
-        :param queue_size: Tamanho máximo da fila de salvamento.
-        :param camera_name: Nome da câmera para identificação em logs.
+        Inicializa o serviço de salvamento assíncrono e inicia os workers.
+
+        :param queue_size: Tamanho máximo da fila de salvamento (e da fila entre os estágios).
+        :param camera_name: Nome da câmera (ou do serviço) para identificação em logs.
+        :param encoder_workers: Threads do estágio de codificação JPEG.
+        :param writer_workers: Threads do estágio de gravação em disco.
+        :param on_saved: Chamado após cada gravação com (camera_id, caminho, bytes)
+                         (ex.: ImageRetentionService.add); não é chamado no modo arquivo.
+        :param archive: Se informado, as imagens são gravadas nos segmentos do arquivo
+                        (o caminho informado no salvamento é usado apenas em logs).
         """
         self.queue_size = queue_size
         self.camera_name = camera_name
+        self.encoder_workers = max(1, encoder_workers)
+        self.writer_workers = max(1, writer_workers)
+        self.on_saved = on_saved
+        self.archive = archive
         self._save_queue: Queue = Queue(maxsize=queue_size)
+        self._write_queue: Queue = Queue(maxsize=queue_size)
         self._worker_running = True
-        
+        self._writers_stopped = False
+
         self.logger = logging.getLogger(f"ImageSaveService_{camera_name}")
-        
-        # Inicia worker automaticamente
-        self._worker = Thread(
-            target=self._save_worker,
-            name=f"ImageSave-Worker-{self.camera_name}",
-            daemon=True
+
+        # OTIMIZAÇÃO: Cache de diretórios já criados (evita mkdir por imagem)
+        self._created_dirs: Set[Path] = set()
+        self._dirs_lock = Lock()
+
+        # Estatísticas por câmera: camera_id -> contador -> valor
+        self._stats_lock = Lock()
+        self._camera_stats: Dict[Optional[int], Dict[str, int]] = defaultdict(
+            lambda: {'queued': 0, 'saved': 0, 'dropped': 0, 'errors': 0, 'bytes': 0}
         )
-        self._worker.start()
+        self._started_at = time.monotonic()
+
+        # Inicia workers automaticamente
+        self._encoders: List[Thread] = [
+            Thread(
+                target=self._encode_worker,
+                name=f"ImageSave-Encoder-{self.camera_name}-{i}",
+                daemon=True
+            )
+            for i in range(self.encoder_workers)
+        ]
+        self._writers: List[Thread] = [
+            Thread(
+                target=self._write_worker,
+                name=f"ImageSave-Writer-{self.camera_name}-{i}",
+                daemon=True
+            )
+            for i in range(self.writer_workers)
+        ]
+        for worker in self._encoders + self._writers:
+            worker.start()
         self.logger.info(
-            f"Worker assíncrono de salvamento iniciado (fila: {self.queue_size})"
+            f"Workers assíncronos de salvamento iniciados (fila: {self.queue_size}, "
+            f"codificação: {self.encoder_workers}, gravação: {self.writer_workers})"
         )
-    
-    def stop(self):
-        """Para o worker thread graciosamente."""
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Para os workers graciosamente (imagens já enfileiradas são gravadas).
+
+        Os estágios são encerrados em ordem: os sinais de parada da gravação só são
+        enviados depois que os encoders terminaram, para não ficarem à frente de imagens
+        ainda em codificação. O que não for processado até o prazo é descartado e
+        contabilizado como 'dropped'.
+
+        :param timeout: Prazo total (s) para esvaziar as filas.
+        """
         if not self._worker_running:
             return
-        
+
+        # Deixa de aceitar novas imagens
         self._worker_running = False
-        
-        # Envia sinal de parada
-        try:
-            self._save_queue.put(None, timeout=0.5)
-        except:
-            self.logger.warning("Não foi possível enviar sinal de parada para image save worker")
-        
-        # Aguarda worker finalizar
-        if self._worker is not None:
-            self._worker.join(timeout=3.0)
-            
-            if self._worker.is_alive():
-                self.logger.warning("Image save worker não finalizou no tempo esperado")
-            else:
-                self.logger.info("Image save worker finalizado com sucesso")
-    
+        deadline = time.monotonic() + timeout
+        dropped = 0
+
+        for queue, workers, stage in (
+            (self._save_queue, self._encoders, "codificação"),
+            (self._write_queue, self._writers, "gravação"),
+        ):
+            # Sinais de parada atrás dos itens pendentes (a fila esvazia enquanto os workers rodam)
+            for _ in workers:
+                try:
+                    queue.put(None, timeout=max(0.1, deadline - time.monotonic()))
+                except Full:
+                    break
+            for worker in workers:
+                worker.join(timeout=max(0.0, deadline - time.monotonic()))
+
+            alive = [worker for worker in workers if worker.is_alive()]
+            if alive:
+                # Prazo esgotado: descarta o pendente e reenvia os sinais de parada
+                dropped += self._discard_pending(queue)
+                for _ in alive:
+                    try:
+                        queue.put_nowait(None)
+                    except Full:
+                        break
+                for worker in alive:
+                    worker.join(timeout=3.0)
+                    if worker.is_alive():
+                        self.logger.warning(f"Worker {worker.name} ({stage}) não finalizou no tempo esperado")
+
+        # Encoder atrasado não fica bloqueado numa fila sem leitores
+        self._writers_stopped = True
+        dropped += self._discard_pending(self._write_queue)
+
+        if dropped:
+            self.logger.warning(f"{dropped} imagens pendentes descartadas no encerramento (prazo de {timeout:.0f}s)")
+        stats = self.get_stats()
+        self.logger.info(
+            f"Image save workers finalizados. "
+            f"Total: {stats['saved']} salvas, {stats['errors']} erros, {stats['dropped']} descartadas"
+        )
+
+    def _discard_pending(self, queue: Queue) -> int:
+        """Esvazia uma fila de estágio, contabilizando as imagens descartadas por câmera."""
+        discarded = 0
+        while True:
+            try:
+                item = queue.get_nowait()
+            except Empty:
+                return discarded
+            if item is not None:
+                self._count(item[0], 'dropped')
+                discarded += 1
+
     def save_async(
         self,
         image: np.ndarray,
         filepath: Path,
-        jpeg_quality: int = 95
+        jpeg_quality: int = 95,
+        camera_id: Optional[int] = None,
+        track_id: Optional[int] = None,
+        timestamp: Optional[float] = None
     ) -> bool:
         """
-        Enfileira imagem para salvamento assíncrono.
-        
+        Enfileira imagem para codificação e salvamento assíncronos.
+
         :param image: Array numpy da imagem a ser salva.
         :param filepath: Caminho completo para salvar a imagem.
         :param jpeg_quality: Qualidade JPEG (0-100).
+        :param camera_id: Câmera de origem (para as estatísticas por câmera).
+        :param track_id: Track de origem (registrado no índice do arquivo).
+        :param timestamp: Instante da imagem em epoch (registrado no índice do arquivo).
         :return: True se enfileirado com sucesso, False se fila cheia.
         """
+        return self._enqueue(image, filepath, jpeg_quality, camera_id, track_id=track_id, timestamp=timestamp)
+
+    def save_payload_async(
+        self,
+        payload: EventPayload,
+        filepath: Path,
+        jpeg_quality: int = 95,
+        camera_id: Optional[int] = None,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        annotations: Sequence[ImageAnnotation] = (),
+        max_size: int = 0,
+        track_id: Optional[int] = None,
+        timestamp: Optional[float] = None
+    ) -> bool:
+        """
+        Enfileira a imagem de um evento para salvamento assíncrono a partir do seu payload.
+        
+        A thread chamadora não copia, desenha nem codifica: os workers de codificação
+        obtêm os bytes de ``payload.jpeg(...)``, que reaproveita a codificação se a mesma
+        variante já foi (ou estiver sendo) gerada para o envio ao FindFace.
+
+        :param payload: Payload do evento (codificações memoizadas).
+        :param filepath: Caminho completo para salvar a imagem.
+        :param jpeg_quality: Qualidade JPEG (0-100).
+        :param camera_id: Câmera de origem (para as estatísticas por câmera).
+        :param region: Região [left, top, right, bottom] do frame a salvar (None = frame inteiro).
+        :param annotations: Bboxes e rótulos a desenhar, em coordenadas da região.
+        :param max_size: Maior lado da imagem salva em pixels; imagens maiores são
+                         reduzidas antes do desenho (0 = tamanho original).
+        :param track_id: Track de origem (registrado no índice do arquivo).
+        :param timestamp: Instante da imagem em epoch (registrado no índice do arquivo).
+        :return: True se enfileirado com sucesso, False se fila cheia.
+        """
+        return self._enqueue(
+            payload, filepath, jpeg_quality, camera_id, tuple(annotations), max_size, track_id, timestamp, region
+        )
+
+    def _enqueue(
+        self,
+        image: Union[np.ndarray, EventPayload],
+        filepath: Path,
+        jpeg_quality: int,
+        camera_id: Optional[int],
+        annotations: Tuple[ImageAnnotation, ...] = (),
+        max_size: int = 0,
+        track_id: Optional[int] = None,
+        timestamp: Optional[float] = None,
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> bool:
+        """Enfileira um item no estágio de codificação (não bloqueante)."""
         if not self._worker_running:
-            self.logger.error("Worker não está rodando. Chame start() primeiro.")
+            self.logger.error(f"Serviço de salvamento finalizado. Imagem descartada: {filepath.name}")
             return False
-        
+
         try:
-            # Enfileira para processamento assíncrono (non-blocking)
-            self._save_queue.put_nowait((image, filepath, jpeg_quality))
-            return True
-            
-        except:
+            self._save_queue.put_nowait(
+                (camera_id, image, region, filepath, jpeg_quality, annotations, max_size, (track_id, timestamp))
+            )
+        except Full:
             # Fila cheia - descarta imagem
+            self._count(camera_id, 'dropped')
             self.logger.warning(
                 f"Fila de salvamento CHEIA ({self._save_queue.qsize()}/{self.queue_size}). "
                 f"Imagem descartada: {filepath.name}"
             )
             return False
-    
-    def _save_worker(self):
-        """Worker thread que processa fila de salvamento."""
-        self.logger.info("Image save worker iniciado")
-        
-        saved_count = 0
-        error_count = 0
-        
-        while self._worker_running:
+
+        self._count(camera_id, 'queued')
+        return True
+
+    def _encode_worker(self):
+        """Estágio de codificação: converte a imagem em bytes JPEG."""
+        while True:
+            item = self._save_queue.get()
+            if item is None:  # Sinal de parada
+                break
+
+            camera_id, image, region, filepath, jpeg_quality, annotations, max_size, record = item
             try:
-                # Aguarda item da fila (timeout para verificar _worker_running)
+                if isinstance(image, EventPayload):
+                    # Codificação memoizada no payload (compartilhada com o envio ao FindFace)
+                    data = image.jpeg(region, jpeg_quality, annotations, max_size)
+                else:
+                    image = self.render(image, annotations, max_size)
+                    # cv2.imencode libera o GIL: várias codificações em paralelo
+                    ok, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+                    if not ok:
+                        raise ValueError("falha na codificação JPEG")
+                    data = buffer.tobytes()
+            except Exception as e:
+                self._count(camera_id, 'errors')
+                self.logger.error(f"Erro ao codificar imagem {filepath.name}: {e}")
+                continue
+
+            # Bloqueia se a gravação estiver atrasada (a fila de entrada absorve o pico)
+            while not self._writers_stopped:
                 try:
-                    item = self._save_queue.get(timeout=0.5)
-                except Empty:
-                    continue
-                
-                if item is None:  # Sinal de parada
-                    self.logger.info("Image save worker recebeu sinal de parada")
-                    break
-                
-                if not self._worker_running:
+                    self._write_queue.put((camera_id, data, filepath, record), timeout=0.5)
                     break
-                
-                image, filepath, jpeg_quality = item
-                
-                try:
-                    # Cria diretório se não existir
-                    filepath.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Salva imagem (operação bloqueante isolada na thread worker)
-                    cv2.imwrite(
-                        str(filepath),
-                        image,
-                        [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
-                    )
-                    
-                    saved_count += 1
-                    
-                    # Log periódico a cada 50 imagens salvas
-                    if saved_count % 50 == 0:
-                        self.logger.debug(
-                            f"Progresso: {saved_count} imagens salvas, "
-                            f"{error_count} erros, "
-                            f"fila: {self._save_queue.qsize()}"
-                        )
-                    
-                except Exception as e:
-                    error_count += 1
-                    self.logger.error(
-                        f"Erro ao salvar imagem {filepath.name}: {e}"
-                    )
-                
-                finally:
-                    self._save_queue.task_done()
-                    
+                except Full:
+                    continue
+            else:
+                self._count(camera_id, 'dropped')
+
+    @classmethod
+    def render(
+        cls,
+        image: np.ndarray,
+        annotations: Sequence[ImageAnnotation] = (),
+        max_size: int = 0
+    ) -> np.ndarray:
+        """
+        Gera a imagem a salvar: reduzida (se maior que max_size) e anotada.
+        A imagem recebida nunca é alterada (o desenho é feito sobre uma cópia).
+
+        :param image: Frame (ou recorte) original, somente leitura.
+        :param annotations: Bboxes e rótulos a desenhar, em coordenadas de ``image``.
+        :param max_size: Maior lado da imagem resultante em pixels (0 = tamanho original).
+        :return: Imagem pronta para codificação.
+        """
+        annotations = tuple(annotations)
+        if max_size and max(image.shape[:2]) > max_size:
+            # Miniatura: reduz antes de desenhar (o resize já gera uma nova imagem)
+            image, annotations = cls._downscale(image, annotations, max_size)
+        elif annotations:
+            # Desenha sobre uma cópia: o frame original é compartilhado (ex.: envio FindFace)
+            image = image.copy()
+        if annotations:
+            cls.draw_annotations(image, annotations)
+        return image
+
+    @staticmethod
+    def _downscale(
+        image: np.ndarray,
+        annotations: Tuple[ImageAnnotation, ...],
+        max_size: int
+    ) -> Tuple[np.ndarray, Tuple[ImageAnnotation, ...]]:
+        """Reduz a imagem para que o maior lado tenha max_size pixels, ajustando os bboxes."""
+        height, width = image.shape[:2]
+        scale = max_size / max(height, width)
+        resized = cv2.resize(
+            image,
+            (max(1, int(width * scale)), max(1, int(height * scale))),
+            interpolation=cv2.INTER_AREA
+        )
+        scaled = tuple(
+            ImageAnnotation(
+                bbox=tuple(int(v * scale) for v in annotation.bbox),
+                color=annotation.color,
+                label=annotation.label
+            )
+            for annotation in annotations
+        )
+        return resized, scaled
+
+    @staticmethod
+    def draw_annotations(image: np.ndarray, annotations: Sequence[ImageAnnotation]) -> None:
+        """Desenha bboxes e rótulos (texto branco sobre fundo na cor do bbox) in-place."""
+        for annotation in annotations:
+            x1, y1, x2, y2 = annotation.bbox
+            cv2.rectangle(image, (x1, y1), (x2, y2), annotation.color, 2)
+            if not annotation.label:
+                continue
+            label_size, _ = cv2.getTextSize(annotation.label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+            cv2.rectangle(
+                image,
+                (x1, y1 - label_size[1] - 10),
+                (x1 + label_size[0], y1),
+                annotation.color,
+                -1
+            )
+            cv2.putText(
+                image,
+                annotation.label,
+                (x1, y1 - 5),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.6,
+                (255, 255, 255),  # Texto branco para melhor contraste
+                2
+            )
+
+    def _write_worker(self):
+        """Estágio de gravação: grava os bytes JPEG em disco (arquivo individual ou segmento)."""
+        while True:
+            item = self._write_queue.get()
+            if item is None:  # Sinal de parada
+                break
+
+            camera_id, data, filepath, (track_id, timestamp) = item
+            try:
+                if self.archive is not None:
+                    self.archive.append(data, camera_id, track_id, timestamp)
+                else:
+                    self._write(filepath, data)
             except Exception as e:
-                if not self._worker_running:
-                    break
-                self.logger.error(f"Erro no image save worker: {e}")
+                self._count(camera_id, 'errors')
+                self.logger.error(f"Erro ao salvar imagem {filepath.name}: {e}")
                 continue
-        
-        self.logger.info(
-            f"Image save worker finalizado. "
-            f"Total: {saved_count} salvas, {error_count} erros"
+
+            with self._stats_lock:
+                stats = self._camera_stats[camera_id]
+                stats['saved'] += 1
+                stats['bytes'] += len(data)
+
+            if self.on_saved is not None and self.archive is None:
+                try:
+                    self.on_saved(camera_id, filepath, len(data))
+                except Exception as e:
+                    self.logger.error(f"Erro no callback de imagem salva: {e}")
+
+    def _write(self, filepath: Path, data: bytes) -> None:
+        """Grava o arquivo, criando o diretório apenas na primeira vez em que é usado."""
+        directory = filepath.parent
+        if directory not in self._created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            with self._dirs_lock:
+                self._created_dirs.add(directory)
+        try:
+            with open(filepath, 'wb') as f:
+                f.write(data)
+        except FileNotFoundError:
+            # Diretório removido externamente após entrar no cache: recria e tenta de novo
+            directory.mkdir(parents=True, exist_ok=True)
+            with open(filepath, 'wb') as f:
+                f.write(data)
+
+    def _count(self, camera_id: Optional[int], key: str) -> None:
+        """Incrementa um contador da câmera."""
+        with self._stats_lock:
+            self._camera_stats[camera_id][key] += 1
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do salvamento.
+
+        :return: Dicionário com totais (enfileiradas, salvas, descartadas, erros, bytes),
+                 vazão (imagens/s desde o início), tamanho das filas e os mesmos
+                 contadores por câmera em 'per_camera'.
+        """
+        elapsed = max(time.monotonic() - self._started_at, 1e-9)
+        with self._stats_lock:
+            per_camera = {
+                camera_id: dict(stats, throughput=stats['saved'] / elapsed)
+                for camera_id, stats in self._camera_stats.items()
+            }
+        totals = {
+            key: sum(stats[key] for stats in per_camera.values())
+            for key in ('queued', 'saved', 'dropped', 'errors', 'bytes')
+        }
+        return dict(
+            totals,
+            throughput=totals['saved'] / elapsed,
+            queue_size=self._save_queue.qsize(),
+            write_queue_size=self._write_queue.qsize(),
+            per_camera=per_camera
         )
-    
+
     def get_queue_size(self) -> int:
         """Retorna o tamanho atual da fila."""
         return self._save_queue.qsize()
-    
+
     def is_running(self) -> bool:
         """Verifica se o worker está rodando."""
         return self._worker_running
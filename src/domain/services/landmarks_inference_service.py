@@ -0,0 +1,298 @@
+"""
+Serviço de domínio para inferência de landmarks compartilhada entre câmeras.
+Um único modelo e uma única thread processam crops de todas as câmeras em lotes.
+"""
+
+import logging
+from collections import OrderedDict, deque
+from threading import Condition, Thread
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.domain.services.landmarks_model_interface import ILandmarksModel
+
+
+class LandmarksInferenceService:
+    """
+    Serviço de domínio que centraliza a inferência de landmarks do processo.
+
+    Cada câmera possui uma sub-fila própria (limitada) e o worker monta os lotes
+    em round-robin entre as câmeras com itens pendentes, garantindo que uma câmera
+    com muitas faces não monopolize o modelo. Cada requisição é identificada por
+    câmera, track e evento.
+
+    Os resultados são consultados depois, por track (ex.: ao finalizar o track):
+    apenas o resultado mais recente de cada track é mantido, e ``discard_track``
+    descarta o que ainda estiver pendente, em inferência ou não consultado.
+    """
+
+    def __init__(
+        self,
+        landmarks_model: ILandmarksModel,
+        batch_size: int = 8,
+        conf: float = 0.1,
+        queue_size_per_camera: Optional[int] = None,
+        max_batch_wait: float = 0.01,
+        max_results: int = 10000
+    ):
+        """
+        Inicializa o serviço e inicia o worker de inferência.
+
+        :param landmarks_model: Modelo de landmarks compartilhado.
+        :param batch_size: Tamanho máximo do lote de inferência.
+        :param conf: Threshold de confiança para a inferência.
+        :param queue_size_per_camera: Limite da sub-fila de cada câmera (padrão: 3x batch_size).
+        :param max_batch_wait: Tempo máximo (s) aguardando para completar um lote.
+        :param max_results: Máximo de tracks com resultado aguardando consulta.
+        :raises TypeError: Se landmarks_model não for ILandmarksModel.
+        """
+        if not isinstance(landmarks_model, ILandmarksModel):
+            raise TypeError(
+                f"landmarks_model deve ser ILandmarksModel, recebido: {type(landmarks_model).__name__}"
+            )
+
+        self.landmarks_model = landmarks_model
+        self.batch_size = max(1, batch_size)
+        self.conf = conf
+        self.queue_size_per_camera = queue_size_per_camera or self.batch_size * 3
+        self.max_batch_wait = max_batch_wait
+        self.max_results = max_results
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # Sub-filas por câmera: camera_id -> deque[(track_id, event_id, face_crop)]
+        self._pending: Dict[int, Deque[Tuple[int, int, np.ndarray]]] = {}
+        # Ordem de atendimento round-robin das câmeras com itens pendentes
+        self._ready_cameras: Deque[int] = deque()
+        # Resultados: (camera_id, track_id) -> (event_id, landmarks ou None); o mais recente do track
+        self._results: "OrderedDict[Tuple[int, int], Tuple[int, Optional[np.ndarray]]]" = OrderedDict()
+        # Tracks do lote em inferência e os descartados durante ela (resultado não é guardado)
+        self._in_flight: Set[Tuple[int, int]] = set()
+        self._discarded: Set[Tuple[int, int]] = set()
+        self._condition = Condition()
+
+        # Estatísticas
+        self._submitted = 0
+        self._dropped = 0
+        self._batches = 0
+        self._failed_batches = 0
+        self._inferred = 0
+        self._used = 0
+
+        self._worker_running = True
+        self._worker = Thread(
+            target=self._batch_worker,
+            name="Landmarks-Worker",
+            daemon=True
+        )
+        self._worker.start()
+        self.logger.info(
+            f"Serviço de landmarks compartilhado iniciado "
+            f"(batch: {self.batch_size}, fila por câmera: {self.queue_size_per_camera})"
+        )
+
+    def submit(self, camera_id: int, track_id: int, event_id: int, face_crop: np.ndarray) -> bool:
+        """
+        Enfileira um crop de face para inferência assíncrona (não bloqueante).
+
+        :param camera_id: ID da câmera de origem.
+        :param track_id: ID do track ao qual o evento pertence.
+        :param event_id: ID do evento.
+        :param face_crop: Crop da face em BGR (deve ser uma cópia independente do frame).
+        :return: True se enfileirado (ou se substituiu o crop pendente do mesmo track),
+                 False se a sub-fila da câmera estiver cheia.
+        """
+        if not self._worker_running or face_crop.size == 0:
+            return False
+
+        with self._condition:
+            queue = self._pending.get(camera_id)
+            if queue is None:
+                queue = deque()
+                self._pending[camera_id] = queue
+
+            # Crop ainda pendente do mesmo track é substituído: só o mais recente será consultado
+            for i, item in enumerate(queue):
+                if item[0] == track_id:
+                    queue[i] = (track_id, event_id, face_crop)
+                    self._submitted += 1
+                    return True
+
+            if len(queue) >= self.queue_size_per_camera:
+                self._dropped += 1
+                return False
+
+            if not queue:
+                self._ready_cameras.append(camera_id)
+            queue.append((track_id, event_id, face_crop))
+            self._submitted += 1
+            self._condition.notify()
+        return True
+
+    def pop_result(self, camera_id: int, track_id: int, event_id: int) -> Optional[np.ndarray]:
+        """
+        Retorna (e remove) o resultado mais recente de um track, se for do evento informado.
+
+        :param camera_id: ID da câmera de origem.
+        :param track_id: ID do track.
+        :param event_id: ID do evento esperado (ex.: melhor evento do track).
+        :return: Array de landmarks (coordenadas do crop) ou None se indisponível.
+        """
+        with self._condition:
+            result = self._results.pop((camera_id, track_id), None)
+            if result is None or result[0] != event_id or result[1] is None:
+                return None
+            self._used += 1
+            return result[1]
+
+    def discard_track(self, camera_id: int, track_id: int) -> None:
+        """
+        Remove os crops pendentes e o resultado de um track já finalizado.
+
+        :param camera_id: ID da câmera de origem.
+        :param track_id: ID do track finalizado.
+        """
+        with self._condition:
+            self._results.pop((camera_id, track_id), None)
+            if (camera_id, track_id) in self._in_flight:
+                self._discarded.add((camera_id, track_id))
+            queue = self._pending.get(camera_id)
+            if not queue:
+                return
+            remaining = deque(item for item in queue if item[0] != track_id)
+            if len(remaining) != len(queue):
+                self._pending[camera_id] = remaining
+                if not remaining and camera_id in self._ready_cameras:
+                    self._ready_cameras.remove(camera_id)
+
+    def unregister_camera(self, camera_id: int) -> None:
+        """
+        Descarta itens pendentes e resultados de uma câmera encerrada.
+
+        :param camera_id: ID da câmera.
+        """
+        with self._condition:
+            self._pending.pop(camera_id, None)
+            if camera_id in self._ready_cameras:
+                self._ready_cameras.remove(camera_id)
+            for key in [k for k in self._results if k[0] == camera_id]:
+                del self._results[key]
+            self._discarded.update(key for key in self._in_flight if key[0] == camera_id)
+
+    def _next_batch(self) -> List[Tuple[int, int, int, np.ndarray]]:
+        """
+        Monta o próximo lote em round-robin entre câmeras (chamado com o lock adquirido).
+
+        :return: Lista de (camera_id, track_id, event_id, face_crop).
+        """
+        batch = []
+        while self._ready_cameras and len(batch) < self.batch_size:
+            camera_id = self._ready_cameras.popleft()
+            queue = self._pending.get(camera_id)
+            if not queue:
+                continue
+            track_id, event_id, face_crop = queue.popleft()
+            batch.append((camera_id, track_id, event_id, face_crop))
+            # Câmera volta ao fim da fila se ainda possui itens
+            if queue:
+                self._ready_cameras.append(camera_id)
+        return batch
+
+    def _batch_worker(self):
+        """Worker que acumula crops de todas as câmeras e infere em lote."""
+        self.logger.info("Landmarks worker iniciado")
+
+        while self._worker_running:
+            try:
+                with self._condition:
+                    if not self._ready_cameras:
+                        self._condition.wait(timeout=0.1)
+                        if not self._ready_cameras:
+                            continue
+
+                    # Aguarda brevemente para completar o lote
+                    pending_total = sum(len(q) for q in self._pending.values())
+                    if pending_total < self.batch_size and self.max_batch_wait > 0:
+                        self._condition.wait(timeout=self.max_batch_wait)
+
+                    batch = self._next_batch()
+                    self._in_flight = {(item[0], item[1]) for item in batch}
+
+                if not batch:
+                    continue
+
+                crops = [item[3] for item in batch]
+                try:
+                    predictions = self.landmarks_model.predict_batch(
+                        face_crops=crops,
+                        conf=self.conf,
+                        verbose=False
+                    )
+                except Exception as e:
+                    self.logger.error(f"Erro no processamento de batch de landmarks ({len(batch)} crops): {e}")
+                    predictions = [None] * len(batch)
+                    with self._condition:
+                        self._failed_batches += 1
+
+                with self._condition:
+                    for (camera_id, track_id, event_id, _), prediction in zip(batch, predictions):
+                        key = (camera_id, track_id)
+                        if key in self._discarded:
+                            continue
+                        self._results[key] = (event_id, prediction[0] if prediction is not None else None)
+                        self._results.move_to_end(key)
+                    self._in_flight = set()
+                    self._discarded.clear()
+                    # Limita memória de resultados nunca consultados
+                    while len(self._results) > self.max_results:
+                        self._results.popitem(last=False)
+                    self._batches += 1
+                    self._inferred += len(batch)
+
+            except Exception as e:
+                if not self._worker_running:
+                    break
+                self.logger.error(f"Erro no landmarks worker: {e}")
+                continue
+
+        self.logger.info("Landmarks worker finalizado")
+
+    def stop(self):
+        """Para o worker de inferência graciosamente."""
+        if not self._worker_running:
+            return
+
+        self._worker_running = False
+        with self._condition:
+            self._condition.notify_all()
+
+        self._worker.join(timeout=2.0)
+        if self._worker.is_alive():
+            self.logger.warning("Landmarks worker não finalizou no tempo esperado")
+        else:
+            self.logger.info("Landmarks worker finalizado com sucesso")
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do serviço.
+
+        :return: Dicionário com contadores de submissões, descartes, lotes (e lotes com
+                 falha na inferência), resultados usados e tamanho médio do lote.
+        """
+        with self._condition:
+            return {
+                'submitted': self._submitted,
+                'dropped': self._dropped,
+                'batches': self._batches,
+                'failed_batches': self._failed_batches,
+                'inferred': self._inferred,
+                'used': self._used,
+                'results': len(self._results),
+                'avg_batch_size': (self._inferred / self._batches) if self._batches else 0.0,
+                'pending_per_camera': {cid: len(q) for cid, q in self._pending.items()},
+            }
+
+    def is_running(self) -> bool:
+        """Verifica se o worker está rodando."""
+        return self._worker_running
@@ -5,7 +5,7 @@ Permite desacoplar a lógica de negócio da implementação específica do model
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import numpy as np
 
 
@@ -34,6 +34,24 @@ class ILandmarksModel(ABC):
         """
         pass
     
+    def predict_batch(
+        self,
+        face_crops: List[np.ndarray],
+        conf: float = 0.5,
+        verbose: bool = False
+    ) -> List[Optional[Tuple[np.ndarray, float]]]:
+        """
+        Executa inferência de landmarks em um lote de crops de faces.
+        Implementação padrão chama predict() para cada crop; adapters que suportam
+        inferência em lote devem sobrescrever este método.
+        
+        :param face_crops: Lista de crops de faces em formato BGR.
+        :param conf: Threshold de confiança mínima para detecção.
+        :param verbose: Se deve exibir logs detalhados.
+        :return: Lista com um resultado por crop, na mesma ordem (ver predict()).
+        """
+        return [self.predict(face_crop=crop, conf=conf, verbose=verbose) for crop in face_crops]
+    
     @abstractmethod
     def get_model_info(self) -> dict:
         """
@@ -5,7 +5,7 @@ Permite desacoplar o ByteTrackDetectorService da implementação específica do
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Iterator
+from typing import Any, Iterator, List
 
 
 class IDetectionModel(ABC):
@@ -43,6 +43,44 @@ class IDetectionModel(ABC):
         """
         pass
     
+    def predict(
+        self,
+        images: List[Any],
+        conf: float = 0.1,
+        iou: float = 0.2,
+        imgsz: int = 640
+    ) -> List[Any]:
+        """
+        Realiza apenas a detecção (sem tracker) em um lote de imagens já decodificadas.
+
+        Usado quando o modelo é compartilhado entre câmeras e cada câmera mantém o seu
+        próprio tracker (ver SharedDetectionModel/CameraTrackingModel).
+
+        :param images: Lista de imagens (arrays BGR).
+        :param conf: Threshold de confiança.
+        :param iou: Threshold de IOU do NMS.
+        :param imgsz: Tamanho da imagem para inferência.
+        :return: Lista de resultados de detecção (um por imagem).
+        :raises NotImplementedError: Se o modelo não suportar detecção avulsa.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} não suporta predict()")
+    
+    def reset_tracker(self) -> None:
+        """
+        Descarta o estado do tracker mantido entre chamadas de ``track`` (``persist=True``).
+
+        Chamado antes de reutilizar o modelo em outra câmera, para que IDs e trajetórias
+        da câmera anterior não vazem para a nova. Padrão: nenhum estado a descartar.
+        """
+    
+    def abort_stream(self) -> None:
+        """
+        Interrompe o stream em andamento em ``track`` (chamado de outra thread).
+
+        Usado pelo watchdog quando a fonte trava sem erro nem frames: libera a captura
+        para que o iterador de resultados termine. Padrão: nada a interromper.
+        """
+    
     @abstractmethod
     def get_model_info(self) -> dict:
         """
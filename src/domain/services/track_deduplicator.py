@@ -0,0 +1,275 @@
+"""
+Deduplicação de tracks fragmentados antes do envio ao FindFace.
+"""
+
+import logging
+import time
+from datetime import datetime
+from threading import Lock
+from typing import Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.domain.entities import Event, Track, EventPayload
+
+
+class _FragmentGroup:
+    """Fragmentos de track considerados a mesma pessoa (mantém apenas o melhor payload)."""
+
+    __slots__ = (
+        'track_id', 'payload', 'total_events', 'track_ids', 'hashes',
+        'first_time', 'first_bbox', 'last_time', 'last_bbox', 'created', 'deadline'
+    )
+
+    def __init__(self, track_id: int, track: Track, payload: EventPayload, face_hash: int, now: float, horizon: float):
+        self.track_id = track_id
+        self.payload = payload
+        self.total_events = track.event_count
+        self.track_ids = [track_id]
+        self.hashes = [face_hash]
+        self.first_time = track.first_event.frame.timestamp.value()
+        self.first_bbox = track.first_event.bbox.value()
+        self.last_time = track.last_event.frame.timestamp.value()
+        self.last_bbox = track.last_event.bbox.value()
+        self.created = now
+        self.deadline = now + horizon
+
+
+class TrackDeduplicator:
+    """
+    Agrupa, por câmera, tracks que o ByteTrack fragmentou (ex.: após oclusão) e
+    entrega apenas o melhor evento de cada grupo.
+
+    Um track finalizado entra no grupo pendente que for, ao mesmo tempo:
+    - adjacente no tempo: intervalo entre os fragmentos <= ``max_gap`` segundos;
+    - adjacente no espaço: centros dos bboxes nas pontas dos fragmentos a até
+      ``max_distance`` larguras de bbox;
+    - parecido: distância de Hamming do dHash (64 bits) dos melhores recortes
+      <= ``max_hash_distance``.
+
+    O grupo fica retido por ``horizon`` segundos após o último fragmento (prorrogado,
+    até ``max_hold``, enquanto houver um track ativo que pareça sua continuação) e
+    então é entregue com o payload de maior qualidade.
+
+    Usado apenas pela thread de captura da câmera; o lock protege as estatísticas.
+    """
+
+    def __init__(
+        self,
+        horizon: float = 2.0,
+        max_gap: float = 2.0,
+        max_distance: float = 1.5,
+        max_hash_distance: int = 12,
+        max_hold: float = 10.0,
+        max_pending: int = 64
+    ):
+        """
+        :param horizon: Tempo (s) que um grupo aguarda novos fragmentos antes de ser entregue.
+        :param max_gap: Intervalo máximo (s) entre o fim de um fragmento e o início do próximo.
+        :param max_distance: Distância máxima entre centros, em larguras de bbox.
+        :param max_hash_distance: Distância de Hamming máxima entre os dHash (0 a 64).
+        :param max_hold: Retenção máxima (s) de um grupo, mesmo com continuação ativa.
+        :param max_pending: Máximo de grupos retidos (o mais antigo é entregue ao exceder).
+        """
+        self.horizon = max(0.0, horizon)
+        self.max_gap = max_gap
+        self.max_distance = max_distance
+        self.max_hash_distance = max_hash_distance
+        self.max_hold = max(self.horizon, max_hold)
+        self.max_pending = max(1, max_pending)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._pending: List[_FragmentGroup] = []
+        self._lock = Lock()
+
+        # Estatísticas
+        self._received = 0
+        self._merged = 0
+        self._emitted = 0
+
+    def add(
+        self,
+        track_id: int,
+        track: Track,
+        payload: EventPayload,
+        now: Optional[float] = None
+    ) -> List[Tuple[int, EventPayload, int]]:
+        """
+        Registra o melhor evento de um track finalizado.
+
+        :param track_id: ID do track.
+        :param track: Track finalizado (primeiro/último evento definem a adjacência).
+        :param payload: Payload do melhor evento do track.
+        :param now: Instante atual (time.monotonic()); usado em testes.
+        :return: Grupos entregues por excesso de pendentes: lista de (track_id, payload, total_events).
+        """
+        now = time.monotonic() if now is None else now
+        face_hash = self._dhash(payload.event)
+
+        group = self._find_group(track, face_hash)
+        if group is None:
+            self._pending.append(_FragmentGroup(track_id, track, payload, face_hash, now, self.horizon))
+        else:
+            self._merge(group, track_id, track, payload, face_hash, now)
+
+        with self._lock:
+            self._received += 1
+            if group is not None:
+                self._merged += 1
+
+        emitted = []
+        while len(self._pending) > self.max_pending:
+            emitted.append(self._emit(self._pending.pop(0)))
+        return emitted
+
+    def flush(
+        self,
+        active_tracks: Iterable[Track] = (),
+        now: Optional[float] = None,
+        force: bool = False
+    ) -> List[Tuple[int, EventPayload, int]]:
+        """
+        Entrega os grupos cujo horizonte expirou.
+
+        :param active_tracks: Tracks ainda ativos na câmera; um grupo com continuação
+                              provável entre eles é retido (até ``max_hold``).
+        :param now: Instante atual (time.monotonic()); usado em testes.
+        :param force: Se True, entrega todos os grupos (encerramento da câmera).
+        :return: Lista de (track_id, payload, total_events) a enviar.
+        """
+        if not self._pending:
+            return []
+        now = time.monotonic() if now is None else now
+
+        emitted = []
+        remaining = []
+        active = None
+        for group in self._pending:
+            if not force and now < group.deadline:
+                remaining.append(group)
+                continue
+            if not force and now - group.created < self.max_hold:
+                if active is None:
+                    active = [t for t in active_tracks if not t.is_empty]
+                if any(self._continues(group, track) for track in active):
+                    group.deadline = now + self.horizon
+                    remaining.append(group)
+                    continue
+            emitted.append(self._emit(group))
+        self._pending = remaining
+        return emitted
+
+    @property
+    def pending(self) -> int:
+        """Número de grupos retidos."""
+        return len(self._pending)
+
+    def _find_group(self, track: Track, face_hash: int) -> Optional[_FragmentGroup]:
+        """Retorna o grupo pendente do qual o track é um fragmento (o de menor distância de hash)."""
+        best, best_distance = None, self.max_hash_distance + 1
+        for group in self._pending:
+            if not self._continues(group, track):
+                continue
+            distance = min(self._hamming(face_hash, h) for h in group.hashes)
+            if distance < best_distance:
+                best, best_distance = group, distance
+        return best
+
+    def _continues(self, group: _FragmentGroup, track: Track) -> bool:
+        """Indica se o track é adjacente ao grupo no tempo e no espaço."""
+        first_time = track.first_event.frame.timestamp.value()
+        last_time = track.last_event.frame.timestamp.value()
+
+        # Compara as pontas mais próximas dos dois intervalos. Intervalos sobrepostos são
+        # rostos visíveis ao mesmo tempo - pessoas diferentes, nunca fragmentos de um track
+        if first_time >= group.last_time:
+            gap = self._seconds(group.last_time, first_time)
+            bbox_a, bbox_b = group.last_bbox, track.first_event.bbox.value()
+        elif last_time <= group.first_time:
+            gap = self._seconds(last_time, group.first_time)
+            bbox_a, bbox_b = track.last_event.bbox.value(), group.first_bbox
+        else:
+            return False
+
+        if gap > self.max_gap:
+            return False
+
+        ax, ay = (bbox_a[0] + bbox_a[2]) / 2, (bbox_a[1] + bbox_a[3]) / 2
+        bx, by = (bbox_b[0] + bbox_b[2]) / 2, (bbox_b[1] + bbox_b[3]) / 2
+        width = max(bbox_a[2] - bbox_a[0], bbox_b[2] - bbox_b[0], 1)
+        return ((ax - bx) ** 2 + (ay - by) ** 2) ** 0.5 <= self.max_distance * width
+
+    def _merge(
+        self,
+        group: _FragmentGroup,
+        track_id: int,
+        track: Track,
+        payload: EventPayload,
+        face_hash: int,
+        now: float
+    ) -> None:
+        """Adiciona um fragmento ao grupo, mantendo o payload de maior qualidade."""
+        if payload.event.face_quality_score.value() > group.payload.event.face_quality_score.value():
+            group.payload = payload
+            group.track_id = track_id
+        group.total_events += track.event_count
+        group.track_ids.append(track_id)
+        group.hashes.append(face_hash)
+
+        first_time = track.first_event.frame.timestamp.value()
+        last_time = track.last_event.frame.timestamp.value()
+        if first_time < group.first_time:
+            group.first_time, group.first_bbox = first_time, track.first_event.bbox.value()
+        if last_time > group.last_time:
+            group.last_time, group.last_bbox = last_time, track.last_event.bbox.value()
+        group.deadline = now + self.horizon
+
+    def _emit(self, group: _FragmentGroup) -> Tuple[int, EventPayload, int]:
+        """Converte um grupo no item de envio e registra a deduplicação."""
+        with self._lock:
+            self._emitted += 1
+        if len(group.track_ids) > 1:
+            self.logger.info(
+                f"Tracks {group.track_ids} agrupados como a mesma face; "
+                f"enviando apenas o melhor (Track {group.track_id})"
+            )
+        return group.track_id, group.payload, group.total_events
+
+    @staticmethod
+    def _dhash(event: Event) -> int:
+        """dHash de 64 bits do recorte da face (gradiente horizontal em 9x8 tons de cinza)."""
+        x1, y1, x2, y2 = event.bbox.value()
+        frame = event.frame.ndarray_readonly
+        crop = frame[max(0, y1):max(0, y2), max(0, x1):max(0, x2)]
+        if crop.size == 0:
+            return 0
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+        small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+        bits = np.packbits((small[:, 1:] > small[:, :-1]).ravel())
+        return int.from_bytes(bits.tobytes(), 'big')
+
+    @staticmethod
+    def _hamming(a: int, b: int) -> int:
+        """Distância de Hamming entre dois hashes."""
+        return bin(a ^ b).count('1')
+
+    @staticmethod
+    def _seconds(start: datetime, end: datetime) -> float:
+        """Diferença em segundos entre dois timestamps."""
+        return (end - start).total_seconds()
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas da deduplicação.
+
+        :return: Dicionário com tracks recebidos, fragmentos agrupados, eventos entregues
+                 e grupos retidos.
+        """
+        with self._lock:
+            return {
+                'received': self._received,
+                'merged': self._merged,
+                'emitted': self._emitted,
+                'pending': len(self._pending),
+            }
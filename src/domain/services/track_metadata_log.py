@@ -0,0 +1,289 @@
+"""
+Registro colunar dos tracks finalizados e dos envios ao FindFace.
+Grava lotes em arquivos .npz (uma coluna numpy por campo) para análise em escala.
+"""
+
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class TrackMetadataLog:
+    """
+    Acumula em memória um registro por track finalizado (e por envio ao FindFace) e
+    grava periodicamente cada lote em um arquivo ``{tabela}-AAAAMMDD-HHMMSS-NNNNNN.npz``
+    com uma coluna por campo (lido com ``numpy.load`` ou pandas, sem parsing de logs).
+
+    - ``record_track()``/``record_dispatch()`` apenas acrescentam uma tupla ao buffer
+      (não bloqueiam a thread de captura nem os workers de envio); com o buffer cheio,
+      o registro é descartado e contabilizado;
+    - uma thread de fundo grava os lotes a cada ``flush_interval`` segundos ou quando
+      o buffer atinge ``batch_size`` registros;
+    - ``stop()`` grava os registros pendentes.
+
+    Tabela ``tracks`` (um registro por track finalizado):
+    timestamp, camera_id, track_id, frames, events, frames_lost, has_movement,
+    avg_distance, max_distance, total_distance, best_quality, best_confidence,
+    bbox_width, valid, invalid_reason, dispatch, duration, finalize_delay, finalize_time.
+
+    Tabela ``dispatches`` (um registro por envio ao FindFace):
+    timestamp, camera_id, track_id, total_events, success, latency, error.
+    """
+
+    TRACK_FIELDS = (
+        ('timestamp', np.float64),
+        ('camera_id', np.int32),
+        ('track_id', np.int64),
+        ('frames', np.int32),
+        ('events', np.int32),
+        ('frames_lost', np.int32),
+        ('has_movement', np.bool_),
+        ('avg_distance', np.float32),
+        ('max_distance', np.float32),
+        ('total_distance', np.float32),
+        ('best_quality', np.float32),
+        ('best_confidence', np.float32),
+        ('bbox_width', np.int32),
+        ('valid', np.bool_),
+        ('invalid_reason', np.str_),
+        ('dispatch', np.str_),
+        ('duration', np.float32),
+        ('finalize_delay', np.float32),
+        ('finalize_time', np.float32),
+    )
+
+    DISPATCH_FIELDS = (
+        ('timestamp', np.float64),
+        ('camera_id', np.int32),
+        ('track_id', np.int64),
+        ('total_events', np.int32),
+        ('success', np.bool_),
+        ('latency', np.float32),
+        ('error', np.str_),
+    )
+
+    # Resultado do envio registrado na tabela tracks
+    DISPATCH_QUEUED = "queued"          # Enfileirado para o FindFace
+    DISPATCH_HELD = "held"              # Retido pela deduplicação de fragmentos
+    DISPATCH_DROPPED = "dropped"        # Fila FindFace cheia
+    DISPATCH_SKIPPED = "skipped"        # Track inválido ou FindFace não configurado
+
+    def __init__(
+        self,
+        root: str,
+        flush_interval: float = 30.0,
+        batch_size: int = 10000,
+        max_buffer: int = 100000,
+        compress: bool = True
+    ):
+        """
+        Inicializa o registro de metadados.
+
+        :param root: Diretório dos arquivos .npz.
+        :param flush_interval: Intervalo máximo (s) entre gravações.
+        :param batch_size: Registros que antecipam a gravação do lote.
+        :param max_buffer: Máximo de registros pendentes por tabela (excedentes são descartados).
+        :param compress: Se True, grava com numpy.savez_compressed.
+        """
+        self.root = Path(root)
+        self.flush_interval = max(0.1, flush_interval)
+        self.batch_size = max(1, batch_size)
+        self.max_buffer = max(self.batch_size, max_buffer)
+        self.compress = compress
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._buffers: Dict[str, Deque[tuple]] = {'tracks': deque(), 'dispatches': deque()}
+        self._fields = {'tracks': self.TRACK_FIELDS, 'dispatches': self.DISPATCH_FIELDS}
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+        self._sequence = 0
+
+        # Estatísticas
+        self._written = {'tracks': 0, 'dispatches': 0}
+        self._dropped = 0
+        self._files = 0
+        self._errors = 0
+
+    def start(self) -> None:
+        """Inicia a thread de gravação dos lotes."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = Thread(target=self._worker, name="TrackMetadataLog", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Registro de metadados de tracks iniciado em '{self.root}'")
+
+    def stop(self) -> None:
+        """Para a thread de gravação e grava os registros pendentes."""
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10.0)
+            self._thread = None
+        self.flush()
+
+    def record_track(
+        self,
+        camera_id: int,
+        track_id: int,
+        frames: int,
+        events: int,
+        frames_lost: int,
+        has_movement: bool,
+        movement_stats: dict,
+        best_quality: float,
+        best_confidence: float,
+        bbox_width: int,
+        valid: bool,
+        invalid_reason: str,
+        dispatch: str,
+        duration: float,
+        finalize_delay: float,
+        finalize_time: float
+    ) -> None:
+        """
+        Registra um track finalizado (não bloqueante).
+
+        :param camera_id: ID da câmera.
+        :param track_id: ID do track.
+        :param frames: Frames processados do track.
+        :param events: Eventos do track.
+        :param frames_lost: Frames perdidos até a finalização.
+        :param has_movement: Se o track teve movimento significativo.
+        :param movement_stats: Estatísticas de movimento (Track.get_movement_statistics()).
+        :param best_quality: Qualidade do melhor evento.
+        :param best_confidence: Confiança do melhor evento.
+        :param bbox_width: Largura do bbox do melhor evento (pixels).
+        :param valid: Se o track é válido para envio.
+        :param invalid_reason: Motivo da invalidação (vazio se válido).
+        :param dispatch: Resultado do envio (DISPATCH_*).
+        :param duration: Tempo (s) entre o primeiro e o último evento.
+        :param finalize_delay: Tempo (s) entre o último evento e a finalização.
+        :param finalize_time: Tempo (s) gasto na finalização pela thread de captura.
+        """
+        self._append('tracks', (
+            time.time(), camera_id, track_id, frames, events, frames_lost, has_movement,
+            movement_stats['average_distance'], movement_stats['max_distance'],
+            movement_stats['total_distance'], best_quality, best_confidence, bbox_width,
+            valid, invalid_reason, dispatch, duration, finalize_delay, finalize_time
+        ))
+
+    def record_dispatch(
+        self,
+        camera_id: int,
+        track_id: int,
+        total_events: int,
+        success: bool,
+        latency: Optional[float],
+        error: Optional[Exception] = None
+    ) -> None:
+        """
+        Registra o resultado de um envio ao FindFace (não bloqueante).
+
+        :param camera_id: ID da câmera.
+        :param track_id: ID do track.
+        :param total_events: Total de eventos do track.
+        :param success: Se o FindFace aceitou o evento.
+        :param latency: Duração (s) da requisição (None se não chegou a ser enviada).
+        :param error: Exceção do envio, se houver.
+        """
+        self._append('dispatches', (
+            time.time(), camera_id, track_id, total_events, success,
+            np.nan if latency is None else latency,
+            type(error).__name__ if error is not None else ""
+        ))
+
+    def _append(self, table: str, row: tuple) -> None:
+        """Acrescenta um registro ao buffer da tabela."""
+        with self._lock:
+            buffer = self._buffers[table]
+            if len(buffer) >= self.max_buffer:
+                self._dropped += 1
+                return
+            buffer.append(row)
+            full = len(buffer) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def _worker(self) -> None:
+        """Grava os lotes periodicamente até stop()."""
+        while not self._stop_event.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Erro ao gravar metadados de tracks: {e}", exc_info=True)
+
+    def flush(self) -> int:
+        """
+        Grava os registros pendentes de todas as tabelas.
+
+        :return: Número de registros gravados.
+        """
+        written = 0
+        for table in self._buffers:
+            with self._lock:
+                rows: List[tuple] = list(self._buffers[table])
+                self._buffers[table].clear()
+            if rows:
+                written += self._write(table, rows)
+        return written
+
+    def _write(self, table: str, rows: List[tuple]) -> int:
+        """Converte as linhas em colunas numpy e grava o lote em um arquivo .npz."""
+        fields = self._fields[table]
+        columns: Tuple[tuple, ...] = tuple(zip(*rows))
+        arrays = {
+            name: np.asarray(values, dtype=dtype)
+            for (name, dtype), values in zip(fields, columns)
+        }
+
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        filename = f"{table}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{sequence:06d}.npz"
+        path = self.root / filename
+        tmp_path = path.with_name(filename + '.tmp')
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            # Arquivo temporário + rename: leitores nunca veem um lote pela metade
+            with open(tmp_path, 'wb') as f:
+                (np.savez_compressed if self.compress else np.savez)(f, **arrays)
+            tmp_path.replace(path)
+        except OSError as e:
+            with self._lock:
+                self._errors += 1
+                self._dropped += len(rows)
+            self.logger.error(f"Não foi possível gravar '{path}': {e}")
+            return 0
+
+        with self._lock:
+            self._written[table] += len(rows)
+            self._files += 1
+        return len(rows)
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do registro.
+
+        :return: Dicionário com registros gravados por tabela, pendentes, descartados,
+                 arquivos gravados e erros de gravação.
+        """
+        with self._lock:
+            return {
+                'tracks': self._written['tracks'],
+                'dispatches': self._written['dispatches'],
+                'pending': sum(len(buffer) for buffer in self._buffers.values()),
+                'dropped': self._dropped,
+                'files': self._files,
+                'errors': self._errors,
+            }
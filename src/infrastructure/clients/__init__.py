@@ -3,5 +3,6 @@ Clientes externos (Infrastructure Layer).
 """
 
 from .findface_multi import FindfaceMulti
+from .findface_multi_async import AsyncFindfaceMulti
 
-__all__ = ['FindfaceMulti']
+__all__ = ['FindfaceMulti', 'AsyncFindfaceMulti']
@@ -0,0 +1,104 @@
+"""
+Circuit breaker para chamadas a serviços externos.
+"""
+
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Interrompe chamadas a um serviço que está falhando de forma consecutiva.
+
+    - Fechado: chamadas liberadas; ``failure_threshold`` falhas consecutivas abrem o circuito.
+    - Aberto: chamadas recusadas imediatamente durante ``reset_timeout`` segundos.
+    - Semiaberto: uma única chamada de teste é liberada; sucesso fecha o circuito,
+      falha o reabre por mais ``reset_timeout`` segundos.
+    """
+
+    STATE_CLOSED = "closed"
+    STATE_OPEN = "open"
+    STATE_HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        :param failure_threshold: Falhas consecutivas que abrem o circuito (0 = desativado).
+        :param reset_timeout: Tempo (s) com o circuito aberto antes da chamada de teste.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._state = self.STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at = 0.0
+        self._times_opened = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Estado atual do circuito."""
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Indica se uma chamada pode ser feita agora.
+
+        :return: True se liberada (no estado semiaberto, apenas a chamada de teste).
+        """
+        if self.failure_threshold <= 0:
+            return True
+
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.STATE_OPEN and now - self._opened_at >= self.reset_timeout:
+                self._state = self.STATE_HALF_OPEN
+                self._probe_started_at = 0.0
+
+            if self._state == self.STATE_CLOSED:
+                return True
+            # Semiaberto: libera uma chamada de teste por vez (renovada se a anterior não retornou)
+            if self._state == self.STATE_HALF_OPEN and (
+                not self._probe_started_at or now - self._probe_started_at >= self.reset_timeout
+            ):
+                self._probe_started_at = now
+                return True
+
+            self._rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Registra uma chamada bem-sucedida, fechando o circuito."""
+        with self._lock:
+            self._failures = 0
+            self._state = self.STATE_CLOSED
+
+    def record_failure(self) -> None:
+        """Registra uma falha, abrindo o circuito ao atingir o limite ou após o teste falhar."""
+        if self.failure_threshold <= 0:
+            return
+
+        with self._lock:
+            self._failures += 1
+            if self._state == self.STATE_HALF_OPEN or (
+                self._state == self.STATE_CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = self.STATE_OPEN
+                self._opened_at = time.monotonic()
+                self._times_opened += 1
+
+    def get_stats(self) -> dict:
+        """
+        Retorna o estado do circuito.
+
+        :return: Dicionário com estado, falhas consecutivas, aberturas e chamadas recusadas.
+        """
+        with self._lock:
+            return {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'times_opened': self._times_opened,
+                'rejected': self._rejected,
+            }
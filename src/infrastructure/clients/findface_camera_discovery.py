@@ -0,0 +1,168 @@
+"""
+Descoberta de câmeras virtuais do FindFace Multi: paginação, busca concorrente
+por grupo e cache com validação por TTL e ETag.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+class FindfaceCameraDiscovery:
+    """
+    Lista as câmeras dos grupos cujo nome começa com um prefixo.
+
+    - Segue o cursor ``next_page`` de ``/camera-groups/`` e ``/cameras/`` (nenhum grupo
+      é truncado pelo limite de página do servidor);
+    - busca os grupos em paralelo (a paginação dentro de um grupo é sequencial);
+    - dentro do TTL, devolve o último resultado sem nenhuma requisição; após o TTL,
+      revalida cada página com ``If-None-Match`` e reaproveita as que responderem 304.
+
+    Compartilhada por todos os consumidores do mesmo cliente (repositório de câmeras
+    e FindfaceAdapter), de modo que uma descoberta recente atende a ambos.
+    """
+
+    def __init__(self, client, page_size: int = 100, max_workers: int = 8, cache_ttl: float = 60.0):
+        """
+        :param client: Cliente FindfaceMulti autenticado (fornece ``get_conditional``).
+        :param page_size: Itens solicitados por página.
+        :param max_workers: Grupos buscados simultaneamente.
+        :param cache_ttl: Validade (s) do resultado sem revalidação (0 = sempre revalida).
+        """
+        self.client = client
+        self.page_size = max(1, page_size)
+        self.max_workers = max(1, max_workers)
+        self.cache_ttl = cache_ttl
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        # (prefixo, active) -> (instante da descoberta, câmeras)
+        self._results: Dict[Tuple[str, Optional[bool]], Tuple[float, List[Dict[str, Any]]]] = {}
+        # (path, params) -> (etag, página)
+        self._pages: Dict[Tuple[str, Tuple], Tuple[str, Dict[str, Any]]] = {}
+
+        # Estatísticas
+        self._discoveries = 0
+        self._cache_hits = 0
+        self._pages_fetched = 0
+        self._pages_not_modified = 0
+        self._last_duration = 0.0
+        self._last_count = 0
+
+    def discover(self, camera_prefix: str, active: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Retorna as câmeras (dicionários da API) dos grupos com o prefixo informado.
+
+        :param camera_prefix: Prefixo (sem diferenciar maiúsculas) do nome dos grupos.
+        :param active: Filtra câmeras ativas (True) ou inativas (False). None retorna todas.
+        :return: Lista de câmeras, ordenada por grupo e id.
+        :raises ConnectionError: Em falhas de comunicação com a API.
+        """
+        key = (camera_prefix.lower(), active)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+                self._cache_hits += 1
+                return list(cached[1])
+
+        start = time.perf_counter()
+        groups = [
+            g for g in self._fetch_all("/camera-groups/", {"ordering": "id"})
+            if g["name"].lower().startswith(key[0])
+        ]
+
+        def fetch_group(group: Dict[str, Any]) -> List[Dict[str, Any]]:
+            params = {
+                "camera_groups": str(group["id"]),
+                "external_detector": True,
+                "ordering": "id",
+            }
+            if active is not None:
+                params["active"] = active
+            return self._fetch_all("/cameras/", params)
+
+        cameras: List[Dict[str, Any]] = []
+        if groups:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(groups)),
+                thread_name_prefix="FindFaceDiscovery"
+            ) as pool:
+                for group_cameras in pool.map(fetch_group, groups):
+                    cameras.extend(group_cameras)
+
+        duration = time.perf_counter() - start
+        with self._lock:
+            self._results[key] = (time.monotonic(), cameras)
+            self._discoveries += 1
+            self._last_duration = duration
+            self._last_count = len(cameras)
+
+        self.logger.info(
+            f"Descoberta FindFace: {len(cameras)} câmera(s) em {len(groups)} grupo(s) "
+            f"em {duration * 1000:.0f}ms"
+        )
+        return list(cameras)
+
+    def invalidate(self) -> None:
+        """Descarta o resultado em cache (a próxima descoberta revalida as páginas)."""
+        with self._lock:
+            self._results.clear()
+
+    def _fetch_all(self, path: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Percorre todas as páginas de um endpoint de listagem."""
+        results: List[Dict[str, Any]] = []
+        cursor: Optional[str] = None
+        while True:
+            page_params = dict(params, limit=self.page_size)
+            if cursor is not None:
+                page_params["page"] = cursor
+            page = self._fetch_page(path, page_params)
+            results.extend(page.get("results", []))
+            cursor = self._page_cursor(page.get("next_page"))
+            if cursor is None:
+                return results
+
+    def _fetch_page(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Busca uma página, revalidando-a por ETag quando já conhecida."""
+        key = (path, tuple(sorted(params.items())))
+        with self._lock:
+            known = self._pages.get(key)
+
+        data, etag = self.client.get_conditional(path, params, etag=known[0] if known else None)
+        with self._lock:
+            if data is None:
+                # 304 Not Modified: página inalterada desde a última descoberta
+                self._pages_not_modified += 1
+                return known[1]
+            self._pages_fetched += 1
+            if etag:
+                self._pages[key] = (etag, data)
+        return data
+
+    @staticmethod
+    def _page_cursor(next_page: Optional[str]) -> Optional[str]:
+        """Extrai o cursor de ``next_page`` (cursor puro ou URL/query com ``page=``)."""
+        if not next_page:
+            return None
+        values = parse_qs(urlparse(str(next_page)).query).get("page")
+        return values[0] if values else str(next_page)
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas da descoberta.
+
+        :return: Dicionário com descobertas, acertos de cache, páginas buscadas,
+                 páginas revalidadas (304) e duração da última descoberta (ms).
+        """
+        with self._lock:
+            return {
+                'discoveries': self._discoveries,
+                'cache_hits': self._cache_hits,
+                'pages_fetched': self._pages_fetched,
+                'pages_not_modified': self._pages_not_modified,
+                'last_duration_ms': self._last_duration * 1000,
+                'last_camera_count': self._last_count,
+            }
@@ -1,5 +1,6 @@
 import requests
-from typing import Optional, List, Dict, Any, Union
+from requests.adapters import HTTPAdapter
+from typing import Optional, List, Dict, Any, Tuple, Union
 try:
     import urllib3
 except ModuleNotFoundError:  # pragma: no cover - library may be absent in tests
@@ -7,26 +8,83 @@ except ModuleNotFoundError:  # pragma: no cover - library may be absent in tests
 import mimetypes
 import io
 from pathlib import Path
+from collections import deque
+import threading
+import random
+import time
 import json
 
+from src.infrastructure.clients.circuit_breaker import CircuitBreaker
+from src.infrastructure.clients.findface_camera_discovery import FindfaceCameraDiscovery
+
 
 if urllib3 is not None:
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Requisição não enviada porque o circuit breaker do FindFace está aberto."""
+
+
 class FindfaceMulti:
     """
     Classe responsável por autenticar e interagir com a API do FindFace Multi.
     """
 
-    def __init__(self, url_base: str, user: str, password: str, uuid: str) -> None:
+    # Métodos que podem ser repetidos sem efeito colateral duplicado
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    # Respostas transitórias que justificam nova tentativa
+    RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+    def __init__(
+        self,
+        url_base: str,
+        user: str,
+        password: str,
+        uuid: str,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 2,
+        retry_backoff: float = 0.2,
+        retry_backoff_max: float = 2.0,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_timeout: float = 30.0,
+        discovery_page_size: int = 100,
+        discovery_workers: int = 8,
+        camera_cache_ttl: float = 60.0
+    ) -> None:
         """
         Inicializa a instância da classe e realiza o login automaticamente.
 
+        Todas as requisições usam uma única ``requests.Session`` com pool de conexões
+        keep-alive, evitando um novo handshake TCP/TLS a cada chamada.
+
+        Camada de resiliência aplicada a todas as requisições:
+
+        - métodos idempotentes são repetidos em falhas de rede e respostas 429/502/503/504,
+          com backoff exponencial e jitter; POST só é repetido quando a conexão nem
+          chegou a ser estabelecida;
+        - resposta 401 em requisição autenticada renova o token (novo login) e
+          repete a requisição uma vez;
+        - após falhas consecutivas, o circuit breaker recusa as requisições sem tentar
+          conectar até o servidor voltar a responder.
+
         :param url_base: URL base da API (ex: https://10.95.7.19)
         :param user: Nome de usuário da API
         :param password: Senha do usuário
         :param uuid: Identificador único do dispositivo
+        :param pool_size: Máximo de conexões mantidas no pool (use o número de workers de envio)
+        :param connect_timeout: Timeout (s) para estabelecer a conexão
+        :param read_timeout: Timeout (s) para leitura da resposta
+        :param max_retries: Novas tentativas em falhas transitórias (0 = sem repetição)
+        :param retry_backoff: Espera base (s) do backoff exponencial
+        :param retry_backoff_max: Espera máxima (s) entre tentativas
+        :param breaker_failure_threshold: Falhas consecutivas que abrem o circuito (0 = desativado)
+        :param breaker_reset_timeout: Tempo (s) com o circuito aberto antes de testar o servidor
+        :param discovery_page_size: Itens por página na descoberta de câmeras
+        :param discovery_workers: Grupos de câmeras buscados simultaneamente na descoberta
+        :param camera_cache_ttl: Validade (s) do cache da descoberta de câmeras
         """
         # Verificações de tipo
         if not isinstance(url_base, str):
@@ -37,6 +95,10 @@ class FindfaceMulti:
             raise TypeError("password deve ser uma string.")
         if not isinstance(uuid, str):
             raise TypeError("uuid deve ser uma string.")
+        if not isinstance(pool_size, int) or pool_size < 1:
+            raise ValueError("pool_size deve ser um inteiro maior que zero.")
+        if not isinstance(max_retries, int) or max_retries < 0:
+            raise ValueError("max_retries deve ser um inteiro maior ou igual a zero.")
 
         # Atributos da instância
         self.url_base: str = url_base.rstrip("/")
@@ -44,10 +106,224 @@ class FindfaceMulti:
         self.password: str = password
         self.uuid: str = uuid
         self.token: Optional[str] = None
+        self.pool_size: int = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries: int = max_retries
+        self.retry_backoff: float = retry_backoff
+        self.retry_backoff_max: float = retry_backoff_max
+        self.breaker = CircuitBreaker(breaker_failure_threshold, breaker_reset_timeout)
+        self._login_lock = threading.Lock()
+        self.camera_discovery = FindfaceCameraDiscovery(
+            self,
+            page_size=discovery_page_size,
+            max_workers=discovery_workers,
+            cache_ttl=camera_cache_ttl
+        )
+
+        # Sessão HTTP compartilhada por todas as threads (pool thread-safe do urllib3)
+        self.session = requests.Session()
+        self.session.headers["Connection"] = "keep-alive"
+        self._http_adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            pool_block=False
+        )
+        self.session.mount("https://", self._http_adapter)
+        self.session.mount("http://", self._http_adapter)
+
+        # Métricas de requisições HTTP
+        self._stats_lock = threading.Lock()
+        self._request_count = 0
+        self._error_count = 0
+        self._total_latency = 0.0
+        self._latencies = deque(maxlen=1000)
+        self._retry_count = 0
+        self._token_refreshes = 0
+        self._short_circuited = 0
 
         # Realiza login automaticamente
         self.login()
 
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Executa uma requisição HTTP aplicando a camada de resiliência
+        (circuit breaker, novas tentativas e renovação do token).
+
+        Aplica o timeout padrão da instância quando ``timeout`` não é informado.
+
+        :param method: Método HTTP.
+        :param url: URL completa.
+        :return: Resposta HTTP (a última obtida, se as tentativas se esgotarem).
+        :raises CircuitOpenError: Se o circuit breaker estiver aberto.
+        :raises requests.exceptions.RequestException: Em falhas de comunicação.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        method = method.upper()
+        idempotent = method in self.IDEMPOTENT_METHODS
+        # Cópia dos headers: o Authorization é trocado se o token for renovado
+        headers = dict(kwargs.get("headers") or {})
+        kwargs["headers"] = headers
+        refreshed = False
+        attempt = 0
+
+        while True:
+            if not self.breaker.allow():
+                with self._stats_lock:
+                    self._short_circuited += 1
+                raise CircuitOpenError(
+                    f"Circuit breaker aberto: FindFace indisponível em {self.url_base}, requisição não enviada"
+                )
+
+            try:
+                response = self._send_once(method, url, **kwargs)
+            except requests.exceptions.RequestException as exc:
+                self.breaker.record_failure()
+                # POST só é repetido se a conexão não foi estabelecida (requisição não chegou ao servidor)
+                retryable = idempotent or self._not_sent(exc)
+                if retryable and attempt < self.max_retries:
+                    attempt += 1
+                    self._wait_retry(attempt)
+                    continue
+                raise
+
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+            if response.status_code == 401 and not refreshed and "Authorization" in headers:
+                refreshed = True
+                self.refresh_token(headers["Authorization"])
+                headers["Authorization"] = f"Token {self.token}"
+                continue
+
+            if response.status_code in self.RETRY_STATUSES and idempotent and attempt < self.max_retries:
+                attempt += 1
+                self._wait_retry(attempt)
+                continue
+
+            return response
+
+    @staticmethod
+    def _not_sent(exc: requests.exceptions.RequestException) -> bool:
+        """
+        Indica se a falha ocorreu antes de a requisição chegar ao servidor: timeout de
+        conexão, conexão recusada ou falha de DNS. Mesma política do AsyncFindfaceMulti.
+
+        :param exc: Exceção levantada pelo requests.
+        :return: True se a conexão não foi estabelecida (nova tentativa segura para POST).
+        """
+        if isinstance(exc, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(exc, requests.exceptions.ConnectionError) and urllib3 is not None and exc.args:
+            reason = getattr(exc.args[0], "reason", None)
+            return isinstance(reason, urllib3.exceptions.NewConnectionError)
+        return False
+
+    def _wait_retry(self, attempt: int) -> None:
+        """Aguarda antes de uma nova tentativa (backoff exponencial com jitter completo)."""
+        with self._stats_lock:
+            self._retry_count += 1
+        delay = min(self.retry_backoff_max, self.retry_backoff * (2 ** (attempt - 1)))
+        time.sleep(random.uniform(0, delay))
+
+    def refresh_token(self, stale_authorization: Optional[str] = None) -> None:
+        """
+        Renova o token de autenticação com um novo login.
+
+        Seguro para várias threads: se outra thread já renovou o token usado na
+        requisição recusada, nenhum novo login é feito.
+
+        :param stale_authorization: Header Authorization recusado pelo servidor
+                                    (None = renova incondicionalmente).
+        :raises ConnectionError: Se o login falhar.
+        """
+        with self._login_lock:
+            if stale_authorization is not None and stale_authorization != f"Token {self.token}":
+                return
+            self.login()
+            with self._stats_lock:
+                self._token_refreshes += 1
+
+    def _send_once(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Executa uma única requisição HTTP pela sessão compartilhada, registrando a latência.
+
+        :raises requests.exceptions.RequestException: Em falhas de comunicação.
+        """
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            with self._stats_lock:
+                self._request_count += 1
+                self._error_count += 1
+            raise
+
+        latency = time.perf_counter() - start
+        with self._stats_lock:
+            self._request_count += 1
+            self._total_latency += latency
+            self._latencies.append(latency)
+        return response
+
+    def get_http_stats(self) -> Dict[str, Any]:
+        """
+        Retorna métricas das requisições HTTP realizadas pela sessão.
+
+        A taxa de reuso de conexões é calculada a partir dos contadores dos pools
+        do urllib3 (conexões abertas vs. requisições enviadas).
+
+        :return: Dicionário com total de requisições, erros, latências (ms), reuso de conexões,
+                 novas tentativas, renovações de token e estado do circuit breaker.
+        """
+        with self._stats_lock:
+            count = self._request_count
+            errors = self._error_count
+            retries = self._retry_count
+            token_refreshes = self._token_refreshes
+            short_circuited = self._short_circuited
+            total_latency = self._total_latency
+            latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            index = min(len(latencies) - 1, int(round(p * (len(latencies) - 1))))
+            return latencies[index] * 1000.0
+
+        connections_opened = 0
+        pool_requests = 0
+        pools = self._http_adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections_opened += getattr(pool, "num_connections", 0)
+            pool_requests += getattr(pool, "num_requests", 0)
+
+        succeeded = count - errors
+        return {
+            "requests": count,
+            "errors": errors,
+            "avg_latency_ms": (total_latency / succeeded * 1000.0) if succeeded else 0.0,
+            "p50_latency_ms": percentile(0.50),
+            "p95_latency_ms": percentile(0.95),
+            "p99_latency_ms": percentile(0.99),
+            "connections_opened": connections_opened,
+            "connection_reuse_rate": (
+                1.0 - connections_opened / pool_requests if pool_requests else 0.0
+            ),
+            "retries": retries,
+            "token_refreshes": token_refreshes,
+            "short_circuited": short_circuited,
+            "breaker_state": self.breaker.state,
+        }
+
+    def close(self) -> None:
+        """Fecha a sessão HTTP e libera as conexões do pool."""
+        self.session.close()
+
     def login(self) -> None:
         """
         Realiza o login na API do FindFace e armazena o token de autenticação.
@@ -68,7 +344,8 @@ class FindfaceMulti:
 
         # Requisição com autenticação básica (usuário + senha)
         try:
-            response = requests.post(
+            response = self._send(
+                "POST",
                 url,
                 auth=(self.user, self.password),
                 json=payload,
@@ -105,7 +382,8 @@ class FindfaceMulti:
         }
 
         try:
-            response = requests.post(
+            response = self._send(
+                "POST",
                 url,
                 headers=headers,
                 verify=False
@@ -131,7 +409,7 @@ class FindfaceMulti:
         headers["Authorization"] = f"Token {self.token}"
 
         try:
-            resp = requests.request(method, url, headers=headers, verify=False, **kwargs)
+            resp = self._send(method, url, headers=headers, verify=False, **kwargs)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro de conexão: {exc}") from exc
 
@@ -144,6 +422,53 @@ class FindfaceMulti:
         else:
             raise ConnectionError(f"Erro {resp.status_code} - {resp.text}")
 
+    def get_conditional(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        etag: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        GET autenticado com validação por ETag (``If-None-Match``).
+
+        :param path: Caminho do endpoint (ex.: ``/cameras/``).
+        :param params: Parâmetros de query.
+        :param etag: ETag da última resposta conhecida (opcional).
+        :return: Tupla (dados, etag); dados é None se o servidor responder 304 (não modificado).
+        :raises RuntimeError: Se o token de autenticação for inválido.
+        :raises ConnectionError: Em falhas de comunicação ou respostas de erro.
+        """
+        if not isinstance(self.token, str) or not self.token:
+            raise RuntimeError("Token de autenticação inválido ou ausente.")
+
+        url = f"{self.url_base}/{path.lstrip('/')}"
+        headers = {"Authorization": f"Token {self.token}"}
+        if etag:
+            headers["If-None-Match"] = etag
+
+        try:
+            resp = self._send("GET", url, headers=headers, params=params, verify=False)
+        except requests.exceptions.RequestException as exc:
+            raise ConnectionError(f"Erro de conexão: {exc}") from exc
+
+        if resp.status_code == 304 and etag:
+            return None, etag
+        if resp.status_code == 200:
+            return resp.json(), resp.headers.get("ETag")
+        raise ConnectionError(f"Erro {resp.status_code} - {resp.text}")
+
+    def discover_cameras(self, camera_prefix: str, active: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Lista as câmeras de detector externo dos grupos cujo nome começa com ``camera_prefix``,
+        percorrendo todas as páginas e buscando os grupos em paralelo (resultado em cache).
+
+        :param camera_prefix: Prefixo dos grupos de câmeras virtuais.
+        :param active: Filtra câmeras ativas (True) ou inativas (False). None retorna todas.
+        :return: Lista de câmeras retornadas pela API.
+        :raises ConnectionError: Em falhas de comunicação.
+        """
+        return self.camera_discovery.discover(camera_prefix, active=active)
+
 
     def get_human_cards(
         self,
@@ -227,7 +552,7 @@ class FindfaceMulti:
                 else:
                     params[key] = value
 
-        response = requests.get(url, headers=headers, params=params, verify=False)
+        response = self._send("GET", url, headers=headers, params=params, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -301,7 +626,7 @@ class FindfaceMulti:
             "Content-Type": "application/json"
         }
 
-        response = requests.post(url, headers=headers, json=data, verify=False)
+        response = self._send("POST", url, headers=headers, json=data, verify=False)
 
         if response.status_code in (200, 201):
             return response.json()
@@ -377,7 +702,7 @@ class FindfaceMulti:
             "Content-Type": "application/json"
         }
 
-        response = requests.patch(url, headers=headers, json=data, verify=False)
+        response = self._send("PATCH", url, headers=headers, json=data, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -408,7 +733,7 @@ class FindfaceMulti:
             "Authorization": f"Token {self.token}"
         }
 
-        response = requests.delete(url, headers=headers, verify=False)
+        response = self._send("DELETE", url, headers=headers, verify=False)
 
         if response.status_code == 204:
             return  # Sucesso silencioso
@@ -443,7 +768,7 @@ class FindfaceMulti:
             "Content-Type": "application/json"
         }
 
-        response = requests.get(url, headers=headers, verify=False)
+        response = self._send("GET", url, headers=headers, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -523,7 +848,7 @@ class FindfaceMulti:
             "attributes": (None, json.dumps(attributes), "application/json")
         }
 
-        response = requests.post(url, headers=headers, files=files, verify=False)
+        response = self._send("POST", url, headers=headers, files=files, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -634,7 +959,7 @@ class FindfaceMulti:
         if frame_coords_bottom is not None:
             data["frame_coords_bottom"] = str(frame_coords_bottom)
 
-        response = requests.post(url, headers=headers, files=files, data=data, verify=False)
+        response = self._send("POST", url, headers=headers, files=files, data=data, verify=False)
 
         if response.status_code == 201:
             return response.json()
@@ -780,7 +1105,7 @@ class FindfaceMulti:
                 else:
                     params[chave] = valor
 
-        response = requests.get(url, headers=headers, params=params, verify=False)
+        response = self._send("GET", url, headers=headers, params=params, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -862,7 +1187,7 @@ class FindfaceMulti:
             "Content-Type": "application/json",
         }
 
-        response = requests.post(url, headers=headers, json=data, verify=False)
+        response = self._send("POST", url, headers=headers, json=data, verify=False)
 
         if response.status_code in (200, 201):
             return response.json()
@@ -894,7 +1219,7 @@ class FindfaceMulti:
             "Content-Type": "application/json",
         }
 
-        response = requests.get(url, headers=headers, verify=False)
+        response = self._send("GET", url, headers=headers, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -924,7 +1249,7 @@ class FindfaceMulti:
         url: str = f"{self.url_base}/cards/cars/{card_id}/"
         headers: Dict[str, str] = {"Authorization": f"Token {self.token}"}
 
-        response = requests.delete(url, headers=headers, verify=False)
+        response = self._send("DELETE", url, headers=headers, verify=False)
 
         if response.status_code == 204:
             return
@@ -1009,7 +1334,7 @@ class FindfaceMulti:
             "Content-Type": "application/json",
         }
 
-        response = requests.patch(url, headers=headers, json=data, verify=False)
+        response = self._send("PATCH", url, headers=headers, json=data, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -1087,7 +1412,7 @@ class FindfaceMulti:
                     params[chave] = valor
 
         try:
-            response = requests.get(url, headers=headers, params=params, verify=False)
+            response = self._send("GET", url, headers=headers, params=params, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao buscar watch lists: {exc}") from exc
 
@@ -1140,7 +1465,7 @@ class FindfaceMulti:
         }
 
         try:
-            response = requests.post(url, headers=headers, json=data, verify=False)
+            response = self._send("POST", url, headers=headers, json=data, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao criar watch list: {exc}") from exc
 
@@ -1175,7 +1500,7 @@ class FindfaceMulti:
         }
 
         try:
-            response = requests.get(url, headers=headers, verify=False)
+            response = self._send("GET", url, headers=headers, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao buscar watch list {list_id}: {exc}") from exc
 
@@ -1208,7 +1533,7 @@ class FindfaceMulti:
         headers: Dict[str, str] = {"Authorization": f"Token {self.token}"}
 
         try:
-            response = requests.delete(url, headers=headers, verify=False)
+            response = self._send("DELETE", url, headers=headers, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao deletar watch list {list_id}: {exc}") from exc
 
@@ -1265,7 +1590,7 @@ class FindfaceMulti:
         }
 
         try:
-            response = requests.patch(url, headers=headers, json=data, verify=False)
+            response = self._send("PATCH", url, headers=headers, json=data, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao atualizar watch list {list_id}: {exc}") from exc
 
@@ -1296,7 +1621,7 @@ class FindfaceMulti:
         headers: Dict[str, str] = {"Authorization": f"Token {self.token}"}
 
         try:
-            response = requests.post(url, headers=headers, verify=False)
+            response = self._send("POST", url, headers=headers, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao limpar watch list {list_id}: {exc}") from exc
 
@@ -1368,7 +1693,7 @@ class FindfaceMulti:
                     params[chave] = valor
 
         try:
-            response = requests.get(url, headers=headers, params=params, verify=False)
+            response = self._send("GET", url, headers=headers, params=params, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao contar watch lists: {exc}") from exc
 
@@ -1390,7 +1715,7 @@ class FindfaceMulti:
         headers: Dict[str, str] = {"Authorization": f"Token {self.token}"}
 
         try:
-            response = requests.post(url, headers=headers, verify=False)
+            response = self._send("POST", url, headers=headers, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao purgar todas as watch lists: {exc}") from exc
 
@@ -2113,7 +2438,7 @@ class FindfaceMulti:
             data = data_list
 
         try:
-            response = requests.post(url, headers=headers, files=files, data=data, verify=False)
+            response = self._send("POST", url, headers=headers, files=files, data=data, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao criar evento de face: {exc}") from exc
 
@@ -0,0 +1,174 @@
+"""
+Cliente assíncrono (asyncio + aiohttp) para o endpoint de envio de eventos do FindFace Multi.
+Reutiliza a autenticação do cliente síncrono FindfaceMulti.
+"""
+
+import asyncio
+import random
+from typing import Optional, List, Dict, Any
+
+try:
+    import aiohttp
+except ModuleNotFoundError:  # pragma: no cover - dependência opcional
+    aiohttp = None
+
+from src.infrastructure.clients.findface_multi import FindfaceMulti
+
+
+class AsyncFindfaceMulti:
+    """
+    Cliente assíncrono para envio de eventos de face ao FindFace Multi.
+
+    Deve ser criado e utilizado dentro do mesmo event loop. O token de autenticação
+    é lido do cliente síncrono a cada requisição.
+    """
+
+    def __init__(self, client: FindfaceMulti, max_connections: int = 64) -> None:
+        """
+        Inicializa o cliente assíncrono.
+
+        :param client: Cliente síncrono já autenticado (fornece URL, token e timeouts).
+        :param max_connections: Máximo de conexões simultâneas no pool.
+        :raises RuntimeError: Se aiohttp não estiver instalado.
+        :raises TypeError: Se client não for FindfaceMulti.
+        """
+        if aiohttp is None:
+            raise RuntimeError("aiohttp não está instalado. Instale com: pip install aiohttp")
+        if not isinstance(client, FindfaceMulti):
+            raise TypeError("O parâmetro 'client' deve ser uma instância de FindfaceMulti.")
+
+        self.client = client
+        connect_timeout, read_timeout = client.timeout
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=max_connections, ssl=False),
+            timeout=aiohttp.ClientTimeout(connect=connect_timeout, sock_read=read_timeout)
+        )
+
+    @staticmethod
+    def is_available() -> bool:
+        """Verifica se a dependência aiohttp está instalada."""
+        return aiohttp is not None
+
+    async def add_face_event(
+        self,
+        token: str,
+        fullframe: bytes,
+        camera: Optional[int] = None,
+        timestamp: Optional[str] = None,
+        mf_selector: str = "all",
+        roi: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Cria eventos de face a partir de uma imagem JPEG (versão assíncrona de
+        ``FindfaceMulti.add_face_event``).
+
+        :param token: Token da API para criação de eventos.
+        :param fullframe: Imagem JPEG em bytes.
+        :param camera: ID da câmera relacionada (opcional).
+        :param timestamp: Timestamp do evento no formato ISO 8601 (opcional).
+        :param mf_selector: 'biggest' ou 'all'.
+        :param roi: Coordenadas ROI [left, top, right, bottom] (opcional).
+        :return: Dicionário com os dados retornados pela API.
+        :raises RuntimeError: Se o token de autenticação for inválido.
+        :raises ConnectionError: Em caso de falha na comunicação com a API.
+        """
+        if not isinstance(self.client.token, str) or not self.client.token:
+            raise RuntimeError("Token de autenticação inválido ou ausente.")
+
+        url = f"{self.client.url_base}/events/faces/add/"
+        breaker = self.client.breaker
+        refreshed = False
+        attempt = 0
+
+        # Mesma política de resiliência do cliente síncrono: circuit breaker compartilhado,
+        # renovação do token em 401 e nova tentativa apenas se a conexão não foi estabelecida
+        while True:
+            if not breaker.allow():
+                raise ConnectionError(
+                    f"Erro ao criar evento de face: circuit breaker aberto, "
+                    f"FindFace indisponível em {self.client.url_base}"
+                )
+
+            authorization = f"Token {self.client.token}"
+            try:
+                async with self._session.post(
+                    url,
+                    data=self._build_form(token, fullframe, camera, timestamp, mf_selector, roi),
+                    headers={"Authorization": authorization}
+                ) as response:
+                    status = response.status
+                    text = await response.text()
+                    if status == 200:
+                        breaker.record_success()
+                        return await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                breaker.record_failure()
+                if self._not_sent(exc) and attempt < self.client.max_retries:
+                    attempt += 1
+                    await asyncio.sleep(self._retry_delay(attempt))
+                    continue
+                raise ConnectionError(f"Erro ao criar evento de face: {exc}") from exc
+
+            if status >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            if status == 401 and not refreshed:
+                refreshed = True
+                # Login é bloqueante: executado fora do event loop
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self.client.refresh_token, authorization
+                )
+                continue
+
+            raise ConnectionError(f"Erro ao criar evento de face: {status} - {text}")
+
+    @staticmethod
+    def _build_form(
+        token: str,
+        fullframe: bytes,
+        camera: Optional[int],
+        timestamp: Optional[str],
+        mf_selector: str,
+        roi: Optional[List[int]]
+    ) -> "aiohttp.FormData":
+        """Monta o formulário multipart (um FormData só pode ser enviado uma vez)."""
+        form = aiohttp.FormData()
+        form.add_field("fullframe", fullframe, filename="fullframe.jpg", content_type="image/jpeg")
+        form.add_field("token", token)
+        form.add_field("mf_selector", mf_selector)
+        if camera is not None:
+            form.add_field("camera", str(camera))
+        if timestamp is not None:
+            form.add_field("timestamp", timestamp)
+        # ROI deve ser enviado como múltiplos campos com o mesmo nome
+        if roi is not None:
+            for valor in roi:
+                form.add_field("roi", str(valor))
+        return form
+
+    @staticmethod
+    def _not_sent(exc: BaseException) -> bool:
+        """
+        Indica se a falha ocorreu antes de a requisição chegar ao servidor: timeout de
+        conexão, conexão recusada ou falha de DNS (mesma política de ``FindfaceMulti._not_sent``).
+
+        :param exc: Exceção levantada pelo aiohttp.
+        :return: True se a conexão não foi estabelecida (nova tentativa segura para POST).
+        """
+        # ConnectionTimeoutError existe a partir do aiohttp 3.10; antes, o timeout de conexão
+        # não se distingue do de leitura e não é repetido
+        connect_timeout_error = getattr(aiohttp, "ConnectionTimeoutError", None)
+        if connect_timeout_error is not None and isinstance(exc, connect_timeout_error):
+            return True
+        return isinstance(exc, aiohttp.ClientConnectorError)
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Espera antes de uma nova tentativa (backoff exponencial com jitter completo)."""
+        delay = min(self.client.retry_backoff_max, self.client.retry_backoff * (2 ** (attempt - 1)))
+        return random.uniform(0, delay)
+
+    async def close(self) -> None:
+        """Fecha a sessão HTTP assíncrona."""
+        await self._session.close()
@@ -22,7 +22,11 @@ from .settings import (
     MovementConfig,
     TensorRTConfig,
     OpenVINOConfig,
-    PerformanceConfig
+    PerformanceConfig,
+    OutboxConfig,
+    DedupConfig,
+    TrackLogConfig,
+    StreamConfig
 )
 
 
@@ -84,12 +88,54 @@ class ConfigLoader:
         # Adiciona prefixo de câmera do YAML ao FindFace
         findface_config.camera_prefix = yaml_config.get("prefixo_grupo_camera_findface", "EXTERNO")
         
+        # Parâmetros de conexão HTTP com o FindFace
+        findface_yaml = yaml_config.get("findface", {})
+        findface_config.http_pool_size = findface_yaml.get("http_pool_size", 0)
+        findface_config.connect_timeout = findface_yaml.get("connect_timeout", 5.0)
+        findface_config.read_timeout = findface_yaml.get("read_timeout", 30.0)
+        findface_config.dispatcher = findface_yaml.get("dispatcher", "threads")
+        findface_config.workers = findface_yaml.get("workers", 0)
+        findface_config.max_in_flight = findface_yaml.get("max_in_flight", 64)
+        findface_config.upload_mode = findface_yaml.get("upload_mode", "fullframe")
+        findface_config.crop_context = findface_yaml.get("crop_context", 0.20)
+        findface_config.jpeg_quality = findface_yaml.get("jpeg_quality", 95)
+        findface_config.max_upload_bytes = findface_yaml.get("max_upload_bytes", 0)
+        findface_config.queue_policy = findface_yaml.get("queue_policy", "fifo")
+        findface_config.priority_age_weight = findface_yaml.get("priority_age_weight", 0.005)
+        findface_config.camera_weights = {
+            int(camera_id): float(weight)
+            for camera_id, weight in (findface_yaml.get("camera_weights") or {}).items()
+        }
+        findface_config.camera_caps = {
+            int(camera_id): int(cap)
+            for camera_id, cap in (findface_yaml.get("camera_caps") or {}).items()
+        }
+        findface_config.default_camera_cap = findface_yaml.get("default_camera_cap", 0)
+        findface_config.adaptive_concurrency = findface_yaml.get("adaptive_concurrency", False)
+        findface_config.initial_concurrency = findface_yaml.get("initial_concurrency", 4)
+        findface_config.min_concurrency = findface_yaml.get("min_concurrency", 1)
+        findface_config.max_concurrency = findface_yaml.get("max_concurrency", 64)
+        findface_config.latency_tolerance = findface_yaml.get("latency_tolerance", 2.0)
+        findface_config.max_retries = findface_yaml.get("max_retries", 2)
+        findface_config.retry_backoff = findface_yaml.get("retry_backoff", 0.2)
+        findface_config.retry_backoff_max = findface_yaml.get("retry_backoff_max", 2.0)
+        findface_config.breaker_failure_threshold = findface_yaml.get("breaker_failure_threshold", 5)
+        findface_config.breaker_reset_timeout = findface_yaml.get("breaker_reset_timeout", 30.0)
+        findface_config.discovery_page_size = findface_yaml.get("discovery_page_size", 100)
+        findface_config.discovery_workers = findface_yaml.get("discovery_workers", 8)
+        findface_config.camera_cache_ttl = findface_yaml.get("camera_cache_ttl", 60.0)
+        findface_config.camera_reconcile_interval = findface_yaml.get("camera_reconcile_interval", 60.0)
+        findface_config.max_idle_models = findface_yaml.get("max_idle_models", 2)
+        findface_config.camera_cache_path = findface_yaml.get("camera_cache_path", "./cache/cameras.json")
+        findface_config.camera_warm_start = findface_yaml.get("camera_warm_start", True)
+        
         # Monta configurações
         yolo_config = YOLOConfig(
             model_path=yaml_config.get("face_detection_model", "yolov8n-face.pt"),
             landmarks_model_path=yaml_config.get("landmarks_detection_model", "yolov8n-face.pt"),
             conf_threshold=yaml_config.get("conf", 0.1),
-            iou_threshold=yaml_config.get("iou", 0.2)
+            iou_threshold=yaml_config.get("iou", 0.2),
+            export_cache_dir=yaml_config.get("export_cache_dir", "")
         )
         
         bytetrack_config = ByteTrackConfig(
@@ -112,13 +158,31 @@ class ConfigLoader:
             gpu_batch_size=yaml_config.get("gpu_batch_size", 32),
             cpu_batch_size=yaml_config.get("cpu_batch_size", 4),
             show_video=yaml_config.get("show", True),
-            verbose_log=yaml_config.get("verbose_log", False)
+            verbose_log=yaml_config.get("verbose_log", False),
+            worker_processes=yaml_config.get("worker_processes", 0),
+            worker_restart_backoff=yaml_config.get("worker_restart_backoff", 1.0),
+            worker_restart_backoff_max=yaml_config.get("worker_restart_backoff_max", 60.0),
+            node_id=yaml_config.get("node_id", 0),
+            node_count=yaml_config.get("node_count", 1)
         )
         
+        storage_yaml = yaml_config.get("salvamento_imagens", {})
         storage_config = StorageConfig(
-            save_images=yaml_config.get("salvamento_imagens", {}).get("habilitado", True),
-            project_dir=yaml_config.get("salvamento_imagens", {}).get("project", yaml_config.get("project", "./imagens/")),
-            results_dir=yaml_config.get("salvamento_imagens", {}).get("name", yaml_config.get("name", "rtsp_byte_track_results"))
+            save_images=storage_yaml.get("habilitado", True),
+            project_dir=storage_yaml.get("project", yaml_config.get("project", "./imagens/")),
+            results_dir=storage_yaml.get("name", yaml_config.get("name", "rtsp_byte_track_results")),
+            save_mode=storage_yaml.get("modo", "full"),
+            jpeg_quality=storage_yaml.get("qualidade_jpeg", 95),
+            crop_context=storage_yaml.get("contexto_recorte", 0.5),
+            thumbnail_size=storage_yaml.get("tamanho_miniatura", 320),
+            layout=storage_yaml.get("layout", "sharded"),
+            annotate=storage_yaml.get("anotar", True),
+            archive_enabled=storage_yaml.get("arquivo_segmentos", {}).get("habilitado", False),
+            archive_segment_mb=storage_yaml.get("arquivo_segmentos", {}).get("tamanho_segmento_mb", 256),
+            archive_max_segments=storage_yaml.get("arquivo_segmentos", {}).get("max_segmentos", 0),
+            max_mb_per_camera=storage_yaml.get("cota_mb_por_camera", 0),
+            max_age_hours=storage_yaml.get("idade_maxima_horas", 72.0),
+            retention_interval=storage_yaml.get("intervalo_retencao", 60.0)
         )
         
         movement_config = MovementConfig(
@@ -151,7 +215,56 @@ class ConfigLoader:
             detection_skip_frames=yaml_config.get("performance", {}).get("detection_skip_frames", 1),
             max_parallel_workers=yaml_config.get("performance", {}).get("max_parallel_workers", 0),
             batch_quality_calculation=yaml_config.get("performance", {}).get("batch_quality_calculation", True),
-            findface_queue_size=yaml_config.get("performance", {}).get("findface_queue_size", 200)
+            findface_queue_size=yaml_config.get("performance", {}).get("findface_queue_size", 500),
+            image_save_queue_size=yaml_config.get("performance", {}).get("image_save_queue_size", 200),
+            image_save_encoders=yaml_config.get("performance", {}).get("image_save_encoders", 2),
+            image_save_writers=yaml_config.get("performance", {}).get("image_save_writers", 2),
+            shared_detection_model=yaml_config.get("performance", {}).get("shared_detection_model", False),
+            detection_model_replicas=yaml_config.get("performance", {}).get("detection_model_replicas", 1)
+        )
+        
+        # Configuração do outbox durável FindFace
+        outbox_yaml = yaml_config.get("outbox", {})
+        outbox_config = OutboxConfig(
+            enabled=outbox_yaml.get("enabled", False),
+            path=outbox_yaml.get("path", "./outbox/findface_outbox.db"),
+            max_size_mb=outbox_yaml.get("max_size_mb", 1024),
+            eviction=outbox_yaml.get("eviction", "oldest"),
+            replay_rate=outbox_yaml.get("replay_rate", 5.0),
+            batch_size=outbox_yaml.get("batch_size", 64),
+            flush_interval=outbox_yaml.get("flush_interval", 0.2),
+            close_timeout=outbox_yaml.get("close_timeout", 20.0)
+        )
+        
+        # Configuração da deduplicação de tracks fragmentados
+        dedup_yaml = yaml_config.get("dedup", {})
+        dedup_config = DedupConfig(
+            enabled=dedup_yaml.get("enabled", False),
+            horizon=dedup_yaml.get("horizon", 2.0),
+            max_gap=dedup_yaml.get("max_gap", 2.0),
+            max_distance=dedup_yaml.get("max_distance", 1.5),
+            max_hash_distance=dedup_yaml.get("max_hash_distance", 12),
+            max_hold=dedup_yaml.get("max_hold", 10.0)
+        )
+        
+        # Configuração do registro colunar de tracks finalizados
+        track_log_yaml = yaml_config.get("track_log", {})
+        track_log_config = TrackLogConfig(
+            enabled=track_log_yaml.get("enabled", False),
+            path=track_log_yaml.get("path", "./track_log"),
+            flush_interval=track_log_yaml.get("flush_interval", 30.0),
+            batch_size=track_log_yaml.get("batch_size", 10000),
+            max_buffer=track_log_yaml.get("max_buffer", 100000),
+            compress=track_log_yaml.get("compress", True)
+        )
+        
+        # Configuração do watchdog dos streams
+        stream_yaml = yaml_config.get("stream", {})
+        stream_config = StreamConfig(
+            stall_timeout=stream_yaml.get("stall_timeout", 10.0),
+            open_timeout=stream_yaml.get("open_timeout", 10.0),
+            reconnect_backoff=stream_yaml.get("reconnect_backoff", 1.0),
+            reconnect_backoff_max=stream_yaml.get("reconnect_backoff_max", 30.0)
         )
         
         # Carrega câmeras do YAML
@@ -176,5 +289,9 @@ class ConfigLoader:
             tensorrt=tensorrt_config,
             openvino=openvino_config,
             performance=performance_config,
-            cameras=cameras
+            cameras=cameras,
+            outbox=outbox_config,
+            dedup=dedup_config,
+            track_log=track_log_config,
+            stream=stream_config
         )
\ No newline at end of file
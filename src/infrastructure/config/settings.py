@@ -3,7 +3,7 @@ Objeto de configuração centralizado.
 Fornece acesso type-safe às configurações.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 
 
@@ -23,6 +23,7 @@ class YOLOConfig:
     landmarks_model_path: str = "yolov8n-face.pt"
     conf_threshold: float = 0.1
     iou_threshold: float = 0.2
+    export_cache_dir: str = ""  # Cache de modelos exportados (TensorRT/OpenVINO); vazio = "export_cache" ao lado dos pesos
 
 
 @dataclass
@@ -41,6 +42,38 @@ class FindFaceConfig:
     password: str
     uuid: str
     camera_prefix: str = "EXTERNO"
+    http_pool_size: int = 0  # Conexões no pool HTTP (0 = automático, igual ao nº de workers FindFace do processo)
+    connect_timeout: float = 5.0  # Timeout de conexão em segundos
+    read_timeout: float = 30.0  # Timeout de leitura em segundos
+    dispatcher: str = "threads"  # Modo de envio: "threads" (pool bloqueante) ou "async" (asyncio + aiohttp)
+    workers: int = 0  # Workers do modo "threads" / encoders JPEG do modo "async" (0 = automático)
+    max_in_flight: int = 64  # Máximo de envios simultâneos no modo "async"
+    upload_mode: str = "fullframe"  # Imagem enviada: "fullframe" (frame inteiro) ou "crop" (região da face)
+    crop_context: float = 0.20  # Expansão do recorte em torno da face no modo "crop" (fração do bbox)
+    jpeg_quality: int = 95  # Qualidade JPEG inicial da imagem enviada
+    max_upload_bytes: int = 0  # Orçamento máximo da imagem enviada em bytes (0 = sem limite)
+    queue_policy: str = "fifo"  # Ordem da fila de envio: "fifo", "priority" (qualidade e idade) ou "fair" (por câmera)
+    priority_age_weight: float = 0.005  # Perda de valor por segundo de espera nos modos "priority" e "fair"
+    camera_weights: Dict[int, float] = field(default_factory=dict)  # Peso por camera_id no modo "fair"
+    camera_caps: Dict[int, int] = field(default_factory=dict)  # Limite de eventos pendentes por camera_id
+    default_camera_cap: int = 0  # Limite padrão por câmera no modo "fair" (0 = apenas o limite total)
+    adaptive_concurrency: bool = False  # Ajusta envios simultâneos pela latência/erros do FindFace (AIMD)
+    initial_concurrency: int = 4  # Limite inicial de envios simultâneos (modo adaptativo)
+    min_concurrency: int = 1  # Limite mínimo de envios simultâneos (modo adaptativo)
+    max_concurrency: int = 64  # Teto de envios simultâneos (modo adaptativo; define workers/max_in_flight)
+    latency_tolerance: float = 2.0  # Razão latência média / linha de base que dispara a redução
+    max_retries: int = 2  # Novas tentativas em falhas transitórias (GET/PUT/DELETE; POST só sem conexão)
+    retry_backoff: float = 0.2  # Espera base (s) do backoff exponencial com jitter
+    retry_backoff_max: float = 2.0  # Espera máxima (s) entre tentativas
+    breaker_failure_threshold: int = 5  # Falhas consecutivas que abrem o circuit breaker (0 = desativado)
+    breaker_reset_timeout: float = 30.0  # Tempo (s) com o circuito aberto antes de testar o servidor
+    discovery_page_size: int = 100  # Itens por página na descoberta de câmeras (segue next_page)
+    discovery_workers: int = 8  # Grupos de câmeras buscados simultaneamente
+    camera_cache_ttl: float = 60.0  # Validade (s) do cache de câmeras; depois revalida por ETag
+    camera_reconcile_interval: float = 60.0  # Intervalo (s) da reconciliação de câmeras (0 = desativada)
+    max_idle_models: int = 2  # Modelos de detecção ociosos mantidos por GPU para câmeras novas
+    camera_cache_path: str = "./cache/cameras.json"  # Cache local da última lista de câmeras ("" = desativado)
+    camera_warm_start: bool = True  # Inicia pelas câmeras do cache e confirma no FindFace em segundo plano
 
 
 @dataclass
@@ -56,6 +89,11 @@ class ProcessingConfig:
             self.gpu_devices = [0]
     show_video: bool = True
     verbose_log: bool = False
+    worker_processes: int = 0  # Processos de trabalho (grupos de câmeras); 0 = todas as câmeras neste processo
+    worker_restart_backoff: float = 1.0  # Espera inicial (s) antes de reiniciar um processo que terminou
+    worker_restart_backoff_max: float = 60.0  # Espera máxima (s) entre reinícios
+    node_id: int = 0  # Índice deste nó (0 .. node_count - 1) na distribuição de câmeras entre hosts
+    node_count: int = 1  # Número de nós que dividem as câmeras (1 = este nó processa todas)
 
 
 @dataclass
@@ -64,6 +102,18 @@ class StorageConfig:
     save_images: bool = True
     project_dir: str = "./imagens/"
     results_dir: str = "rtsp_byte_track_results"
+    save_mode: str = "full"  # Imagem salva: "full" (frame inteiro), "crop" (recorte da face) ou "thumbnail"
+    jpeg_quality: int = 95  # Qualidade JPEG das imagens salvas
+    crop_context: float = 0.5  # Expansão do recorte em torno da face no modo "crop" (fração do bbox)
+    thumbnail_size: int = 320  # Maior lado (pixels) da imagem no modo "thumbnail"
+    layout: str = "sharded"  # Organização dos arquivos: "flat" ou "sharded" (câmera/data/hora)
+    annotate: bool = True  # Desenha bbox e rótulo na imagem salva
+    archive_enabled: bool = False  # Grava as imagens em segmentos append-only em vez de arquivos individuais
+    archive_segment_mb: int = 256  # Tamanho de rotação dos segmentos em MB
+    archive_max_segments: int = 0  # Máximo de segmentos mantidos (0 = sem limite)
+    max_mb_per_camera: int = 0  # Cota de disco por câmera em MB (0 = sem cota)
+    max_age_hours: float = 72.0  # Idade máxima das imagens em horas (0 = sem limite)
+    retention_interval: float = 60.0  # Intervalo (s) entre as aplicações da retenção
 
 
 @dataclass
@@ -87,7 +137,19 @@ class PerformanceConfig:
     detection_skip_frames: int = 1
     max_parallel_workers: int = 0
     batch_quality_calculation: bool = True
-    findface_queue_size: int = 200  # Tamanho da fila assíncrona FindFace
+    findface_queue_size: int = 500  # Capacidade da fila assíncrona FindFace (>= 1)
+    image_save_queue_size: int = 200  # Fila do salvamento de imagens (cheia = imagem descartada)
+    image_save_encoders: int = 2  # Threads de codificação JPEG do salvamento de imagens
+    image_save_writers: int = 2  # Threads de gravação em disco do salvamento de imagens
+    shared_detection_model: bool = False  # Um modelo por GPU compartilhado entre câmeras (tracker por câmera)
+    detection_model_replicas: int = 1  # Réplicas do modelo compartilhado por GPU (inferências simultâneas)
+
+    def __post_init__(self):
+        """Valida os valores carregados."""
+        if self.findface_queue_size < 1:
+            raise ValueError(
+                f"performance.findface_queue_size deve ser maior ou igual a 1, recebido: {self.findface_queue_size}"
+            )
 
 
 @dataclass
@@ -106,6 +168,50 @@ class OpenVINOConfig:
     precision: str = "FP16"  # FP16, FP32, INT8
 
 
+@dataclass
+class OutboxConfig:
+    """Configuração do outbox durável de eventos FindFace."""
+    enabled: bool = False
+    path: str = "./outbox/findface_outbox.db"  # Arquivo SQLite (modo WAL)
+    max_size_mb: int = 1024  # Tamanho máximo das imagens armazenadas
+    eviction: str = "oldest"  # Política ao exceder o limite: oldest, lowest_quality
+    replay_rate: float = 5.0  # Máximo de eventos reenviados por segundo após recuperação
+    batch_size: int = 64  # Eventos gravados por transação (um fsync por lote)
+    flush_interval: float = 0.2  # Tempo máximo (s) acumulando eventos antes do commit
+    close_timeout: float = 20.0  # Espera máxima (s) no encerramento pela gravação dos eventos em memória
+
+
+@dataclass
+class DedupConfig:
+    """Configuração da deduplicação de tracks fragmentados antes do envio ao FindFace."""
+    enabled: bool = False  # Desabilitada por padrão: um falso agrupamento descarta um rosto real
+    horizon: float = 2.0  # Tempo (s) que um evento aguarda fragmentos do mesmo rosto antes do envio
+    max_gap: float = 2.0  # Intervalo máximo (s) entre o fim de um fragmento e o início do próximo
+    max_distance: float = 1.5  # Distância máxima entre os fragmentos, em larguras de bbox
+    max_hash_distance: int = 12  # Distância de Hamming máxima entre os dHash dos recortes (0 a 64)
+    max_hold: float = 10.0  # Retenção máxima (s) de um evento enquanto sua continuação estiver ativa
+
+
+@dataclass
+class StreamConfig:
+    """Configuração do watchdog e da reconexão dos streams das câmeras."""
+    stall_timeout: float = 10.0  # Tempo máximo (s) sem frames antes de reabrir o stream (0 = desabilita)
+    open_timeout: float = 10.0  # Timeout (s) de socket das capturas RTSP do FFmpeg, inclusive na abertura (0 = padrão do FFmpeg)
+    reconnect_backoff: float = 1.0  # Espera inicial (s) antes de reconectar
+    reconnect_backoff_max: float = 30.0  # Espera máxima (s) entre reconexões de câmeras instáveis
+
+
+@dataclass
+class TrackLogConfig:
+    """Configuração do registro colunar (.npz) dos tracks finalizados e dos envios ao FindFace."""
+    enabled: bool = False
+    path: str = "./track_log"  # Diretório dos lotes .npz
+    flush_interval: float = 30.0  # Intervalo máximo (s) entre gravações de lote
+    batch_size: int = 10000  # Registros que antecipam a gravação do lote
+    max_buffer: int = 100000  # Máximo de registros pendentes por tabela (excedentes são descartados)
+    compress: bool = True  # Grava os lotes compactados (numpy.savez_compressed)
+
+
 @dataclass
 class AppSettings:
     """
@@ -123,6 +229,10 @@ class AppSettings:
     tensorrt: TensorRTConfig
     openvino: OpenVINOConfig
     cameras: List[CameraConfig]
+    outbox: OutboxConfig = field(default_factory=OutboxConfig)
+    dedup: DedupConfig = field(default_factory=DedupConfig)
+    track_log: TrackLogConfig = field(default_factory=TrackLogConfig)
+    stream: StreamConfig = field(default_factory=StreamConfig)
     
     @property
     def device(self) -> str:
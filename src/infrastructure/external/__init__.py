@@ -2,6 +2,6 @@
 Módulo de clientes para sistemas externos.
 """
 
-from .findface_client import create_findface_client
+from .findface_client import create_findface_client, default_findface_workers, findface_send_workers
 
-__all__ = ['create_findface_client']
+__all__ = ['create_findface_client', 'default_findface_workers', 'findface_send_workers']
@@ -2,20 +2,67 @@
 Factory para criar cliente FindFace Multi.
 """
 
+import multiprocessing
+
 from src.infrastructure.clients import FindfaceMulti
 from src.infrastructure.config.settings import FindFaceConfig
 
 
-def create_findface_client(config: FindFaceConfig) -> FindfaceMulti:
+def default_findface_workers() -> int:
+    """
+    Retorna o número padrão de workers de envio ao FindFace (N/2 CPUs, mínimo 4).
+    
+    :return: Número de workers.
+    """
+    return max(4, multiprocessing.cpu_count() // 2)
+
+
+def findface_send_workers(config: FindFaceConfig, group_count: int = 1) -> int:
+    """
+    Retorna o número de workers de envio (dispatcher "threads") de um processo.
+    
+    Usa ``workers`` (ou o padrão N/2 CPUs) e, com concorrência adaptativa, o teto
+    ``max_concurrency``; no modo multiprocesso o total é dividido entre os grupos.
+    
+    :param config: Configuração do FindFace.
+    :param group_count: Número de processos de trabalho que dividem a concorrência.
+    :return: Número de workers deste processo.
+    """
+    if config.adaptive_concurrency:
+        total = config.max_concurrency
+    else:
+        total = config.workers or default_findface_workers()
+    return max(1, -(-total // group_count))
+
+
+def create_findface_client(config: FindFaceConfig, group_count: int = 1) -> FindfaceMulti:
     """
     Cria e retorna uma instância configurada do cliente FindFace Multi.
     
+    O pool de conexões HTTP é dimensionado pelo número de workers de envio deste
+    processo (:func:`findface_send_workers`) quando ``http_pool_size`` é 0 (automático).
+    
+    Falhas transitórias são repetidas com backoff, o token é renovado em 401 e um
+    circuit breaker recusa requisições enquanto o servidor estiver fora do ar.
+    
     :param config: Configuração do FindFace.
+    :param group_count: Número de processos de trabalho (modo multiprocesso).
     :return: Cliente FindfaceMulti autenticado.
     """
     return FindfaceMulti(
         url_base=config.url_base,
         user=config.user,
         password=config.password,
-        uuid=config.uuid
+        uuid=config.uuid,
+        pool_size=config.http_pool_size or findface_send_workers(config, group_count),
+        connect_timeout=config.connect_timeout,
+        read_timeout=config.read_timeout,
+        max_retries=config.max_retries,
+        retry_backoff=config.retry_backoff,
+        retry_backoff_max=config.retry_backoff_max,
+        breaker_failure_threshold=config.breaker_failure_threshold,
+        breaker_reset_timeout=config.breaker_reset_timeout,
+        discovery_page_size=config.discovery_page_size,
+        discovery_workers=config.discovery_workers,
+        camera_cache_ttl=config.camera_cache_ttl
     )
@@ -0,0 +1,447 @@
+"""
+Servidor HTTP local que simula os endpoints do FindFace Multi usados pelo projeto.
+
+Permite medir a vazão do envio de eventos e exercitar cenários de falha sem um
+FindFace real: latência configurável (distribuições fixa, uniforme, normal,
+lognormal ou pareto), injeção de erros, expiração de token e limite de vazão.
+
+Endpoints simulados:
+- ``POST /auth/login/`` e ``POST /auth/logout/``
+- ``POST /events/faces/add/``
+- ``GET /cameras/`` (filtros ``camera_groups`` e ``active``)
+- ``GET /camera-groups/``
+
+As listagens são paginadas (``limit``/``page`` e cursor ``next_page``) e respondem
+com ``ETag``, devolvendo 304 quando ``If-None-Match`` coincide.
+
+Uso standalone::
+
+    python -m src.infrastructure.external.findface_mock_server --port 8080 --latency-ms 40
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import socket
+import threading
+import time
+import uuid as uuid_lib
+from collections import deque
+from datetime import datetime
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class FindfaceMockConfig:
+    """Comportamento simulado do servidor."""
+    latency_distribution: str = "lognormal"  # "fixed", "uniform", "normal", "lognormal" ou "pareto"
+    latency_ms: float = 30.0  # Latência mediana do envio de eventos (ms)
+    latency_jitter: float = 0.5  # Dispersão: fração da mediana (uniform/normal), sigma (lognormal) ou alfa (pareto)
+    error_rate: float = 0.0  # Fração de envios respondidos com erro 5xx
+    error_status: int = 503  # Código HTTP dos erros injetados
+    reject_rate: float = 0.0  # Fração de envios respondidos com 400 (ex.: nenhuma face detectada)
+    drop_rate: float = 0.0  # Fração de envios em que a conexão é fechada sem resposta
+    token_ttl: float = 0.0  # Validade do token em segundos (0 = nunca expira; expirado = 401)
+    max_rps: float = 0.0  # Vazão máxima de envios por segundo (0 = ilimitada; excedente = 429)
+    max_concurrency: int = 0  # Envios processados simultaneamente (0 = ilimitado; excedente aguarda)
+    num_groups: int = 2  # Grupos de câmeras com o prefixo configurado
+    cameras_per_group: int = 4  # Câmeras por grupo
+    camera_prefix: str = "EXTERNO"  # Prefixo dos nomes dos grupos
+    page_size: int = 0  # Itens por página em /cameras/ sem 'limit' (0 = todos)
+
+
+class FindfaceMockServer:
+    """
+    Servidor FindFace simulado em uma thread própria (``ThreadingHTTPServer``).
+
+    As câmeras são geradas a partir da configuração, com ``comment`` no formato
+    ``rtsp://`` e ``external_detector_token``, como esperado pelos repositórios.
+    """
+
+    DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "pareto")
+
+    def __init__(self, config: Optional[FindfaceMockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        :param config: Comportamento simulado (padrão: FindfaceMockConfig()).
+        :param host: Endereço de escuta.
+        :param port: Porta de escuta (0 = porta livre escolhida pelo sistema).
+        :raises ValueError: Se a distribuição de latência for inválida.
+        """
+        self.config = config or FindfaceMockConfig()
+        if self.config.latency_distribution not in self.DISTRIBUTIONS:
+            raise ValueError(
+                f"latency_distribution deve ser um de {self.DISTRIBUTIONS}, "
+                f"recebido: {self.config.latency_distribution}"
+            )
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._tokens: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+        self._concurrency = (
+            threading.BoundedSemaphore(self.config.max_concurrency) if self.config.max_concurrency > 0 else None
+        )
+
+        # Limite de vazão (token bucket)
+        self._bucket = float(self.config.max_rps)
+        self._bucket_updated = time.monotonic()
+
+        # Estatísticas
+        self._counters: Dict[str, int] = {}
+        self._service_times = deque(maxlen=100000)
+        self._accepted_at = deque(maxlen=100000)
+        self._event_delays = deque(maxlen=100000)
+
+        self._groups, self._cameras = self._build_cameras()
+
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """URL base do servidor (ex.: http://127.0.0.1:8080)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        """Inicia o servidor em uma thread daemon."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._server.serve_forever, name="FindFaceMock", daemon=True)
+        self._thread.start()
+        self.logger.info(f"FindFace simulado escutando em {self.url}")
+
+    def stop(self) -> None:
+        """Para o servidor e libera a porta."""
+        if self._thread is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5.0)
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Dados simulados
+    # ------------------------------------------------------------------
+
+    def _build_cameras(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        groups = []
+        cameras = []
+        camera_id = 1
+        for group_index in range(1, self.config.num_groups + 1):
+            groups.append({"id": group_index, "name": f"{self.config.camera_prefix}-{group_index:02d}"})
+            for _ in range(self.config.cameras_per_group):
+                cameras.append({
+                    "id": camera_id,
+                    "name": f"CAM-{camera_id:03d}",
+                    "group": group_index,
+                    "active": True,
+                    "external_detector": True,
+                    "external_detector_token": uuid_lib.uuid4().hex,
+                    "comment": f"rtsp://127.0.0.1:8554/cam{camera_id}",
+                })
+                camera_id += 1
+        return groups, cameras
+
+    # ------------------------------------------------------------------
+    # Comportamento simulado
+    # ------------------------------------------------------------------
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def _sample_latency(self) -> float:
+        """Sorteia a latência de um envio (segundos) conforme a distribuição configurada."""
+        median = self.config.latency_ms / 1000.0
+        jitter = self.config.latency_jitter
+        distribution = self.config.latency_distribution
+        if median <= 0:
+            return 0.0
+        with self._lock:
+            if distribution == "fixed":
+                value = median
+            elif distribution == "uniform":
+                value = self._rng.uniform(median * (1 - jitter), median * (1 + jitter))
+            elif distribution == "normal":
+                value = self._rng.gauss(median, median * jitter)
+            elif distribution == "lognormal":
+                value = self._rng.lognormvariate(math.log(median), jitter)
+            else:
+                # Pareto com mediana igual a latency_ms (cauda longa; jitter é o alfa)
+                alpha = max(jitter, 0.1)
+                value = median / (2 ** (1 / alpha)) * self._rng.paretovariate(alpha)
+        return max(0.0, value)
+
+    def _take_rate_token(self) -> bool:
+        """Consome uma vaga do limite de vazão (token bucket com rajada de 1 s)."""
+        if self.config.max_rps <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._bucket = min(
+                self.config.max_rps,
+                self._bucket + (now - self._bucket_updated) * self.config.max_rps
+            )
+            self._bucket_updated = now
+            if self._bucket < 1.0:
+                return False
+            self._bucket -= 1.0
+            return True
+
+    def _roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < rate
+
+    def _issue_token(self) -> str:
+        token = uuid_lib.uuid4().hex
+        with self._lock:
+            self._tokens[token] = time.monotonic()
+        return token
+
+    def _is_authorized(self, authorization: Optional[str]) -> bool:
+        if not authorization or not authorization.startswith("Token "):
+            return False
+        token = authorization[len("Token "):]
+        with self._lock:
+            issued_at = self._tokens.get(token)
+        if issued_at is None:
+            return False
+        return self.config.token_ttl <= 0 or time.monotonic() - issued_at < self.config.token_ttl
+
+    def revoke_tokens(self) -> None:
+        """Invalida todos os tokens emitidos (simula expiração ou reinício do servidor)."""
+        with self._lock:
+            self._tokens.clear()
+
+    # ------------------------------------------------------------------
+    # Handlers
+    # ------------------------------------------------------------------
+
+    def _handle_add_face_event(self, handler: "BaseHTTPRequestHandler", body: bytes) -> None:
+        if not self._take_rate_token():
+            self._count("throttled")
+            handler.send_json(429, {"desc": "Request was throttled"})
+            return
+
+        if self._roll(self.config.drop_rate):
+            self._count("dropped")
+            handler.close_connection = True
+            handler.connection.shutdown(socket.SHUT_RDWR)
+            return
+
+        if self._concurrency is not None:
+            self._concurrency.acquire()
+        start = time.monotonic()
+        try:
+            time.sleep(self._sample_latency())
+        finally:
+            if self._concurrency is not None:
+                self._concurrency.release()
+
+        if self._roll(self.config.error_rate):
+            self._count("errors")
+            handler.send_json(self.config.error_status, {"desc": "Injected server error"})
+            return
+
+        if b'name="fullframe"' not in body or self._roll(self.config.reject_rate):
+            self._count("rejected")
+            handler.send_json(
+                400, {"desc": 'Zero objects(type="face") detected on the provided image', "param": "fullframe"}
+            )
+            return
+
+        # Atraso fim a fim: do timestamp do evento (captura) até o aceite pelo servidor
+        delay = None
+        match = re.search(rb'name="timestamp"\r\n\r\n([^\r]+)\r\n', body)
+        if match:
+            try:
+                captured_at = datetime.fromisoformat(match.group(1).decode())
+                delay = (datetime.now(captured_at.tzinfo) - captured_at).total_seconds()
+            except ValueError:
+                pass
+
+        with self._lock:
+            self._service_times.append(time.monotonic() - start)
+            self._accepted_at.append(time.monotonic())
+            if delay is not None:
+                self._event_delays.append(delay)
+        self._count("accepted")
+        handler.send_json(200, {"events": [uuid_lib.uuid4().hex], "objects": {"face": [{"id": uuid_lib.uuid4().hex}]}})
+
+    def _handle_cameras(self, handler: "BaseHTTPRequestHandler", query: Dict[str, List[str]]) -> None:
+        cameras = self._cameras
+        if "camera_groups" in query:
+            groups = {int(g) for g in query["camera_groups"][0].split(",") if g}
+            cameras = [c for c in cameras if c["group"] in groups]
+        if "active" in query:
+            active = query["active"][0].lower() == "true"
+            cameras = [c for c in cameras if c["active"] == active]
+
+        self._count("camera_requests")
+        handler.send_json_cached(self._paginate(cameras, query))
+
+    def _paginate(self, items: List[Dict[str, Any]], query: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Monta uma página de listagem (cursor ``next_page`` = deslocamento do próximo item)."""
+        limit = int(query.get("limit", [self.config.page_size])[0] or 0)
+        offset = int(query.get("page", ["0"])[0] or 0)
+        page = items[offset:offset + limit] if limit > 0 else items[offset:]
+        next_offset = offset + len(page)
+        next_page = str(next_offset) if limit > 0 and next_offset < len(items) else None
+        return {"results": page, "next_page": next_page, "prev_page": None}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, como o FindFace real
+
+            def log_message(self, format, *args):  # noqa: A002 - assinatura da classe base
+                server.logger.debug("%s - %s" % (self.address_string(), format % args))
+
+            def send_json(self, status: int, data: Dict[str, Any]) -> None:
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def send_json_cached(self, data: Dict[str, Any]) -> None:
+                """Responde com ETag; 304 se o cliente já possui a mesma versão."""
+                body = json.dumps(data).encode("utf-8")
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    server._count("not_modified")
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_body(self) -> bytes:
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length) if length else b""
+
+            def do_POST(self):
+                body = self._read_body()
+                path = urlparse(self.path).path
+                if path == "/auth/login/":
+                    server._count("logins")
+                    self.send_json(200, {"token": server._issue_token()})
+                    return
+                if not server._is_authorized(self.headers.get("Authorization")):
+                    server._count("unauthorized")
+                    self.send_json(401, {"desc": "Invalid token."})
+                    return
+                if path == "/auth/logout/":
+                    self.send_response(204)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                elif path == "/events/faces/add/":
+                    server._handle_add_face_event(self, body)
+                else:
+                    self.send_json(404, {"desc": "Not found."})
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if not server._is_authorized(self.headers.get("Authorization")):
+                    server._count("unauthorized")
+                    self.send_json(401, {"desc": "Invalid token."})
+                    return
+                query = parse_qs(parsed.query)
+                if parsed.path == "/cameras/":
+                    server._handle_cameras(self, query)
+                elif parsed.path == "/camera-groups/":
+                    server._count("camera_group_requests")
+                    self.send_json_cached(server._paginate(server._groups, query))
+                elif re.fullmatch(r"/cameras/\d+/", parsed.path):
+                    camera_id = int(parsed.path.strip("/").split("/")[1])
+                    camera = next((c for c in server._cameras if c["id"] == camera_id), None)
+                    if camera is None:
+                        self.send_json(404, {"desc": "Not found."})
+                    else:
+                        self.send_json(200, camera)
+                else:
+                    self.send_json(404, {"desc": "Not found."})
+
+        return Handler
+
+    # ------------------------------------------------------------------
+    # Estatísticas
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> dict:
+        """
+        Retorna contadores e tempos de serviço do servidor simulado.
+
+        :return: Dicionário com contadores por resultado, vazão aceita no último
+                 segundo, tempos de serviço e atraso fim a fim dos eventos
+                 (timestamp do evento até o aceite), em ms.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            service = sorted(self._service_times)
+            delays = sorted(self._event_delays)
+            now = time.monotonic()
+            recent = sum(1 for t in self._accepted_at if now - t <= 1.0)
+
+        def percentile(values: List[float], p: float) -> float:
+            if not values:
+                return 0.0
+            return values[min(len(values) - 1, int(round(p * (len(values) - 1))))] * 1000.0
+
+        counters.update({
+            'accepted_last_second': recent,
+            'service_p50_ms': percentile(service, 0.50),
+            'service_p99_ms': percentile(service, 0.99),
+            'end_to_end_p50_ms': percentile(delays, 0.50),
+            'end_to_end_p95_ms': percentile(delays, 0.95),
+            'end_to_end_p99_ms': percentile(delays, 0.99),
+        })
+        return counters
+
+
+def main() -> int:
+    """Executa o servidor simulado até Ctrl+C."""
+    defaults = FindfaceMockConfig()
+    parser = argparse.ArgumentParser(description="Servidor FindFace Multi simulado")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    config = FindfaceMockConfig(**{name: getattr(args, name) for name in asdict(defaults)})
+    server = FindfaceMockServer(config, host=args.host, port=args.port)
+    server.start()
+    try:
+        while True:
+            time.sleep(10)
+            server.logger.info(f"Estatísticas: {server.get_stats()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -6,9 +6,14 @@ Módulo de infraestrutura para modelos de detecção.
 from src.infrastructure.model.model_factory import ModelFactory
 from src.infrastructure.model.yolo_model_adapter import YOLOModelAdapter
 from src.infrastructure.model.openvino_model_adapter import OpenVINOModelAdapter
+from src.infrastructure.model.shared_detection_model import SharedDetectionModel, CameraTrackingModel
+from src.infrastructure.model.capture_options import configure_capture_timeout
 
 __all__ = [
     "ModelFactory",
     "YOLOModelAdapter",
-    "OpenVINOModelAdapter"
+    "OpenVINOModelAdapter",
+    "SharedDetectionModel",
+    "CameraTrackingModel",
+    "configure_capture_timeout"
 ]
\ No newline at end of file
@@ -0,0 +1,53 @@
+# src/infrastructure/model/capture_options.py
+"""
+Timeouts de abertura/leitura das capturas de vídeo (backend FFmpeg do OpenCV).
+O ultralytics cria o ``cv2.VideoCapture`` internamente (sem parâmetros de abertura);
+as opções do FFmpeg chegam a ele pela variável OPENCV_FFMPEG_CAPTURE_OPTIONS.
+"""
+
+import logging
+import os
+import re
+
+import cv2
+
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_OPTIONS_ENV = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
+
+
+def _avformat_major() -> int:
+    """Versão principal do libavformat usado pelo OpenCV (0 se desconhecida)."""
+    match = re.search(r"avformat:\s*YES\s*\((\d+)\.", cv2.getBuildInformation())
+    return int(match.group(1)) if match else 0
+
+
+def configure_capture_timeout(timeout: float) -> str:
+    """
+    Define o timeout de socket das capturas RTSP do FFmpeg (abertura e leituras).
+
+    Sem ele, um ``cv2.VideoCapture`` reabrindo uma câmera que não responde pode ficar
+    bloqueado indefinidamente antes de existir uma fonte para o watchdog fechar.
+    A opção se chama ``timeout`` a partir do FFmpeg 5 (libavformat 59) e ``stimeout``
+    antes disso (no FFmpeg 4, ``timeout`` coloca o RTSP em modo de escuta).
+    Opções já presentes em OPENCV_FFMPEG_CAPTURE_OPTIONS são mantidas.
+
+    :param timeout: Timeout em segundos (0 = não altera as opções).
+    :return: Valor final de OPENCV_FFMPEG_CAPTURE_OPTIONS.
+    """
+    current = os.environ.get(CAPTURE_OPTIONS_ENV, "")
+    if timeout <= 0:
+        return current
+
+    key = "timeout" if _avformat_major() >= 59 else "stimeout"
+    options = [option for option in current.split("|") if option]
+    if any(option.split(";", 1)[0] in ("timeout", "stimeout") for option in options):
+        logger.info(f"{CAPTURE_OPTIONS_ENV} já define timeout; mantido: {current}")
+        return current
+
+    options.append(f"{key};{int(timeout * 1_000_000)}")
+    value = "|".join(options)
+    os.environ[CAPTURE_OPTIONS_ENV] = value
+    logger.info(f"Timeout das capturas FFmpeg: {timeout:.0f}s ({CAPTURE_OPTIONS_ENV}={value})")
+    return value
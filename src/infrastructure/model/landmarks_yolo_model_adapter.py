@@ -4,7 +4,7 @@ Adapter para modelos YOLO de detecção de landmarks faciais.
 Implementa a interface ILandmarksModel usando Ultralytics YOLO.
 """
 
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import numpy as np
 from ultralytics import YOLO
 
@@ -78,11 +78,58 @@ class LandmarksYOLOModelAdapter(ILandmarksModel):
             # Executa inferência
             results = self.model(face_crop, conf=conf, verbose=verbose)
             
-            # Valida resultados
-            if len(results) == 0 or results[0].boxes is None or len(results[0].boxes) == 0:
+            if len(results) == 0:
                 return None
             
-            result = results[0]
+            return self._parse_result(results[0])
+            
+        except Exception as e:
+            if verbose:
+                print(f"Erro na inferência de landmarks: {e}")
+            return None
+    
+    def predict_batch(
+        self,
+        face_crops: List[np.ndarray],
+        conf: float = 0.5,
+        verbose: bool = False
+    ) -> List[Optional[Tuple[np.ndarray, float]]]:
+        """
+        Executa inferência de landmarks em lote (um único forward pass para todos os crops).
+        
+        :param face_crops: Lista de crops de faces em formato BGR.
+        :param conf: Threshold de confiança mínima.
+        :param verbose: Se deve exibir logs detalhados.
+        :return: Lista com um resultado (landmarks, confidence) ou None por crop.
+        :raises Exception: Se a inferência do lote falhar (o chamador registra e contabiliza).
+        """
+        outputs: List[Optional[Tuple[np.ndarray, float]]] = [None] * len(face_crops)
+        valid_indexes = [i for i, crop in enumerate(face_crops) if crop.size > 0]
+        
+        if not valid_indexes:
+            return outputs
+        
+        results = self.model(
+            [face_crops[i] for i in valid_indexes],
+            conf=conf,
+            verbose=verbose
+        )
+        for i, result in zip(valid_indexes, results):
+            outputs[i] = self._parse_result(result)
+        
+        return outputs
+    
+    def _parse_result(self, result) -> Optional[Tuple[np.ndarray, float]]:
+        """
+        Extrai landmarks e confiança da detecção mais confiante de um resultado YOLO.
+        
+        :param result: Resultado Ultralytics de um crop.
+        :return: Tupla (landmarks, confidence) ou None.
+        """
+        try:
+            # Valida resultados
+            if result.boxes is None or len(result.boxes) == 0:
+                return None
             
             # Pega a primeira detecção (mais confiante)
             box = result.boxes[0]
@@ -104,9 +151,7 @@ class LandmarksYOLOModelAdapter(ILandmarksModel):
             
             return (landmarks, confidence)
             
-        except Exception as e:
-            if verbose:
-                print(f"Erro na inferência de landmarks: {e}")
+        except Exception:
             return None
     
     def get_model_info(self) -> dict:
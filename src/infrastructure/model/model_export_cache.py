@@ -0,0 +1,245 @@
+# src/infrastructure/model/model_export_cache.py
+"""
+Cache de modelos exportados (TensorRT, OpenVINO) endereçado por conteúdo.
+A chave combina o hash dos pesos com os parâmetros de exportação e as versões das
+bibliotecas; a exportação é feita por um único processo (lock em arquivo).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+logger = logging.getLogger(__name__)
+
+
+class ModelExportCache:
+    """
+    Mantém os artefatos exportados em ``root/{stem}-{formato}-{chave}/`` junto a um
+    ``manifest.json`` com a chave, os parâmetros, as versões e os arquivos gerados.
+
+    - chave = sha256(hash dos pesos + formato + parâmetros de exportação + versões):
+      pesos alterados, outra precisão/imgsz/batch ou outra versão do ultralytics/
+      TensorRT/OpenVINO (ou outra GPU, no TensorRT) geram outra entrada, nunca
+      reaproveitam um artefato antigo;
+    - um lock em arquivo por chave garante que apenas um processo (ou thread) exporte;
+      os demais aguardam e usam o resultado;
+    - a exportação é feita em um diretório temporário (cópia dos pesos, sem colidir com
+      outras exportações) e publicada por rename atômico, com o manifesto já gravado:
+      uma entrada sem manifesto válido nunca é usada;
+    - uma entrada cujo manifesto não confere (chave ou arquivos) é descartada com aviso
+      e exportada novamente.
+    """
+
+    MANIFEST = "manifest.json"
+    MANIFEST_VERSION = 1
+
+    # Serializa threads do mesmo processo (o lock em arquivo cobre os demais processos)
+    _thread_lock = threading.Lock()
+
+    def __init__(self, root: str, lock_timeout: float = 3600.0):
+        """
+        :param root: Diretório do cache.
+        :param lock_timeout: Espera máxima (s) por uma exportação em andamento em outro processo.
+        """
+        self.root = Path(root)
+        self.lock_timeout = lock_timeout
+
+    @staticmethod
+    def file_sha256(path: Path) -> str:
+        """
+        Calcula o sha256 de um arquivo.
+
+        :param path: Caminho do arquivo.
+        :return: Hash hexadecimal.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def key(self, weights_sha256: str, export_format: str, export_args: dict, versions: Dict[str, str]) -> str:
+        """
+        Calcula a chave de uma exportação.
+
+        :param weights_sha256: Hash dos pesos originais.
+        :param export_format: Formato do ultralytics (ex.: "engine", "openvino").
+        :param export_args: Parâmetros de ``YOLO.export``.
+        :param versions: Versões das bibliotecas (e do hardware) que afetam o artefato.
+        :return: Chave hexadecimal.
+        """
+        payload = json.dumps(
+            {
+                "weights": weights_sha256,
+                "format": export_format,
+                "args": export_args,
+                "versions": versions,
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get_or_export(
+        self,
+        weights_path: str,
+        export_format: str,
+        export_args: dict,
+        versions: Dict[str, str],
+        export: Callable[[str], str]
+    ) -> Path:
+        """
+        Retorna o artefato exportado do cache, exportando-o se necessário.
+
+        :param weights_path: Caminho dos pesos originais (.pt).
+        :param export_format: Formato do ultralytics (ex.: "engine", "openvino").
+        :param export_args: Parâmetros de exportação (compõem a chave).
+        :param versions: Versões das bibliotecas (compõem a chave).
+        :param export: Função que exporta os pesos informados e retorna o caminho do artefato
+                       (arquivo ou diretório, gerado ao lado dos pesos).
+        :return: Caminho do artefato (arquivo ou diretório) pronto para ``YOLO(...)``.
+        :raises TimeoutError: Se o lock não for obtido em lock_timeout segundos.
+        """
+        weights = Path(weights_path)
+        weights_sha256 = self.file_sha256(weights)
+        key = self.key(weights_sha256, export_format, export_args, versions)
+        entry = self.root / f"{weights.stem}-{export_format}-{key[:16]}"
+
+        artifact = self._load(entry, key)
+        if artifact is not None:
+            logger.info(f"Modelo exportado encontrado no cache: {artifact}")
+            return artifact
+
+        with self._thread_lock, self._file_lock(entry.with_name(entry.name + ".lock")):
+            # Outro processo pode ter exportado enquanto aguardávamos o lock
+            artifact = self._load(entry, key)
+            if artifact is not None:
+                logger.info(f"Modelo exportado por outro processo encontrado no cache: {artifact}")
+                return artifact
+
+            if entry.exists():
+                logger.warning(f"Entrada do cache inválida ou incompleta descartada: {entry}")
+                shutil.rmtree(entry, ignore_errors=True)
+
+            staging = entry.with_name(f".{entry.name}.tmp-{os.getpid()}")
+            shutil.rmtree(staging, ignore_errors=True)
+            staging.mkdir(parents=True)
+            try:
+                # Exporta a partir de uma cópia dos pesos: os arquivos gerados ficam no
+                # diretório temporário, sem colidir com outras exportações dos mesmos pesos
+                staged_weights = staging / weights.name
+                shutil.copy2(weights, staged_weights)
+                exported = Path(export(str(staged_weights)))
+                if staging.resolve() not in exported.resolve().parents:
+                    raise RuntimeError(f"Artefato exportado fora do diretório temporário: {exported}")
+
+                # Mantém apenas o artefato (pesos copiados e intermediários, ex.: .onnx, saem)
+                for item in staging.iterdir():
+                    if item.name != exported.name:
+                        shutil.rmtree(item) if item.is_dir() else item.unlink()
+
+                manifest = {
+                    "manifest_version": self.MANIFEST_VERSION,
+                    "key": key,
+                    "weights": str(weights),
+                    "weights_sha256": weights_sha256,
+                    "format": export_format,
+                    "args": export_args,
+                    "versions": versions,
+                    "artifact": exported.name,
+                    "files": self._files(staging / exported.name),
+                    "created_at": time.time(),
+                }
+                with open(staging / self.MANIFEST, "w", encoding="utf-8") as f:
+                    json.dump(manifest, f, indent=2, sort_keys=True, default=str)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                # Publicação atômica: a entrada aparece completa (com manifesto) ou não aparece
+                os.replace(staging, entry)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+            logger.info(f"Modelo exportado e armazenado no cache: {entry / exported.name}")
+            return entry / exported.name
+
+    def _load(self, entry: Path, key: str) -> Optional[Path]:
+        """Retorna o artefato da entrada se o manifesto existir e conferir (None caso contrário)."""
+        try:
+            with open(entry / self.MANIFEST, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Manifesto ilegível em {entry}: {e}")
+            return None
+
+        if manifest.get("manifest_version") != self.MANIFEST_VERSION or manifest.get("key") != key:
+            logger.warning(f"Manifesto de {entry} não corresponde à chave esperada; artefato ignorado")
+            return None
+        artifact = entry / manifest.get("artifact", "")
+        try:
+            files = self._files(artifact)
+        except OSError:
+            files = None
+        if not manifest.get("artifact") or files != manifest.get("files"):
+            logger.warning(f"Arquivos de {entry} diferem do manifesto; artefato ignorado")
+            return None
+        return artifact
+
+    @staticmethod
+    def _files(artifact: Path) -> Dict[str, int]:
+        """Tamanho de cada arquivo do artefato (arquivo único ou diretório)."""
+        if artifact.is_file():
+            return {artifact.name: artifact.stat().st_size}
+        return {
+            str(path.relative_to(artifact)): path.stat().st_size
+            for path in sorted(artifact.rglob("*"))
+            if path.is_file()
+        }
+
+    @contextmanager
+    def _file_lock(self, path: Path) -> Iterator[None]:
+        """Lock exclusivo entre processos (flock/msvcrt) com espera limitada."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + self.lock_timeout
+        waiting_logged = False
+        with open(path, "a+b") as f:
+            while True:
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    else:
+                        f.seek(0)
+                        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"Tempo esgotado aguardando o lock de exportação: {path}")
+                    if not waiting_logged:
+                        logger.info(f"Exportação em andamento em outro processo; aguardando ({path})")
+                        waiting_logged = True
+                    time.sleep(1.0)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -7,15 +7,11 @@ Decide qual implementação usar baseado na disponibilidade do OpenVINO.
 import logging
 from typing import Optional
 from pathlib import Path
-import threading
 
 from src.domain.services.model_interface import IDetectionModel
-from ultralytics import YOLO
 
 logger = logging.getLogger(__name__)
 
-_model_init_lock = threading.Lock()
-
 
 class ModelFactory:
     """
@@ -90,7 +86,9 @@ class ModelFactory:
         tensorrt_workspace: int = 4,
         use_openvino: bool = True,
         openvino_device: str = "AUTO",
-        openvino_precision: str = "FP16"
+        openvino_precision: str = "FP16",
+        imgsz: int = 640,
+        export_cache_dir: Optional[str] = None
     ) -> IDetectionModel:
         """
         Cria uma instância de modelo de detecção.
@@ -107,6 +105,8 @@ class ModelFactory:
         :param use_openvino: Se deve tentar usar OpenVINO (padrão: True).
         :param openvino_device: Dispositivo OpenVINO (AUTO, CPU, GPU, etc).
         :param openvino_precision: Precisão do modelo OpenVINO (FP16, FP32, INT8).
+        :param imgsz: Tamanho da imagem de inferência (shape dos modelos exportados).
+        :param export_cache_dir: Diretório do cache de modelos exportados (padrão: ao lado dos pesos).
         :return: Instância de IDetectionModel.
         """
         from src.infrastructure.model.yolo_model_adapter import YOLOModelAdapter
@@ -125,7 +125,9 @@ class ModelFactory:
                 return TensorRTModelAdapter(
                     model_path=str(model_path_obj),
                     precision=tensorrt_precision,
-                    workspace=tensorrt_workspace
+                    workspace=tensorrt_workspace,
+                    imgsz=imgsz,
+                    cache_dir=export_cache_dir
                 )
             except Exception as e:
                 logger.warning(
@@ -143,7 +145,9 @@ class ModelFactory:
                 return OpenVINOModelAdapter(
                     model_path=str(model_path_obj),
                     device=openvino_device,
-                    precision=openvino_precision
+                    precision=openvino_precision,
+                    imgsz=imgsz,
+                    cache_dir=export_cache_dir
                 )
             except Exception as e:
                 logger.warning(
@@ -154,9 +158,3 @@ class ModelFactory:
         # 3. Fallback: usa implementação padrão YOLO
         logger.info("Carregando modelo com implementação padrão YOLO")
         return YOLOModelAdapter(model_path=str(model_path_obj))
-
-def create_yolo_model(model_path: str, **kwargs):
-    with _model_init_lock:
-        # dentro do lock fazemos a importação/instanciação que não é thread-safe
-        model = YOLO(model_path, **kwargs)
-    return model
\ No newline at end of file
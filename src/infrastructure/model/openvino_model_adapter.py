@@ -4,12 +4,13 @@ Adaptador para modelos YOLO otimizados com OpenVINO.
 """
 
 import logging
-from typing import Iterator, Any
+from typing import Iterator, Any, List, Optional
 from pathlib import Path
 
 from ultralytics import YOLO
 
 from src.domain.services.model_interface import IDetectionModel
+from src.infrastructure.model.model_export_cache import ModelExportCache
 
 
 logger = logging.getLogger(__name__)
@@ -25,7 +26,10 @@ class OpenVINOModelAdapter(IDetectionModel):
         self,
         model_path: str,
         device: str = "AUTO",
-        precision: str = "FP16"
+        precision: str = "FP16",
+        imgsz: int = 640,
+        batch: int = 1,
+        cache_dir: Optional[str] = None
     ):
         """
         Inicializa o adaptador OpenVINO.
@@ -33,67 +37,70 @@ class OpenVINOModelAdapter(IDetectionModel):
         :param model_path: Caminho para o arquivo do modelo.
         :param device: Dispositivo OpenVINO (AUTO, CPU, GPU, NPU, etc).
         :param precision: Precisão do modelo (FP16, FP32, INT8).
+        :param imgsz: Tamanho da imagem do modelo exportado (shape estático; igual ao de inferência).
+        :param batch: Tamanho de batch do modelo exportado.
+        :param cache_dir: Diretório do cache de exportação (padrão: "export_cache" ao lado dos pesos).
         """
         self.model_path = model_path
         self.device = device
         self.precision = precision
+        self.imgsz = imgsz
+        self.batch = batch
+        self.export_cache = ModelExportCache(
+            cache_dir if cache_dir is not None else str(Path(model_path).parent / "export_cache")
+        )
+        self.export_path: Optional[Path] = None
         self._model = self._load_openvino_model()
         
         logger.info(
             f"Modelo OpenVINO carregado: {model_path} "
-            f"(device={device}, precision={precision})"
+            f"(device={device}, precision={precision}, imgsz={imgsz}, batch={batch})"
         )
     
     def _load_openvino_model(self) -> YOLO:
         """
-        Carrega e exporta o modelo para OpenVINO.
+        Carrega o modelo OpenVINO do cache de exportação, exportando-o se necessário.
         
-        O modelo OpenVINO é exportado uma vez e reutilizado. O dispositivo OpenVINO
-        (AUTO, CPU, GPU, NPU) é selecionado automaticamente pelo runtime do OpenVINO
-        durante a inferência, não durante o carregamento do modelo.
+        O modelo é reutilizado apenas se pesos, parâmetros de exportação e versões
+        (ultralytics, OpenVINO) forem os mesmos (ver ModelExportCache). O dispositivo
+        OpenVINO (AUTO, CPU, GPU, NPU) é selecionado automaticamente pelo runtime do
+        OpenVINO durante a inferência, não durante o carregamento do modelo.
         
         :return: Modelo YOLO otimizado com OpenVINO.
         """
-        model_path_obj = Path(self.model_path)
+        import openvino
+        import ultralytics
         
-        # Determina o caminho do modelo OpenVINO exportado
-        openvino_model_dir = model_path_obj.parent / f"{model_path_obj.stem}_openvino_model"
-        openvino_model_path = openvino_model_dir / f"{model_path_obj.stem}.xml"
+        export_args = {
+            "half": self.precision == "FP16",  # FP16 precision
+            "int8": self.precision == "INT8",  # INT8 precision
+            "imgsz": self.imgsz,
+            "batch": self.batch,
+            "dynamic": False,  # Static shapes para melhor performance
+            "simplify": True,
+        }
+        versions = {
+            "ultralytics": ultralytics.__version__,
+            "openvino": openvino.__version__,
+        }
         
-        # Se o modelo OpenVINO já existe, carrega diretamente
-        if openvino_model_path.exists():
-            logger.info(
-                f"Modelo OpenVINO já exportado encontrado: {openvino_model_dir} "
-                f"(device será selecionado automaticamente: {self.device})"
-            )
-            # IMPORTANTE: Ultralytics espera o caminho do DIRETÓRIO, não do arquivo .xml
-            model = YOLO(str(openvino_model_dir), task="detect")
-            logger.info(f"Modelo OpenVINO carregado com {len(model.names)} classes: {list(model.names.values())}")
-        else:
-            # Carrega o modelo original e exporta para OpenVINO
-            logger.info(f"Carregando modelo original: {self.model_path}")
-            original_model = YOLO(self.model_path)
-            
+        def export(weights_path: str) -> str:
             logger.info(
                 f"Exportando modelo para OpenVINO "
-                f"(precisão={self.precision}, device={self.device})..."
+                f"(precisão={self.precision}, device={self.device}, imgsz={self.imgsz})..."
             )
-            
             # export() retorna o caminho do DIRETÓRIO contendo os arquivos .xml e .bin
-            export_path = original_model.export(
-                format="openvino",
-                half=(self.precision == "FP16"),  # FP16 precision
-                int8=(self.precision == "INT8"),  # INT8 precision
-                dynamic=False,  # Static shapes para melhor performance
-                simplify=True
-            )
-            
-            logger.info(f"Modelo exportado com sucesso para: {export_path}")
-            
-            # Recarrega o modelo exportado
-            model = YOLO(export_path, task="detect")
-            logger.info(f"Modelo OpenVINO carregado com {len(model.names)} classes: {list(model.names.values())}")
+            return YOLO(weights_path).export(format="openvino", **export_args)
         
+        self.export_path = self.export_cache.get_or_export(
+            self.model_path, "openvino", export_args, versions, export
+        )
+        # IMPORTANTE: Ultralytics espera o caminho do DIRETÓRIO, não do arquivo .xml
+        model = YOLO(str(self.export_path), task="detect")
+        logger.info(
+            f"Modelo OpenVINO carregado com {len(model.names)} classes: {list(model.names.values())} "
+            f"(device será selecionado automaticamente: {self.device})"
+        )
         return model
     
     def track(
@@ -139,6 +146,43 @@ class OpenVINOModelAdapter(IDetectionModel):
             imgsz=imgsz
         )
     
+    def predict(
+        self,
+        images: List[Any],
+        conf: float = 0.1,
+        iou: float = 0.2,
+        imgsz: int = 640
+    ) -> List[Any]:
+        """
+        Realiza apenas a detecção usando modelo OpenVINO (sem tracker) em um lote de imagens.
+        """
+        return self._model.predict(
+            source=images,
+            conf=conf,
+            iou=iou,
+            verbose=False,
+            imgsz=imgsz
+        )
+    
+    def reset_tracker(self) -> None:
+        """
+        Descarta os trackers persistidos no predictor do ultralytics.
+        Na próxima chamada de ``track``, novos trackers são criados para a nova fonte.
+        """
+        predictor = getattr(self._model, "predictor", None)
+        if predictor is not None and hasattr(predictor, "trackers"):
+            del predictor.trackers
+    
+    def abort_stream(self) -> None:
+        """
+        Fecha a fonte de vídeo do predictor do ultralytics (threads de leitura e capturas).
+        O iterador de ``track`` em andamento termina em seguida.
+        """
+        predictor = getattr(self._model, "predictor", None)
+        dataset = getattr(predictor, "dataset", None)
+        if dataset is not None and hasattr(dataset, "close"):
+            dataset.close()
+    
     def get_model_info(self) -> dict:
         """
         Retorna informações sobre o modelo OpenVINO.
@@ -150,6 +194,7 @@ class OpenVINOModelAdapter(IDetectionModel):
             "device": self.device,
             "precision": self.precision,
             "optimization": "OpenVINO",
+            "export_path": str(self.export_path),
             "classes": len(self._model.names),
             "show_disabled": "Desabilitado para evitar erros de metadados"
         }
\ No newline at end of file
@@ -0,0 +1,214 @@
+# src/infrastructure/model/shared_detection_model.py
+"""
+Modelo de detecção compartilhado entre câmeras, com tracker ByteTrack por câmera.
+Separa o estado do tracker (por câmera) dos pesos do modelo (um por dispositivo).
+"""
+
+import logging
+import time
+from queue import Queue
+from threading import Lock
+from typing import Any, Iterator, List, Optional
+
+import cv2
+import torch
+from ultralytics.data.build import load_inference_source
+from ultralytics.trackers.track import TRACKER_MAP
+from ultralytics.utils import IterableSimpleNamespace
+from ultralytics.utils.checks import check_yaml
+
+try:
+    from ultralytics.utils import YAML
+    _load_yaml = YAML.load
+except ImportError:  # versões anteriores do ultralytics
+    from ultralytics.utils import yaml_load as _load_yaml
+
+from src.domain.services.model_interface import IDetectionModel
+
+
+logger = logging.getLogger(__name__)
+
+
+class SharedDetectionModel:
+    """
+    Pool pequeno de réplicas de um modelo de detecção carregadas em um dispositivo.
+
+    O predictor do ultralytics não é thread-safe: cada chamada de ``predict`` usa uma
+    réplica ociosa com exclusividade (com uma réplica, equivale a um lock). Várias
+    câmeras compartilham as réplicas; memória e tempo de carga deixam de crescer com
+    o número de câmeras.
+
+    Custo: não há batch entre câmeras - cada frame é uma chamada de ``predict`` com
+    batch 1 (as engines TensorRT são exportadas com shape estático). Com uma réplica,
+    todas as câmeras da GPU disputam uma única fila de inferência; a espera por uma
+    réplica é medida em ``get_stats()``.
+    """
+
+    def __init__(self, replicas: List[IDetectionModel]):
+        """
+        :param replicas: Modelos já carregados no mesmo dispositivo (ao menos um).
+        :raises ValueError: Se nenhuma réplica for informada.
+        """
+        if not replicas:
+            raise ValueError("replicas deve conter ao menos um modelo")
+        self.replicas = list(replicas)
+        self._idle: "Queue[IDetectionModel]" = Queue()
+        for replica in self.replicas:
+            self._idle.put(replica)
+        self._lock = Lock()
+        self._calls = 0
+        self._images = 0
+        self._waiting = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def predict(self, images: List[Any], conf: float, iou: float, imgsz: int) -> List[Any]:
+        """
+        Detecta faces em um lote de imagens usando uma réplica ociosa (bloqueia até haver uma).
+
+        :param images: Lista de imagens (arrays BGR).
+        :param conf: Threshold de confiança.
+        :param iou: Threshold de IOU do NMS.
+        :param imgsz: Tamanho da imagem para inferência.
+        :return: Lista de resultados de detecção (um por imagem).
+        """
+        started = time.monotonic()
+        with self._lock:
+            self._waiting += 1
+        replica = self._idle.get()
+        wait = time.monotonic() - started
+        with self._lock:
+            self._waiting -= 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+        try:
+            return replica.predict(images, conf=conf, iou=iou, imgsz=imgsz)
+        finally:
+            self._idle.put(replica)
+            with self._lock:
+                self._calls += 1
+                self._images += len(images)
+
+    def get_model_info(self) -> dict:
+        """Informações do modelo (da primeira réplica) acrescidas do número de réplicas."""
+        info = dict(self.replicas[0].get_model_info())
+        info["replicas"] = len(self.replicas)
+        return info
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas de uso.
+
+        :return: Dicionário com chamadas de inferência, imagens processadas, réplicas
+                 ociosas, câmeras aguardando uma réplica e a espera média/máxima (ms).
+        """
+        with self._lock:
+            return {
+                'calls': self._calls,
+                'images': self._images,
+                'replicas': len(self.replicas),
+                'idle': self._idle.qsize(),
+                'waiting': self._waiting,
+                'avg_wait_ms': self._wait_total / self._calls * 1000 if self._calls else 0.0,
+                'max_wait_ms': self._wait_max * 1000,
+            }
+
+
+class CameraTrackingModel(IDetectionModel):
+    """
+    Modelo de uma câmera sobre um SharedDetectionModel: lê a fonte de vídeo, detecta
+    com o modelo compartilhado e mantém o seu próprio tracker (BYTETracker/BoT-SORT do
+    ultralytics), reproduzindo o que ``YOLO.track(persist=True)`` faz no predictor.
+
+    Objetos leves (sem pesos): um por câmera, reaproveitáveis via DetectionModelPool.
+    """
+
+    def __init__(self, shared_model: SharedDetectionModel):
+        """
+        :param shared_model: Modelo compartilhado do dispositivo.
+        """
+        self.shared_model = shared_model
+        self._tracker = None
+        self._tracker_config: Optional[str] = None
+        self._dataset = None
+
+    def _create_tracker(self, tracker: str):
+        """Cria o tracker a partir do arquivo de configuração (ex.: bytetrack.yaml)."""
+        cfg = IterableSimpleNamespace(**_load_yaml(check_yaml(tracker)))
+        if cfg.tracker_type not in TRACKER_MAP:
+            raise ValueError(
+                f"tracker_type deve ser um de {tuple(TRACKER_MAP)}, recebido: {cfg.tracker_type}"
+            )
+        return TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=30)
+
+    def track(
+        self,
+        source: str,
+        tracker: str,
+        persist: bool = True,
+        conf: float = 0.1,
+        iou: float = 0.2,
+        show: bool = False,
+        stream: bool = True,
+        batch: int = 4,
+        verbose: bool = False,
+        imgsz: int = 640
+    ) -> Iterator[Any]:
+        """
+        Realiza tracking lendo a fonte nesta thread e detectando com o modelo compartilhado.
+
+        O ``batch`` não se aplica: cada frame é detectado assim que lido (o tracker
+        precisa dos frames em ordem e a fila do modelo é compartilhada entre câmeras).
+        """
+        if self._tracker is None or not persist or tracker != self._tracker_config:
+            self._tracker = self._create_tracker(tracker)
+            self._tracker_config = tracker
+
+        dataset = load_inference_source(source=source, batch=1, vid_stride=1, buffer=False)
+        self._dataset = dataset
+        window = f"Camera {source}"
+        try:
+            for item in dataset:
+                images = item[1]
+                results = self.shared_model.predict(images, conf=conf, iou=iou, imgsz=imgsz)
+                for result in results:
+                    result = self._update_tracker(result)
+                    if show:
+                        cv2.imshow(window, result.plot())
+                        cv2.waitKey(1)
+                    yield result
+        finally:
+            self._dataset = None
+            if hasattr(dataset, "close"):
+                dataset.close()
+            if show:
+                cv2.destroyWindow(window)
+
+    def _update_tracker(self, result: Any) -> Any:
+        """Associa as detecções aos tracks (IDs em ``result.boxes.id``), como o callback do ultralytics."""
+        det = result.boxes.cpu().numpy()
+        tracks = self._tracker.update(det, result.orig_img)
+        if len(tracks) == 0:
+            return result
+        idx = tracks[:, -1].astype(int)
+        result = result[idx]
+        result.update(boxes=torch.as_tensor(tracks[:, :-1]))
+        return result
+
+    def reset_tracker(self) -> None:
+        """Descarta o tracker desta câmera; o modelo compartilhado não é afetado."""
+        self._tracker = None
+
+    def abort_stream(self) -> None:
+        """Fecha a fonte de vídeo em leitura; o iterador de ``track`` termina em seguida."""
+        dataset = self._dataset
+        if dataset is not None and hasattr(dataset, "close"):
+            dataset.close()
+
+    def get_model_info(self) -> dict:
+        """
+        Retorna informações do modelo compartilhado.
+        """
+        info = self.shared_model.get_model_info()
+        info["shared"] = True
+        return info
@@ -5,12 +5,13 @@ TensorRT é a solução de inferência de alta performance da NVIDIA para GPUs C
 """
 
 import logging
-from typing import Iterator, Any
+from typing import Iterator, Any, List, Optional
 from pathlib import Path
 
 from ultralytics import YOLO
 
 from src.domain.services.model_interface import IDetectionModel
+from src.infrastructure.model.model_export_cache import ModelExportCache
 
 
 logger = logging.getLogger(__name__)
@@ -26,7 +27,10 @@ class TensorRTModelAdapter(IDetectionModel):
         self,
         model_path: str,
         precision: str = "FP16",
-        workspace: int = 4
+        workspace: int = 4,
+        imgsz: int = 640,
+        batch: int = 1,
+        cache_dir: Optional[str] = None
     ):
         """
         Inicializa o adaptador TensorRT.
@@ -34,63 +38,71 @@ class TensorRTModelAdapter(IDetectionModel):
         :param model_path: Caminho para o arquivo do modelo.
         :param precision: Precisão do modelo (FP16, FP32, INT8).
         :param workspace: Workspace em GB para otimizações TensorRT (padrão: 4GB).
+        :param imgsz: Tamanho da imagem da engine (shape estático; igual ao de inferência).
+        :param batch: Tamanho de batch da engine.
+        :param cache_dir: Diretório do cache de exportação (padrão: "export_cache" ao lado dos pesos).
         """
         self.model_path = model_path
         self.precision = precision
         self.workspace = workspace
+        self.imgsz = imgsz
+        self.batch = batch
+        self.export_cache = ModelExportCache(
+            cache_dir if cache_dir is not None else str(Path(model_path).parent / "export_cache")
+        )
+        self.engine_path: Optional[Path] = None
         self._model = self._load_tensorrt_model()
         
         logger.info(
             f"Modelo TensorRT carregado: {model_path} "
-            f"(precision={precision}, workspace={workspace}GB)"
+            f"(precision={precision}, workspace={workspace}GB, imgsz={imgsz}, batch={batch})"
         )
     
     def _load_tensorrt_model(self) -> YOLO:
         """
-        Carrega e exporta o modelo para TensorRT.
+        Carrega o modelo TensorRT do cache de exportação, exportando-o se necessário.
         
-        O modelo TensorRT é exportado uma vez e reutilizado. Oferece a melhor
-        performance em GPUs NVIDIA com CUDA.
+        A engine é reutilizada apenas se pesos, parâmetros de exportação, versões
+        (ultralytics, TensorRT, torch) e GPU forem os mesmos; caso contrário, uma nova
+        engine é exportada (por um único processo, ver ModelExportCache).
         
         :return: Modelo YOLO otimizado com TensorRT.
         """
-        model_path_obj = Path(self.model_path)
+        import tensorrt
+        import torch
+        import ultralytics
         
-        # Determina o caminho do modelo TensorRT exportado
-        tensorrt_model_path = model_path_obj.parent / f"{model_path_obj.stem}.engine"
+        export_args = {
+            "half": self.precision == "FP16",  # FP16 precision
+            "int8": self.precision == "INT8",  # INT8 precision
+            "workspace": self.workspace,  # Workspace em GB
+            "imgsz": self.imgsz,
+            "batch": self.batch,
+            "dynamic": False,  # Static shapes para melhor performance
+            "simplify": True,
+        }
+        # A engine é específica da versão do TensorRT e da GPU em que foi gerada
+        versions = {
+            "ultralytics": ultralytics.__version__,
+            "tensorrt": tensorrt.__version__,
+            "torch": torch.__version__,
+            "gpu": torch.cuda.get_device_name(),
+            "compute_capability": ".".join(map(str, torch.cuda.get_device_capability())),
+        }
         
-        # Se o modelo TensorRT já existe, carrega diretamente
-        if tensorrt_model_path.exists():
-            logger.info(f"Modelo TensorRT já exportado encontrado: {tensorrt_model_path}")
-            model = YOLO(str(tensorrt_model_path), task="detect")
-            logger.info(f"Modelo TensorRT carregado com {len(model.names)} classes: {list(model.names.values())}")
-        else:
-            # Carrega o modelo original e exporta para TensorRT
-            logger.info(f"Carregando modelo original: {self.model_path}")
-            original_model = YOLO(self.model_path)
-            
+        def export(weights_path: str) -> str:
             logger.info(
                 f"Exportando modelo para TensorRT "
-                f"(precisão={self.precision}, workspace={self.workspace}GB)..."
+                f"(precisão={self.precision}, workspace={self.workspace}GB, imgsz={self.imgsz})..."
             )
-            
             # export() retorna o caminho do arquivo .engine
-            export_path = original_model.export(
-                format="engine",
-                half=(self.precision == "FP16"),  # FP16 precision
-                int8=(self.precision == "INT8"),  # INT8 precision
-                workspace=self.workspace,  # Workspace em GB
-                dynamic=False,  # Static shapes para melhor performance
-                simplify=True,
-                verbose=True
-            )
-            
-            logger.info(f"Modelo exportado com sucesso para: {export_path}")
-            
-            # Recarrega o modelo exportado
-            model = YOLO(export_path, task="detect")
-            logger.info(f"Modelo TensorRT carregado com {len(model.names)} classes: {list(model.names.values())}")
+            return YOLO(weights_path).export(format="engine", verbose=True, **export_args)
         
+        self.engine_path = self.export_cache.get_or_export(
+            self.model_path, "engine", export_args, versions, export
+        )
+        model = YOLO(str(self.engine_path), task="detect")
+        logger.info(f"Modelo TensorRT carregado com {len(model.names)} classes: {list(model.names.values())}")
         return model
     
     def track(
@@ -125,6 +137,43 @@ class TensorRTModelAdapter(IDetectionModel):
             imgsz=imgsz
         )
     
+    def predict(
+        self,
+        images: List[Any],
+        conf: float = 0.1,
+        iou: float = 0.2,
+        imgsz: int = 640
+    ) -> List[Any]:
+        """
+        Realiza apenas a detecção usando modelo TensorRT (sem tracker) em um lote de imagens.
+        """
+        return self._model.predict(
+            source=images,
+            conf=conf,
+            iou=iou,
+            verbose=False,
+            imgsz=imgsz
+        )
+    
+    def reset_tracker(self) -> None:
+        """
+        Descarta os trackers persistidos no predictor do ultralytics.
+        Na próxima chamada de ``track``, novos trackers são criados para a nova fonte.
+        """
+        predictor = getattr(self._model, "predictor", None)
+        if predictor is not None and hasattr(predictor, "trackers"):
+            del predictor.trackers
+    
+    def abort_stream(self) -> None:
+        """
+        Fecha a fonte de vídeo do predictor do ultralytics (threads de leitura e capturas).
+        O iterador de ``track`` em andamento termina em seguida.
+        """
+        predictor = getattr(self._model, "predictor", None)
+        dataset = getattr(predictor, "dataset", None)
+        if dataset is not None and hasattr(dataset, "close"):
+            dataset.close()
+    
     def get_model_info(self) -> dict:
         """
         Retorna informações sobre o modelo TensorRT.
@@ -136,5 +185,6 @@ class TensorRTModelAdapter(IDetectionModel):
             "device": "cuda",
             "precision": self.precision,
             "optimization": f"TensorRT (workspace={self.workspace}GB)",
+            "engine": str(self.engine_path),
             "performance": "Maximum (NVIDIA GPU optimized)"
         }
@@ -4,7 +4,7 @@ Adaptador para modelos YOLO padrão (PyTorch).
 """
 
 import logging
-from typing import Iterator, Any
+from typing import Iterator, Any, List
 
 from ultralytics import YOLO
 
@@ -69,6 +69,44 @@ class YOLOModelAdapter(IDetectionModel):
             imgsz=imgsz
         )
     
+    def predict(
+        self,
+        images: List[Any],
+        conf: float = 0.1,
+        iou: float = 0.2,
+        imgsz: int = 640
+    ) -> List[Any]:
+        """
+        Realiza apenas a detecção usando YOLO padrão (sem tracker) em um lote de imagens.
+        """
+        return self._model.predict(
+            source=images,
+            conf=conf,
+            iou=iou,
+            verbose=False,
+            half=self.use_fp16,
+            imgsz=imgsz
+        )
+    
+    def reset_tracker(self) -> None:
+        """
+        Descarta os trackers persistidos no predictor do ultralytics.
+        Na próxima chamada de ``track``, novos trackers são criados para a nova fonte.
+        """
+        predictor = getattr(self._model, "predictor", None)
+        if predictor is not None and hasattr(predictor, "trackers"):
+            del predictor.trackers
+    
+    def abort_stream(self) -> None:
+        """
+        Fecha a fonte de vídeo do predictor do ultralytics (threads de leitura e capturas).
+        O iterador de ``track`` em andamento termina em seguida.
+        """
+        predictor = getattr(self._model, "predictor", None)
+        dataset = getattr(predictor, "dataset", None)
+        if dataset is not None and hasattr(dataset, "close"):
+            dataset.close()
+    
     def get_model_info(self) -> dict:
         """
         Retorna informações sobre o modelo YOLO.
@@ -3,5 +3,7 @@ Implementações concretas dos repositórios (Infrastructure Layer).
 """
 
 from .camera_repository_findface import CameraRepositoryFindface
+from .camera_repository_cached import CameraRepositoryCached
+from .findface_outbox_sqlite import FindfaceOutboxSQLite
 
-__all__ = ['CameraRepositoryFindface']
+__all__ = ['CameraRepositoryFindface', 'CameraRepositoryCached', 'FindfaceOutboxSQLite']
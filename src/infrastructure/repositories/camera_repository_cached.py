@@ -0,0 +1,119 @@
+"""
+Repositório de câmeras com cache local em arquivo JSON (warm start).
+Infrastructure Layer - implementação concreta da interface do domínio.
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from threading import Lock
+from typing import List
+
+from src.domain.entities import Camera
+from src.domain.repositories import CameraRepository
+
+
+class CameraRepositoryCached(CameraRepository):
+    """
+    Decora outro CameraRepository persistindo a última lista de câmeras obtida com sucesso.
+
+    - Cada consulta bem-sucedida ao repositório de origem regrava o cache (escrita
+      atômica: arquivo temporário + rename, nunca deixa um JSON pela metade);
+    - se a origem falhar (e ``strict`` for False), retorna a lista do cache em vez
+      de uma lista vazia;
+    - ``get_cached_cameras()`` lê apenas o cache, permitindo iniciar as câmeras sem
+      esperar pela API (a reconciliação confirma a lista em segundo plano).
+    """
+
+    CACHE_VERSION = 1
+
+    def __init__(self, repository: CameraRepository, path: str):
+        """
+        Inicializa o repositório com cache.
+
+        :param repository: Repositório de origem (ex.: CameraRepositoryFindface).
+        :param path: Caminho do arquivo JSON de cache.
+        """
+        if not isinstance(repository, CameraRepository):
+            raise TypeError(f"repository deve ser CameraRepository, recebido: {type(repository).__name__}")
+
+        self.repository = repository
+        self.path = Path(path)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._lock = Lock()
+
+    def get_active_cameras(self, strict: bool = False) -> List[Camera]:
+        """
+        Obtém as câmeras ativas da origem, atualizando o cache; em falha, usa o cache.
+
+        :param strict: Se True, propaga falhas da origem (o cache não é usado).
+        :return: Lista de entidades Camera ativas.
+        """
+        try:
+            cameras = self.repository.get_active_cameras(strict=True)
+        except Exception as e:
+            if strict:
+                raise
+            cameras = self.get_cached_cameras()
+            self.logger.warning(
+                f"Falha ao obter câmeras da origem ({e}); usando {len(cameras)} câmera(s) do cache"
+            )
+            return cameras
+
+        self._save(cameras)
+        return cameras
+
+    def get_cached_cameras(self) -> List[Camera]:
+        """
+        Lê as câmeras do cache local sem consultar a origem.
+
+        :return: Lista de câmeras do cache (vazia se não existir ou estiver inválido).
+        """
+        with self._lock:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                return []
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Cache de câmeras inválido em '{self.path}': {e}")
+                return []
+
+        if not isinstance(data, dict) or data.get('version') != self.CACHE_VERSION:
+            self.logger.warning(f"Versão do cache de câmeras em '{self.path}' não suportada; ignorando")
+            return []
+
+        cameras = []
+        for camera_data in data.get('cameras', []):
+            try:
+                cameras.append(Camera.from_dict(camera_data))
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.warning(f"Câmera inválida no cache ignorada: {e}")
+
+        age = time.time() - data.get('saved_at', time.time())
+        self.logger.info(f"Lidas {len(cameras)} câmera(s) do cache (salvo há {age:.0f}s)")
+        return cameras
+
+    def _save(self, cameras: List[Camera]) -> None:
+        """Grava o cache de forma atômica; falhas são apenas registradas."""
+        data = {
+            'version': self.CACHE_VERSION,
+            'saved_at': time.time(),
+            'cameras': [camera.to_dict() for camera in cameras],
+        }
+        # Temporário por processo: vários processos de trabalho podem gravar o mesmo cache
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                # O cache contém os tokens das câmeras
+                os.chmod(tmp_path, 0o600)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                self.logger.warning(f"Não foi possível gravar o cache de câmeras em '{self.path}': {e}")
@@ -30,51 +30,44 @@ class CameraRepositoryFindface(CameraRepository):
         self.camera_prefix = camera_prefix
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    def get_active_cameras(self) -> List[Camera]:
+    def get_active_cameras(self, strict: bool = False) -> List[Camera]:
         """
         Obtém todas as câmeras ativas do FindFace.
         
+        A descoberta percorre todas as páginas de cada grupo, busca os grupos em
+        paralelo e é mantida em cache pelo cliente (compartilhada com o FindfaceAdapter).
+        
+        :param strict: Se True, propaga falhas de comunicação em vez de retornar lista vazia.
         :return: Lista de entidades Camera ativas.
         """
         cameras = []
 
         try:
-            # Obtém grupos de câmeras
-            grupos = self.findface.get_camera_groups()["results"]
-            grupos_filtrados = [
-                g for g in grupos 
-                if g["name"].lower().startswith(self.camera_prefix.lower())
+            # Obtém câmeras ATIVAS de todos os grupos com o prefixo
+            cameras_response = self.findface.discover_cameras(self.camera_prefix, active=True)
+
+            # Filtra câmeras com RTSP no comment
+            cameras_filtradas = [
+                c for c in cameras_response 
+                if c.get("comment", "").startswith("rtsp://")
             ]
 
-            # Para cada grupo, obtém câmeras ATIVAS
-            for grupo in grupos_filtrados:
-                cameras_response = self.findface.get_cameras(
-                    camera_groups=[grupo["id"]],
-                    external_detector=True,
-                    ordering='id',
-                    active=True  # Filtra apenas câmeras ativas
-                )["results"]
-                
-                # Filtra câmeras com RTSP no comment
-                cameras_filtradas = [
-                    c for c in cameras_response 
-                    if c.get("comment", "").startswith("rtsp://")
-                ]
-                
-                # Converte para entidades Camera
-                for camera_data in cameras_filtradas:
-                    camera = Camera(
-                        camera_id=IdVO(camera_data["id"]),
-                        camera_name=NameVO(camera_data["name"]),
-                        camera_token=CameraTokenVO(camera_data["external_detector_token"]),
-                        source=CameraSourceVO(camera_data["comment"].strip()),
-                        active=camera_data.get("active", True)
-                    )
-                    cameras.append(camera)
+            # Converte para entidades Camera
+            for camera_data in cameras_filtradas:
+                camera = Camera(
+                    camera_id=IdVO(camera_data["id"]),
+                    camera_name=NameVO(camera_data["name"]),
+                    camera_token=CameraTokenVO(camera_data["external_detector_token"]),
+                    source=CameraSourceVO(camera_data["comment"].strip()),
+                    active=camera_data.get("active", True)
+                )
+                cameras.append(camera)
 
             self.logger.info(f"Obtidas {len(cameras)} câmeras ativas do FindFace")
             return cameras
 
         except Exception as e:
+            if strict:
+                raise
             self.logger.error(f"Erro ao obter câmeras do FindFace: {e}", exc_info=True)
             return []
@@ -0,0 +1,337 @@
+"""
+Implementação do outbox de eventos FindFace usando SQLite em modo WAL.
+Infrastructure Layer - implementação concreta da interface do domínio.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from src.domain.repositories import FindfaceOutboxRepository
+
+
+class FindfaceOutboxSQLite(FindfaceOutboxRepository):
+    """
+    Outbox durável em SQLite (WAL).
+
+    As gravações são enfileiradas em memória e persistidas por uma thread dedicada,
+    que agrupa vários eventos em uma única transação (um fsync por lote). Quando o
+    tamanho armazenado excede o limite, eventos são descartados conforme a política
+    de evicção ("oldest" ou "lowest_quality").
+    """
+
+    EVICTION_POLICIES = ("oldest", "lowest_quality")
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 1024 * 1024 * 1024,
+        eviction: str = "oldest",
+        batch_size: int = 64,
+        flush_interval: float = 0.2,
+        pending_size: int = 1000,
+        close_timeout: float = 20.0
+    ):
+        """
+        Inicializa o outbox e inicia a thread de gravação.
+
+        :param path: Caminho do arquivo SQLite.
+        :param max_bytes: Tamanho máximo das imagens armazenadas em bytes.
+        :param eviction: Política de evicção ao exceder max_bytes.
+        :param batch_size: Máximo de eventos gravados por transação.
+        :param flush_interval: Tempo máximo (s) acumulando eventos antes do commit.
+        :param pending_size: Máximo de eventos aguardando gravação em memória.
+        :param close_timeout: Espera máxima (s) em close() pela gravação dos eventos ainda em
+                              memória (cada um pode exigir a codificação JPEG do frame);
+                              os que não forem gravados nesse prazo são descartados e contados.
+        :raises ValueError: Se a política de evicção for inválida.
+        """
+        if eviction not in self.EVICTION_POLICIES:
+            raise ValueError(f"eviction deve ser um de {self.EVICTION_POLICIES}, recebido: {eviction}")
+
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.close_timeout = max(0.0, close_timeout)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db_lock = Lock()
+        with self._db_lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # FULL: cada commit é durável (fsync); o custo é diluído pelo agrupamento em lotes
+            self._conn.execute("PRAGMA synchronous=FULL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " created_at REAL NOT NULL,"
+                " quality REAL NOT NULL DEFAULT 0,"
+                " metadata TEXT NOT NULL,"
+                " request TEXT NOT NULL,"
+                " fullframe BLOB NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_quality ON outbox (quality)")
+            row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(fullframe)), 0) FROM outbox").fetchone()
+        self._count, self._stored_bytes = row
+
+        # Estatísticas
+        self._stats_lock = Lock()
+        self._appended = 0
+        self._rejected = 0
+        self._evicted = 0
+        self._failed = 0
+        self._commits = 0
+
+        self._pending: Queue = Queue(maxsize=pending_size)
+        self._worker_running = True
+        self._closed = False
+        self._worker = Thread(target=self._writer_worker, name="FindFaceOutbox-Writer", daemon=True)
+        self._worker.start()
+        self.logger.info(
+            f"Outbox FindFace aberto em '{self.path}' "
+            f"({self._count} eventos pendentes, {self._stored_bytes / 1024 / 1024:.1f} MB)"
+        )
+
+    def append(
+        self,
+        metadata: Dict[str, Any],
+        request: Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+    ) -> bool:
+        """
+        Enfileira um evento para gravação (não bloqueante).
+
+        :param metadata: Metadados do evento.
+        :param request: Requisição pronta ou função que a constrói na thread de gravação.
+        :return: True se aceito, False se a fila de gravação estiver cheia.
+        """
+        if not self._worker_running:
+            return False
+        try:
+            self._pending.put_nowait((metadata, request))
+            return True
+        except Full:
+            with self._stats_lock:
+                self._rejected += 1
+            return False
+
+    def _writer_worker(self):
+        """Worker que agrupa eventos pendentes e os grava em uma única transação."""
+        self.logger.info("Outbox writer iniciado")
+
+        while (self._worker_running or not self._pending.empty()) and not self._closed:
+            try:
+                first = self._pending.get(timeout=0.5)
+            except Empty:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._pending.get(timeout=remaining))
+                except Empty:
+                    break
+
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                with self._stats_lock:
+                    self._failed += len(batch)
+                self.logger.error(f"Erro ao gravar {len(batch)} evento(s) no outbox (descartados): {e}")
+
+        self.logger.info("Outbox writer finalizado")
+
+    def _write_batch(self, batch: List[Tuple[Dict[str, Any], Any]]):
+        """Serializa e grava um lote de eventos, aplicando o limite de tamanho."""
+        rows = []
+        for metadata, request in batch:
+            try:
+                if callable(request):
+                    request = request()
+                request = dict(request)
+                fullframe = request.pop("fullframe")
+                rows.append((
+                    time.time(),
+                    float(metadata.get("quality", 0.0)),
+                    json.dumps(metadata),
+                    json.dumps(request),
+                    sqlite3.Binary(fullframe)
+                ))
+            except Exception as e:
+                self.logger.error(f"Evento descartado do outbox (falha ao serializar): {e}")
+
+        if not rows:
+            return
+
+        added_bytes = sum(len(row[4]) for row in rows)
+        with self._db_lock:
+            if self._closed:
+                # close() esgotou o prazo enquanto este lote era serializado
+                with self._stats_lock:
+                    self._failed += len(rows)
+                self.logger.warning(f"Outbox fechado: {len(rows)} evento(s) descartado(s)")
+                return
+            count, stored_bytes = self._count, self._stored_bytes
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO outbox (created_at, quality, metadata, request, fullframe) VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._count += len(rows)
+                self._stored_bytes += added_bytes
+                evicted = self._evict_locked()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                # Sem ROLLBACK a transação ficaria aberta e todo BEGIN seguinte falharia
+                self._count, self._stored_bytes = count, stored_bytes
+                try:
+                    self._conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    # O SQLite já desfez a transação (ex.: disco cheio)
+                    pass
+                raise
+
+        with self._stats_lock:
+            self._appended += len(rows)
+            self._evicted += evicted
+            self._commits += 1
+
+        if evicted:
+            self.logger.warning(
+                f"Outbox FindFace acima do limite ({self.max_bytes / 1024 / 1024:.0f} MB): "
+                f"{evicted} evento(s) descartado(s) (política: {self.eviction})"
+            )
+
+    def _evict_locked(self) -> int:
+        """Remove eventos até o outbox caber em max_bytes (chamado com o lock e a transação abertos)."""
+        if self.max_bytes <= 0 or self._stored_bytes <= self.max_bytes:
+            return 0
+
+        order = "id" if self.eviction == "oldest" else "quality, id"
+        evicted = 0
+        cursor = self._conn.execute(f"SELECT id, LENGTH(fullframe) FROM outbox ORDER BY {order}")
+        victims = []
+        for record_id, size in cursor:
+            if self._stored_bytes <= self.max_bytes:
+                break
+            victims.append((record_id,))
+            self._stored_bytes -= size
+            evicted += 1
+
+        self._conn.executemany("DELETE FROM outbox WHERE id = ?", victims)
+        self._count -= evicted
+        return evicted
+
+    def fetch(self, limit: int) -> List[Tuple[int, Dict[str, Any], Dict[str, Any]]]:
+        """
+        Retorna os eventos mais antigos ainda não confirmados.
+
+        :param limit: Máximo de registros retornados.
+        :return: Lista de (id, metadata, request) com a imagem em request['fullframe'].
+        """
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT id, metadata, request, fullframe FROM outbox ORDER BY id LIMIT ?",
+                (limit,)
+            ).fetchall()
+
+        records = []
+        for record_id, metadata, request, fullframe in rows:
+            request = json.loads(request)
+            request["fullframe"] = bytes(fullframe)
+            records.append((record_id, json.loads(metadata), request))
+        return records
+
+    def ack(self, record_ids: List[int]) -> None:
+        """
+        Remove do outbox os eventos entregues.
+
+        :param record_ids: IDs dos registros.
+        """
+        if not record_ids:
+            return
+        with self._db_lock:
+            placeholders = ",".join("?" * len(record_ids))
+            removed_bytes, removed = self._conn.execute(
+                f"SELECT COALESCE(SUM(LENGTH(fullframe)), 0), COUNT(*) FROM outbox WHERE id IN ({placeholders})",
+                record_ids
+            ).fetchone()
+            self._conn.execute(f"DELETE FROM outbox WHERE id IN ({placeholders})", record_ids)
+            self._count -= removed
+            self._stored_bytes -= removed_bytes
+
+    def count(self) -> int:
+        """Retorna o número de eventos persistidos aguardando entrega."""
+        with self._db_lock:
+            return self._count
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do outbox.
+
+        :return: Dicionário com eventos pendentes, bytes armazenados e contadores.
+        """
+        with self._stats_lock:
+            stats = {
+                'appended': self._appended,
+                'rejected': self._rejected,
+                'evicted': self._evicted,
+                'failed': self._failed,
+                'commits': self._commits,
+                'write_backlog': self._pending.qsize(),
+            }
+        with self._db_lock:
+            stats['pending'] = self._count
+            stats['stored_bytes'] = self._stored_bytes
+        return stats
+
+    def close(self) -> None:
+        """
+        Grava os eventos ainda em memória e fecha o banco.
+
+        Aguarda a thread de gravação esvaziar a fila por até close_timeout segundos; os
+        eventos que não forem gravados nesse prazo são descartados e contabilizados.
+        """
+        if not self._worker_running:
+            return
+
+        self._worker_running = False
+        backlog = self._pending.qsize()
+        if backlog:
+            self.logger.info(f"Gravando {backlog} evento(s) pendente(s) no outbox antes de fechar...")
+        self._worker.join(timeout=self.close_timeout)
+        if self._worker.is_alive():
+            self.logger.warning(
+                f"Outbox writer não finalizou em {self.close_timeout:.0f}s; "
+                f"eventos ainda não gravados serão descartados"
+            )
+
+        with self._db_lock:
+            self._closed = True
+            self._conn.close()
+
+        # Eventos que não chegaram ao banco (o lote em andamento é contado pela própria thread)
+        dropped = 0
+        while True:
+            try:
+                self._pending.get_nowait()
+            except Empty:
+                break
+            dropped += 1
+        if dropped:
+            with self._stats_lock:
+                self._failed += dropped
+            self.logger.warning(f"Outbox fechado: {dropped} evento(s) não gravado(s) descartado(s)")
+        self.logger.info(f"Outbox FindFace fechado ({self._count} eventos pendentes)")